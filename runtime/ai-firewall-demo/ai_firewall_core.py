@@ -1,12 +1,19 @@
 """AI Firewall - Core Bidirectional Filtering - FIXED"""
 
-import re
 import json
 import hashlib
+import os
+import sys
 from datetime import datetime, timezone
 from typing import Dict, List, Tuple
 import logging
 
+try:
+    from firewall_patterns import CASE_FOLD, OutputStream, PIIRedactor, compile_detectors
+except ImportError:  # run from ai-firewall-demo/: the shared module is in runtime/
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from firewall_patterns import CASE_FOLD, OutputStream, PIIRedactor, compile_detectors
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -47,16 +54,27 @@ class AIFirewall:
         r"act\s+as\s+if\s+you\s+have\s+no\s+limitations",
     ]
 
+    _DETECTORS = compile_detectors(
+        (INJECTION_PATTERNS, "Prompt injection detected"),
+        (JAILBREAK_PATTERNS, "Jailbreak attempt detected"),
+    )
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._DETECTORS = compile_detectors(
+            (cls.INJECTION_PATTERNS, "Prompt injection detected"),
+            (cls.JAILBREAK_PATTERNS, "Jailbreak attempt detected"),
+        )
+        cls._REDACTOR = PIIRedactor(cls.PII_PATTERNS)
+
     def detect_prompt_injection(self, prompt: str) -> Tuple[bool, str]:
         prompt_lower = prompt.lower()
+        if not prompt_lower.isascii():
+            prompt_lower = prompt_lower.translate(CASE_FOLD)
 
-        for pattern in self.INJECTION_PATTERNS:
-            if re.search(pattern, prompt_lower, re.IGNORECASE):
-                return True, f"Prompt injection detected: {pattern}"
-
-        for pattern in self.JAILBREAK_PATTERNS:
-            if re.search(pattern, prompt_lower, re.IGNORECASE):
-                return True, f"Jailbreak attempt detected: {pattern}"
+        for gate, regex, pattern, label in self._DETECTORS:
+            if gate in prompt_lower and regex.search(prompt_lower):
+                return True, f"{label}: {pattern}"
 
         return False, ""
 
@@ -67,18 +85,16 @@ class AIFirewall:
         "phone": r"\b(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b",
     }
 
-    def redact_pii(self, text: str) -> Tuple[str, List[str]]:
-        redacted = text
-        pii_found = []
+    _REDACTOR = PIIRedactor(PII_PATTERNS)
 
-        for pii_type, pattern in self.PII_PATTERNS.items():
-            matches = re.findall(pattern, text)
-            if matches:
-                pii_found.append(pii_type)
-                redacted = re.sub(pattern, f"[REDACTED_{pii_type.upper()}]", redacted)
-                self.redacted_count += len(matches)
+    def redact_pii(self, text: str) -> Tuple[str, List[str]]:
+        redacted, counts = self.redact_pii_counts(text)
+        return redacted, list(counts)
 
-        return redacted, pii_found
+    def redact_pii_counts(self, text: str) -> Tuple[str, Dict[str, int]]:
+        redacted, counts = self._REDACTOR.redact(text)
+        self.redacted_count += sum(counts.values())
+        return redacted, counts
 
     def filter_input(self, prompt: str, metadata: Dict = None) -> Dict:
         result = {
@@ -126,6 +142,10 @@ class AIFirewall:
 
         return result
 
+    def stream_output(self) -> OutputStream:
+        """Streaming filter_output for responses that arrive token by token"""
+        return OutputStream(self)
+
     def get_stats(self) -> Dict:
         return {
             "blocked_inputs": self.blocked_count,
@@ -1,35 +1,76 @@
 """AI Firewall Orchestrator v3 - Dual Drift Detection (Shadow Mode)"""
 
 import json
-from typing import Dict, List, Tuple
+import os
+import sys
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from ai_firewall_core import AIFirewall
 from tool_authorization import ToolAuthorization
-from drift_detection_fixed import DriftDetector
+from drift_detection_fixed import DriftDetector, HashedNgramScorer, KeywordScorer
 from decision_ledger import DecisionLedger
 import logging
 
+try:
+    from shadow_runner import ShadowRunner
+except ImportError:  # run from ai-firewall-demo/: the shared module is in runtime/
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from shadow_runner import ShadowRunner
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SHADOW_SCORERS = {"keyword": KeywordScorer, "ngram": HashedNgramScorer}
+
 
 class AIFirewallOrchestrator:
-    def __init__(self):
+    def __init__(
+        self,
+        shadow_execution: Optional[str] = None,
+        shadow_runner: Optional[ShadowRunner] = None,
+        shadow_scorer: Optional[str] = None,
+    ):
+        shadow_execution = shadow_execution or os.getenv("SHADOW_EXECUTION", "inline")
+        shadow_scorer = shadow_scorer or os.getenv("SHADOW_DRIFT_SCORER", "keyword")
+        if shadow_scorer not in SHADOW_SCORERS:
+            raise ValueError(
+                f"Unknown shadow drift scorer {shadow_scorer!r}; "
+                f"expected one of {sorted(SHADOW_SCORERS)}"
+            )
+
         self.firewall = AIFirewall()
         self.auth = ToolAuthorization()
 
         # 🔥 DUAL DRIFT DETECTORS 🔥
         self.drift_production = DriftDetector(threshold=0.20)  # Lenient (blocks less)
-        self.drift_shadow = DriftDetector(threshold=0.30)  # Strict (testing)
+        # The shadow detector can also trial a different scorer ("ngram":
+        # hashed n-gram vectors) against the production keyword scorer.
+        self.drift_shadow = DriftDetector(
+            threshold=float(os.getenv("SHADOW_DRIFT_THRESHOLD", "0.30")),  # Strict
+            scorer=SHADOW_SCORERS[shadow_scorer](),
+        )
 
         self.ledger = DecisionLedger()
+        self._ledger_lock = threading.Lock()  # shadow workers log too
         self.mode = "enforce"
 
+        # "inline": shadow runs next to production and is in the response.
+        # "async": the response returns after the production decision; the
+        # shadow detector runs and logs on a background worker pool
+        # (SHADOW_WORKERS / SHADOW_QUEUE_SIZE / SHADOW_SAMPLE_RATE).
+        self.shadow_execution = shadow_execution
+        self.shadow_runner = None
+        if shadow_execution == "async":
+            self.shadow_runner = shadow_runner or ShadowRunner(name="drift-shadow")
+
+    def _log(self, event_type: str, data: Dict) -> Dict:
+        with self._ledger_lock:
+            return self.ledger.log_interaction(event_type, data)
+
     def process_request(self, user_id: str, role: str, prompt: str) -> Dict:
         input_result = self.firewall.filter_input(prompt)
 
-        self.ledger.log_interaction(
-            "input_filter", {"user_id": user_id, "role": role, **input_result}
-        )
+        self._log("input_filter", {"user_id": user_id, "role": role, **input_result})
 
         if not input_result["allowed"]:
             return {"status": "blocked", "reason": input_result["threat_reason"]}
@@ -41,9 +82,7 @@ class AIFirewallOrchestrator:
     ) -> Dict:
         result = self.auth.execute_tool_with_auth(user_id, role, tool_name, parameters)
 
-        self.ledger.log_interaction(
-            "tool_auth", {"user_id": user_id, "tool": tool_name, **result}
-        )
+        self._log("tool_auth", {"user_id": user_id, "tool": tool_name, **result})
 
         return result
 
@@ -70,6 +109,35 @@ class AIFirewallOrchestrator:
 
         return prod_result, shadow_result
 
+    def _log_shadow_drift(self, user_id: str, prod_drift: Dict, shadow_drift: Dict):
+        # Log shadow decision (for comparison)
+        self._log(
+            "drift_detect_shadow",
+            {"user_id": user_id, "mode": "shadow", **shadow_drift},
+        )
+
+        # 📊 Compare results - detect policy divergence
+        if prod_drift["should_block"] != shadow_drift["should_block"]:
+            logger.warning(
+                f"⚠️  POLICY DIVERGENCE DETECTED:\n"
+                f"    Production would block: {prod_drift['should_block']}\n"
+                f"    Shadow would block: {shadow_drift['should_block']}\n"
+                f"    Scores: prod={prod_drift['alignment_score']:.2f} "
+                f"shadow={shadow_drift['alignment_score']:.2f}"
+            )
+
+    def _shadow_drift_job(
+        self, user_id: str, prompt: str, actions: List[Dict], prod_drift: Dict
+    ):
+        """Runs on a shadow worker in async mode."""
+        shadow_drift = self.drift_shadow.detect_drift(prompt, actions, enforce=False)
+        self._log_shadow_drift(user_id, prod_drift, shadow_drift)
+
+    def flush_shadow(self):
+        """Wait for pending async shadow evaluations (reports, tests)."""
+        if self.shadow_runner is not None:
+            self.shadow_runner.flush()
+
     def process_response(
         self,
         user_id: str,
@@ -83,31 +151,31 @@ class AIFirewallOrchestrator:
         shadow_drift = None
 
         if actions:
-            # 🔥 Run BOTH detectors 🔥
-            prod_drift, shadow_drift = self._evaluate_drift_dual_mode(
-                original_prompt, actions
-            )
+            if self.shadow_runner is not None:
+                prod_drift = self.drift_production.detect_drift(
+                    original_prompt, actions, enforce=(self.mode == "enforce")
+                )
+            else:
+                # 🔥 Run BOTH detectors 🔥
+                prod_drift, shadow_drift = self._evaluate_drift_dual_mode(
+                    original_prompt, actions
+                )
 
             # Log production decision
-            self.ledger.log_interaction(
+            self._log(
                 "drift_detect", {"user_id": user_id, "mode": "production", **prod_drift}
             )
 
-            # Log shadow decision (for comparison)
-            self.ledger.log_interaction(
-                "drift_detect_shadow",
-                {"user_id": user_id, "mode": "shadow", **shadow_drift},
-            )
-
-            # 📊 Compare results - detect policy divergence
-            if prod_drift["should_block"] != shadow_drift["should_block"]:
-                logger.warning(
-                    f"⚠️  POLICY DIVERGENCE DETECTED:\n"
-                    f"    Production would block: {prod_drift['should_block']}\n"
-                    f"    Shadow would block: {shadow_drift['should_block']}\n"
-                    f"    Scores: prod={prod_drift['alignment_score']:.2f} "
-                    f"shadow={shadow_drift['alignment_score']:.2f}"
+            if shadow_drift is None:
+                self.shadow_runner.submit(
+                    self._shadow_drift_job,
+                    user_id,
+                    original_prompt,
+                    list(actions),
+                    dict(prod_drift),
                 )
+            else:
+                self._log_shadow_drift(user_id, prod_drift, shadow_drift)
 
             # Only production detector can actually block
             if prod_drift["should_block"]:
@@ -115,8 +183,12 @@ class AIFirewallOrchestrator:
                     "status": "blocked",
                     "reason": "Action drift detected (production policy)",
                     "drift_score": prod_drift["alignment_score"],
-                    "shadow_would_block": shadow_drift["should_block"],
-                    "shadow_score": shadow_drift["alignment_score"],
+                    "shadow_would_block": (
+                        shadow_drift["should_block"] if shadow_drift else None
+                    ),
+                    "shadow_score": (
+                        shadow_drift["alignment_score"] if shadow_drift else None
+                    ),
                 }
 
         return {
@@ -132,14 +204,45 @@ class AIFirewallOrchestrator:
             ),
         }
 
+    def stream_response(self, user_id: str, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        Streaming output filter for token-by-token completions: yields the
+        redacted text as soon as it is safe to emit, instead of waiting for
+        the whole response. The drift checks need the completed tool calls,
+        so actions still go through process_response.
+        """
+        stream = self.firewall.stream_output()
+        for chunk in chunks:
+            filtered = stream.feed(chunk)
+            if filtered:
+                yield filtered
+        tail = stream.close()
+        if tail:
+            yield tail
+        if stream.pii_found:
+            self._log(
+                "output_stream",
+                {
+                    "user_id": user_id,
+                    "pii_redacted": stream.pii_found,
+                    "pii_counts": stream.pii_counts,
+                },
+            )
+
     def get_stats(self) -> Dict:
-        return {
+        stats = {
             "firewall": self.firewall.get_stats(),
             "violations": self.auth.get_violation_count(),
             "drift_events_production": len(self.drift_production.get_drift_events()),
             "drift_events_shadow": len(self.drift_shadow.get_drift_events()),
             "total_logs": len(self.ledger.chain),
         }
+        if self.shadow_runner is not None:
+            stats["shadow_runner"] = dict(self.shadow_runner.stats)
+        scorer = self.drift_shadow.scorer
+        if hasattr(scorer, "hits"):
+            stats["shadow_scorer_cache"] = {"hits": scorer.hits, "misses": scorer.misses}
+        return stats
 
     def get_policy_comparison_report(self) -> Dict:
         """
@@ -5,12 +5,17 @@ Detects prompt injection, jailbreak attempts, PII leakage
 
 import re
 import json
+import base64
+import binascii
 import hashlib
 import time
+from collections import deque
 from datetime import datetime
 from typing import Dict, List, Any, Tuple
 import logging
 
+from firewall_patterns import CASE_FOLD, OutputStream, PIIRedactor, compile_detectors
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -55,43 +60,121 @@ class AIFirewall:
         r"hypothetically\s+if\s+you\s+could",
     ]
 
-    def detect_prompt_injection(self, prompt: str) -> Tuple[bool, str]:
-        """Returns (is_malicious, reason)"""
-        prompt_lower = prompt.lower()
+    # Compiled once per class; injection patterns are reported first
+    _DETECTORS = compile_detectors(
+        (INJECTION_PATTERNS, "Prompt injection detected"),
+        (JAILBREAK_PATTERNS, "Jailbreak attempt detected"),
+    )
 
-        # Check injection patterns
-        for pattern in self.INJECTION_PATTERNS:
-            if re.search(pattern, prompt_lower, re.IGNORECASE):
-                return True, f"Prompt injection detected: {pattern}"
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._DETECTORS = compile_detectors(
+            (cls.INJECTION_PATTERNS, "Prompt injection detected"),
+            (cls.JAILBREAK_PATTERNS, "Jailbreak attempt detected"),
+        )
+        cls._REDACTOR = PIIRedactor(cls.PII_PATTERNS)
 
-        # Check jailbreak patterns
-        for pattern in self.JAILBREAK_PATTERNS:
-            if re.search(pattern, prompt_lower, re.IGNORECASE):
-                return True, f"Jailbreak attempt detected: {pattern}"
+    def detect_prompt_injection(self, prompt: str) -> Tuple[bool, str]:
+        """Returns (is_malicious, reason)"""
+        reason = self._match_patterns(prompt)
+        if reason:
+            return True, reason
 
         # Check for base64 encoded instructions (common evasion)
-        if self._check_base64_injection(prompt):
-            return True, "Base64-encoded malicious content detected"
+        reason = self._check_base64_injection(prompt)
+        if reason:
+            return True, reason
 
         return False, ""
 
-    def _check_base64_injection(self, text: str) -> bool:
-        """Detect base64 encoded prompt injections"""
-        import base64
-
-        # Look for base64-like strings
-        b64_pattern = r"[A-Za-z0-9+/]{20,}={0,2}"
-        matches = re.findall(b64_pattern, text)
-
-        for match in matches:
-            try:
-                decoded = base64.b64decode(match).decode("utf-8", errors="ignore")
-                is_malicious, _ = self.detect_prompt_injection(decoded)
-                if is_malicious:
-                    return True
-            except:
-                continue
-        return False
+    def _match_patterns(self, text: str) -> str:
+        """Reason for the first matching pattern, or "" """
+        text_lower = text.lower()
+        if not text_lower.isascii():
+            text_lower = text_lower.translate(CASE_FOLD)
+
+        # Injection patterns, then jailbreak patterns
+        for gate, regex, pattern, label in self._DETECTORS:
+            if gate in text_lower and regex.search(text_lower):
+                return f"{label}: {pattern}"
+        return ""
+
+    # Base64 scanning limits per prompt; config["input_protection"] can
+    # override them with the lower-case keys (base64_max_depth, ...)
+    BASE64_MAX_DEPTH = 3  # decode layers (nested encodings)
+    BASE64_MAX_BLOB_CHARS = 64 * 1024  # longer runs: only this prefix
+    BASE64_MAX_DECODED_BYTES = 512 * 1024  # total across all layers
+    # Block prompts whose base64 content could not be scanned in full
+    BASE64_FAIL_CLOSED = True
+
+    _BASE64_RUN = re.compile(r"[A-Za-z0-9+/]{20,}={0,2}")
+
+    def _base64_limit(self, name: str) -> int:
+        return self.config.get("input_protection", {}).get(name.lower(), getattr(self, name))
+
+    def _check_base64_injection(self, text: str) -> str:
+        """
+        Detect base64 encoded prompt injections, including nested encodings.
+        Returns the block reason, or "".
+
+        Decoded layers are scanned breadth-first from a queue, repeated runs
+        are decoded once, and the BASE64_* limits cap the decode work, so
+        the cost per prompt is linear in its length however the blobs are
+        nested or repeated. There is no cap on the number of runs: hashes
+        and identifiers look like base64 and decode to little. Returns at
+        the first malicious layer.
+
+        Content the limits leave unscanned (runs past the byte budget, the
+        tail of a truncated run, runs nested deeper than BASE64_MAX_DEPTH)
+        could hide a payload, so with BASE64_FAIL_CLOSED (the default) such
+        a prompt is blocked as "Base64 scan budget exhausted" unless a
+        malicious layer is found first.
+        """
+        max_depth = self._base64_limit("BASE64_MAX_DEPTH")
+        max_chars = self._base64_limit("BASE64_MAX_BLOB_CHARS")
+        budget = self._base64_limit("BASE64_MAX_DECODED_BYTES")
+
+        seen = set()
+        unscanned = False
+        layers = deque([(text, 1)])
+        while layers:
+            layer, depth = layers.popleft()
+            for match in self._BASE64_RUN.finditer(layer):
+                blob = match.group()
+                if blob in seen:
+                    continue
+                if depth > max_depth:
+                    unscanned = True
+                    break
+                if budget <= 0:
+                    logger.warning("Base64 scan budget exhausted after %d blobs", len(seen))
+                    return self._base64_unscanned()
+                seen.add(blob)
+
+                # Decode at most max_chars (and what is left of the budget)
+                limit = min(max_chars, budget * 4 // 3 + 4)
+                if len(blob) > limit:
+                    blob = blob[: limit - limit % 4]
+                    unscanned = True
+                try:
+                    raw = base64.b64decode(blob)
+                except (binascii.Error, ValueError):
+                    continue
+                budget -= len(raw)
+
+                decoded = raw.decode("utf-8", errors="ignore")
+                if self._match_patterns(decoded):
+                    return "Base64-encoded malicious content detected"
+                layers.append((decoded, depth + 1))
+        if unscanned:
+            logger.warning("Base64 content left unscanned by the scan limits")
+            return self._base64_unscanned()
+        return ""
+
+    def _base64_unscanned(self) -> str:
+        if self._base64_limit("BASE64_FAIL_CLOSED"):
+            return "Base64 scan budget exhausted"
+        return ""
 
     # ============================================
     # OUTPUT FILTERING - PII Redaction
@@ -106,19 +189,18 @@ class AIFirewall:
         "api_key": r"\b(sk|pk)_[a-zA-Z0-9]{20,}\b",
     }
 
+    _REDACTOR = PIIRedactor(PII_PATTERNS)
+
     def redact_pii(self, text: str) -> Tuple[str, List[str]]:
         """Returns (redacted_text, [list of PII types found])"""
-        redacted = text
-        pii_found = []
-
-        for pii_type, pattern in self.PII_PATTERNS.items():
-            matches = re.findall(pattern, text)
-            if matches:
-                pii_found.append(pii_type)
-                redacted = re.sub(pattern, f"[REDACTED_{pii_type.upper()}]", redacted)
-                self.redacted_count += len(matches)
+        redacted, counts = self.redact_pii_counts(text)
+        return redacted, list(counts)
 
-        return redacted, pii_found
+    def redact_pii_counts(self, text: str) -> Tuple[str, Dict[str, int]]:
+        """Returns (redacted_text, {pii_type: matches found})"""
+        redacted, counts = self._REDACTOR.redact(text)
+        self.redacted_count += sum(counts.values())
+        return redacted, counts
 
     # ============================================
     # MAIN FILTERING METHODS
@@ -158,6 +240,7 @@ class AIFirewall:
             "original_response": response,
             "filtered_response": response,
             "pii_found": [],
+            "pii_counts": {},
             "timestamp": datetime.utcnow().isoformat(),
         }
 
@@ -166,14 +249,21 @@ class AIFirewall:
 
         # Redact PII
         if self.config["output_protection"]["redact_pii"]:
-            filtered, pii_types = self.redact_pii(response)
-            result.update({"filtered_response": filtered, "pii_found": pii_types})
+            filtered, pii_counts = self.redact_pii_counts(response)
+            pii_types = list(pii_counts)
+            result.update(
+                {"filtered_response": filtered, "pii_found": pii_types, "pii_counts": pii_counts}
+            )
 
             if pii_types:
                 logger.info(f"🔒 PII REDACTED: {pii_types}")
 
         return result
 
+    def stream_output(self) -> OutputStream:
+        """Streaming filter_output for responses that arrive token by token"""
+        return OutputStream(self)
+
     def get_stats(self) -> Dict:
         """Return firewall statistics"""
         return {
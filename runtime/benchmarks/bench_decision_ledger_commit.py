@@ -0,0 +1,97 @@
+"""
+DecisionLedger write-path benchmark: per-entry fsync vs group commit.
+
+Run from the runtime/ directory:
+
+    python benchmarks/bench_decision_ledger_commit.py [--entries 2000] [--dir /mnt/ebs]
+        [--max-latency-ms 0]
+
+Point --dir at the filesystem you deploy on; tmpfs makes fsync nearly free
+and hides the difference.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from decision_ledger import DecisionLedger  # noqa: E402
+
+WRITERS = (1, 8, 64)
+
+
+def _run(
+    path: str, writers: int, entries: int, group_commit: bool, max_latency_ms: float
+) -> dict:
+    ledger = DecisionLedger(
+        log_file=path,
+        group_commit=group_commit,
+        commit_max_latency_ms=max_latency_ms,
+    )
+    per_writer = max(1, entries // writers)
+    latencies = []
+    lat_lock = threading.Lock()
+    start_gate = threading.Barrier(writers + 1)
+
+    def worker(wid: int):
+        local = []
+        start_gate.wait()
+        for i in range(per_writer):
+            t0 = time.perf_counter()
+            ledger.log_interaction(
+                "tool_auth",
+                {"user_id": f"user_{wid}", "request_id": f"req_{wid}_{i}"},
+            )
+            local.append(time.perf_counter() - t0)
+        with lat_lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(writers)]
+    for t in threads:
+        t.start()
+    start_gate.wait()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    ledger.close()
+
+    assert ledger.verify_file_integrity(), "ledger corrupted during benchmark"
+
+    latencies.sort()
+    n = len(latencies)
+    return {
+        "ops_per_sec": n / elapsed,
+        "p50_ms": latencies[n // 2] * 1000,
+        "p99_ms": latencies[min(n - 1, int(n * 0.99))] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=2000)
+    parser.add_argument("--dir", default=None, help="directory for ledger files")
+    parser.add_argument("--max-latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    logging.getLogger("decision_ledger").setLevel(logging.WARNING)
+
+    print(f"{'mode':<14}{'writers':>8}{'ops/s':>12}{'p50 ms':>10}{'p99 ms':>10}")
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        for writers in WRITERS:
+            for mode, group in (("per-entry", False), ("group-commit", True)):
+                path = os.path.join(tmp, f"{mode}-{writers}.jsonl")
+                r = _run(path, writers, args.entries, group, args.max_latency_ms)
+                print(
+                    f"{mode:<14}{writers:>8}{r['ops_per_sec']:>12.0f}"
+                    f"{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
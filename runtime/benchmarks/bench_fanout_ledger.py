@@ -0,0 +1,91 @@
+"""
+Fan-out ledger benchmark: caller latency vs durability quorum, and the effect
+of coalescing direct submit_audit calls into submit_audits batches.
+
+WORM is the synchronous primary; Fabric, Cosmos and QLDB are SimulatedLedger
+stand-ins using the doc's latencies (ledger_adapter_benchmarks.md) times
+--scale. Run from the runtime/ directory:
+
+    python benchmarks/bench_fanout_ledger.py [--submits 2000] [--concurrency 100] [--scale 0.1]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ledgers.fanout_ledger import FanoutLedger  # noqa: E402
+from ledgers.simulated_ledger import SimulatedLedger  # noqa: E402
+from ledgers.worm_fallback import WORMFallback  # noqa: E402
+
+# Mean submit latency in seconds from the baseline table
+REPLICA_LATENCY_S = {"qldb": 0.2, "cosmos": 0.4, "fabric": 1.5}
+
+
+async def _run(quorum: int, submits: int, concurrency: int, scale: float):
+    replicas = {
+        name: SimulatedLedger(name, latency_s=latency * scale, jitter_s=latency * scale / 2)
+        for name, latency in REPLICA_LATENCY_S.items()
+    }
+    ledger = FanoutLedger(WORMFallback(), replicas, quorum=quorum)
+    latencies = []
+
+    async def caller(c):
+        for i in range(submits // concurrency):
+            t0 = time.perf_counter()
+            assert await ledger.submit_audit({"n": i}, {"allow": True}, f"c{c}")
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(caller(c) for c in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    round_trips = {name: r.calls for name, r in replicas.items()}
+    await ledger.close()
+    return latencies, len(latencies) / elapsed, round_trips
+
+
+async def _direct(submits: int, concurrency: int, latency_s: float, coalesce_ms):
+    ledger = SimulatedLedger("qldb", latency_s=latency_s, coalesce_ms=coalesce_ms)
+
+    async def caller(c):
+        for i in range(submits // concurrency):
+            assert await ledger.submit_audit({"n": i}, {"allow": True}, f"c{c}")
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(caller(c) for c in range(concurrency)))
+    return submits / (time.perf_counter() - t0), ledger.calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--submits", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--scale", type=float, default=0.1)
+    args = parser.parse_args()
+
+    print(f"{'quorum':>7}{'p50 ms':>10}{'p99 ms':>10}{'submits/s':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["WORM_FILE"] = os.path.join(tmp, "audits.worm")
+        for quorum in range(1, len(REPLICA_LATENCY_S) + 2):
+            latencies, rate, _ = asyncio.run(
+                _run(quorum, args.submits, args.concurrency, args.scale)
+            )
+            latencies.sort()
+            p99 = latencies[int(0.99 * (len(latencies) - 1))]
+            print(f"{quorum:>7}{statistics.median(latencies):>10.2f}{p99:>10.2f}{rate:>12,.0f}")
+
+    latency = REPLICA_LATENCY_S["qldb"] * args.scale
+    print(f"\n{'direct submit_audit':<22}{'submits/s':>12}{'round trips':>13}")
+    for coalesce_ms in (None, 0, 5):
+        rate, calls = asyncio.run(_direct(args.submits, args.concurrency, latency, coalesce_ms))
+        label = "no coalescing" if coalesce_ms is None else f"coalesce {coalesce_ms} ms"
+        print(f"{label:<22}{rate:>12,.0f}{calls:>13,}")
+
+
+if __name__ == "__main__":
+    main()
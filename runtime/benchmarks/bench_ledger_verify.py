@@ -0,0 +1,87 @@
+"""
+Ledger integrity verification benchmark: serial vs parallel chunked.
+
+Run from the runtime/ directory:
+
+    python benchmarks/bench_ledger_verify.py [--entries 500000] [--workers 1 2 4]
+        [--chunk-mb 8]
+
+Several --chunk-mb values sweep chunk size for each worker count. Worker
+counts above the machine's core count only time-share, so the speedup
+needs a multi-core host; the core count is printed first.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from decision_ledger import DecisionLedger, GENESIS_HASH, utc_now_iso  # noqa: E402
+from ledger_verify import DEFAULT_CHUNK_BYTES, verify_file_parallel  # noqa: E402
+
+
+def _build_ledger(path: str, entries: int) -> None:
+    """Write a valid hash chain directly (no per-entry fsync)."""
+    helper = DecisionLedger(log_file=path, auto_load=False)
+    prev = GENESIS_HASH
+    ts = utc_now_iso()
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(entries):
+            entry = {
+                "index": i,
+                "timestamp": ts,
+                "event_type": "tool_auth",
+                "data": {
+                    "request_id": f"req_{i}",
+                    "user_id": f"user_{i % 97}",
+                    "tool": "database_query",
+                    "authorized": i % 5 != 0,
+                },
+                "previous_hash": prev,
+            }
+            entry["hash"] = prev = helper._calculate_hash(entry)
+            f.write(json.dumps(entry, sort_keys=True) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=500_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument(
+        "--chunk-mb", type=float, nargs="+", default=[DEFAULT_CHUNK_BYTES / 2**20]
+    )
+    parser.add_argument("--dir", default=None)
+    args = parser.parse_args()
+
+    logging.getLogger("decision_ledger").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        path = os.path.join(tmp, "ledger.jsonl")
+        _build_ledger(path, args.entries)
+        size_mb = os.path.getsize(path) / 2**20
+        print(f"ledger: {args.entries} entries, {size_mb:.0f} MB, {os.cpu_count()} CPUs")
+        print(f"{'path':<34}{'seconds':>10}{'entries/s':>14}")
+
+        ledger = DecisionLedger(log_file=path, auto_load=False)
+        t0 = time.perf_counter()
+        assert ledger.verify_file_integrity()
+        serial = time.perf_counter() - t0
+        print(f"{'verify_file_integrity':<34}{serial:>10.2f}{args.entries / serial:>14,.0f}")
+
+        for workers in args.workers:
+            for chunk_mb in args.chunk_mb:
+                result = verify_file_parallel(
+                    path, workers=workers, chunk_bytes=int(chunk_mb * 2**20)
+                )
+                assert result.valid
+                label = f"parallel workers={workers} chunk={chunk_mb:g}MB"
+                print(f"{label:<34}{result.seconds:>10.2f}{result.entries_per_sec:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
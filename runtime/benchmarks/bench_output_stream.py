@@ -0,0 +1,101 @@
+"""
+AIFirewall streaming output benchmark: filter_output on the complete
+response (what a buffered stream has to do) vs OutputStream fed token by
+token.
+
+Responses come from bench_pii_redaction.build_response ("prose") or are
+numeric tables of counts, dates, amounts and phone numbers ("numeric"),
+and are split into BPE-like tokens of up to 4 characters. Reported per
+response size:
+
+  - first emit: tokens fed before the stream emits anything (the buffered
+    path emits only after the last token)
+  - held back: characters buffered after each feed, mean and max
+  - total ms: all feeds + close vs one filter_output call
+
+The streamed output must equal filter_output's filtered_response. Run from
+the runtime/ directory:
+
+    python benchmarks/bench_output_stream.py [--sizes 4 64 1024] [--density 0.05]
+"""
+
+import argparse
+import logging
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_firewall_core import AIFirewall  # noqa: E402
+from bench_pii_redaction import build_response  # noqa: E402
+
+TOKEN = re.compile(r"\s*\S{1,4}|\s+")
+
+
+def build_numeric(size_kb: int, rng: random.Random) -> str:
+    rows, size = [], 0
+    while size < size_kb * 1024:
+        row = (
+            f"{rng.randint(1, 99)} {rng.randint(100, 9999)} "
+            f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} "
+            f"{rng.randint(1, 99999)}.{rng.randint(0, 99):02d}"
+        )
+        if rng.random() < 0.05:
+            row += f" 555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}"
+        rows.append(row)
+        size += len(row) + 1
+    return "\n".join(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 64, 1024])
+    parser.add_argument("--density", type=float, default=0.05)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    rng = random.Random(7)
+    print(
+        f"{'text':>8}{'KB':>6}{'tokens':>9}{'first emit':>12}{'held mean':>11}{'held max':>10}"
+        f"{'buffered ms':>13}{'stream ms':>11}"
+    )
+    cases = [("prose", size_kb) for size_kb in args.sizes]
+    cases += [("numeric", size_kb) for size_kb in args.sizes]
+    for kind, size_kb in cases:
+        if kind == "prose":
+            text = build_response(size_kb, args.density, rng)
+        else:
+            text = build_numeric(size_kb, rng)
+        tokens = TOKEN.findall(text)
+
+        t0 = time.perf_counter()
+        expected = AIFirewall().filter_output(text)["filtered_response"]
+        buffered_ms = (time.perf_counter() - t0) * 1000
+
+        stream = AIFirewall().stream_output()
+        out, held, first = [], [], None
+        t0 = time.perf_counter()
+        for i, token in enumerate(tokens):
+            piece = stream.feed(token)
+            if piece:
+                out.append(piece)
+                if first is None:
+                    first = i + 1
+            held.append(len(stream._buffer))
+        out.append(stream.close())
+        stream_ms = (time.perf_counter() - t0) * 1000
+
+        if "".join(out) != expected:
+            raise SystemExit(f"{size_kb} KB: streamed output differs from filter_output")
+        print(
+            f"{kind:>8}{size_kb:>6}{len(tokens):>9}{first or '-':>12}{statistics.mean(held):>11.1f}"
+            f"{max(held):>10}{buffered_ms:>13.1f}{stream_ms:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
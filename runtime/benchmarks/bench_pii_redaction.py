@@ -0,0 +1,103 @@
+"""
+AIFirewall PII redaction benchmark: the previous per-type re.findall +
+re.sub loop vs the single-pass PIIRedactor, on large LLM-style responses.
+
+Each response is prose, markdown tables and code. --density controls how
+often a paragraph carries PII (emails, phones, SSNs, cards, IPs, API keys).
+Both paths must return the same text and counts. Run from the runtime/
+directory:
+
+    python benchmarks/bench_pii_redaction.py [--sizes 16 256 1024] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_firewall_core import AIFirewall  # noqa: E402
+
+PROSE = (
+    "Based on the Q3 report, revenue grew 12.5% across 42 regions while churn "
+    "fell to 3.1%. The migration to v2.4 completed on 2024-06-30 for 1500 "
+    "accounts; see section 4.2 for details and the rollback plan."
+)
+TABLE = "| region | units | growth |\n|---|---|---|\n| EMEA | 1,204 | 4.2% |\n| APAC | 987 | 6.0% |\n"
+CODE = "```python\nfor row in rows[:100]:\n    total += row.amount * 1.07\n```\n"
+PII = [
+    "Reach the account owner at jane.smith@example.com or (555) 123-4567.",
+    "The customer's SSN on file is 123-45-6789.",
+    "Card ending 4111 1111 1111 1111 was charged twice.",
+    "Requests came from 192.168.10.24 and 10.0.0.7.",
+    "Rotate the leaked key sk_live4eC39HqLyjWDarjtT1zdp7dc immediately.",
+    "Call +1 415 555 0132 for escalation.",
+]
+
+
+def build_response(size_kb: int, density: float, rng: random.Random) -> str:
+    parts, size = [], 0
+    while size < size_kb * 1024:
+        kind = rng.random()
+        part = TABLE if kind < 0.15 else CODE if kind < 0.3 else PROSE
+        if rng.random() < density:
+            part += " " + rng.choice(PII)
+        parts.append(part + "\n\n")
+        size += len(parts[-1])
+    return "".join(parts)
+
+
+def legacy_redact(firewall: AIFirewall, text: str):
+    """The previous implementation, kept here as the baseline."""
+    redacted = text
+    counts = {}
+    for pii_type, pattern in firewall.PII_PATTERNS.items():
+        matches = re.findall(pattern, text)
+        if matches:
+            counts[pii_type] = len(matches)
+            redacted = re.sub(pattern, f"[REDACTED_{pii_type.upper()}]", redacted)
+    return redacted, counts
+
+
+def single_pass(firewall: AIFirewall, text: str):
+    return firewall._REDACTOR.redact(text)
+
+
+def _best_s(fn, firewall, text, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(firewall, text)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 256, 1024])
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.0, 0.05, 0.5])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    firewall = AIFirewall()
+    rng = random.Random(7)
+    print(f"{'KB':>6}{'density':>9}{'spans':>7}{'legacy MB/s':>13}{'single MB/s':>13}{'speedup':>9}")
+    for size_kb in args.sizes:
+        for density in args.densities:
+            text = build_response(size_kb, density, rng)
+            mb = len(text) / 1e6
+            legacy_s, legacy = _best_s(legacy_redact, firewall, text, args.repeat)
+            single_s, single = _best_s(single_pass, firewall, text, args.repeat)
+            if legacy != single:
+                raise SystemExit(f"{size_kb} KB density {density}: results differ")
+            print(
+                f"{size_kb:>6}{density:>9.2f}{sum(single[1].values()):>7}"
+                f"{mb / legacy_s:>13.1f}{mb / single_s:>13.1f}{legacy_s / single_s:>8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+ConscienceEngine policy pipeline benchmark: evaluate_intent p50/p99 with
+10-100 registered rules, sequential awaits vs the cost-ordered concurrent
+pipeline.
+
+Each rule set is mostly in-memory checks (cost 0, run inline) plus a share
+of rules that await simulated I/O (cost 1, run concurrently). "deny" makes
+a cheap rule in the middle of the priority order reject: sequential stops
+there, the pipeline skips the I/O rules ranked below it but still waits for
+the ones above it. Run from the runtime/ directory:
+
+    python benchmarks/bench_policy_pipeline.py [--rules 10 25 50 100] [--io-share 0.2] [--io-ms 1.0]
+
+--sample-rate sets the PolicyProfiler sampling rate (default 0, off) to
+measure profiling overhead.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from galani_protocol_v2 import (  # noqa: E402
+    ActionIntent,
+    ConscienceEngine,
+    PolicyProfiler,
+    PolicyRule,
+)
+
+SECRET = "bench_secret"
+
+
+class CheapRule(PolicyRule):
+    def __init__(self, priority: int, deny_key: str = ""):
+        self.priority = priority
+        self.deny_key = deny_key
+
+    async def evaluate(self, intent, context):
+        if self.deny_key and intent.parameters.get(self.deny_key):
+            return False, f"denied by {self.deny_key}"
+        return intent.parameters.get("amount", 0) >= 0, "ok"
+
+    def get_priority(self) -> int:
+        return self.priority
+
+    def get_cost(self) -> float:
+        return 0.0
+
+
+class IORule(PolicyRule):
+    def __init__(self, priority: int, latency_s: float):
+        self.priority = priority
+        self.latency_s = latency_s
+
+    async def evaluate(self, intent, context):
+        await asyncio.sleep(self.latency_s)
+        return True, "ok"
+
+    def get_priority(self) -> int:
+        return self.priority
+
+
+class SequentialEngine(ConscienceEngine):
+    """The previous behaviour: await every rule in priority order."""
+
+    async def _run_policies(self, intent, context, profiler=None):
+        for policy in self.policies:
+            is_allowed, reason = await policy.evaluate(intent, context)
+            if not is_allowed:
+                return reason
+        return None
+
+
+def _engine(cls, rules: int, io_share: float, io_ms: float, sample_rate: float):
+    engine = cls(
+        domain="generic",
+        secret_key=SECRET,
+        profiler=PolicyProfiler(sample_rate=sample_rate),
+    )
+    io_every = max(1, round(1 / io_share)) if io_share else 0
+    for i in range(rules):
+        priority = rules - i
+        if io_every and i % io_every == 0:
+            engine.register_policy(IORule(priority, io_ms / 1000))
+        else:
+            engine.register_policy(CheapRule(priority))
+    engine.register_policy(CheapRule(rules // 2, deny_key="deny"))
+    return engine
+
+
+def _intent(deny: bool) -> ActionIntent:
+    intent = ActionIntent(
+        intent_id=str(uuid.uuid4()),
+        action_type="transfer_funds",
+        parameters={"amount": 100, "deny": deny},
+        agent_id="AGENT_BENCH",
+        timestamp=time.time(),
+        domain="generic",
+    )
+    intent.signature = intent.compute_hash(SECRET)
+    return intent
+
+
+async def _measure(engine, deny: bool, samples: int):
+    intent = _intent(deny)
+    latencies = []
+    for _ in range(samples):
+        t0 = time.perf_counter()
+        approved, _ = await engine.evaluate_intent(intent, {})
+        latencies.append((time.perf_counter() - t0) * 1000)
+        assert approved is not deny
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(0.99 * (len(latencies) - 1))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rules", type=int, nargs="+", default=[10, 25, 50, 100])
+    parser.add_argument("--io-share", type=float, default=0.2)
+    parser.add_argument("--io-ms", type=float, default=1.0)
+    parser.add_argument("--samples", type=int, default=300)
+    parser.add_argument("--sample-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    print(
+        f"{'rules':>6}{'outcome':>9}"
+        f"{'seq p50':>10}{'seq p99':>10}{'pipe p50':>10}{'pipe p99':>10}  (ms)"
+    )
+    for rules in args.rules:
+        for deny in (False, True):
+            row = []
+            for cls in (SequentialEngine, ConscienceEngine):
+                engine = _engine(cls, rules, args.io_share, args.io_ms, args.sample_rate)
+                row += asyncio.run(_measure(engine, deny, args.samples))
+            outcome = "deny" if deny else "allow"
+            print(f"{rules:>6}{outcome:>9}" + "".join(f"{v:>10.3f}" for v in row))
+
+
+if __name__ == "__main__":
+    main()
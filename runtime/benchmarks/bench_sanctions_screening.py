@@ -0,0 +1,123 @@
+"""
+Sanctions screening benchmark: index build / reload time, memory, and
+per-field screening latency at large list sizes.
+
+The list is synthetic: 2-4 word names from a fixed syllable alphabet, each
+with two aliases (an identifier form and a reordered name). Run from the
+runtime/ directory:
+
+    python benchmarks/bench_sanctions_screening.py [--entries 100000] [--samples 20000]
+"""
+
+import argparse
+import csv
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sanctions_screening import SanctionsScreener  # noqa: E402
+
+SYLLABLES = ["ka", "ro", "mi", "tan", "vel", "zor", "qui", "bel", "dra", "osh", "lun", "fey"]
+SUFFIXES = ["bank", "trading", "holdings", "shipping", "group", "llc", "ltd", "industries"]
+
+
+def _word(rng):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).title()
+
+
+def _write_list(path: str, entries: int, rng) -> list:
+    names = []
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["uid", "name", "aliases", "list"])
+        for i in range(entries):
+            words = [_word(rng) for _ in range(rng.randint(1, 3))] + [rng.choice(SUFFIXES)]
+            name = " ".join(words)
+            aliases = ";".join(["_".join(words).upper() + f"_{i:03d}", " ".join(reversed(words))])
+            writer.writerow([f"SDN-{i}", name, aliases, "OFAC_SDN"])
+            names.append(name)
+    return names
+
+
+def _percentiles(fn, values):
+    latencies = []
+    for value in values:
+        t0 = time.perf_counter()
+        fn(value)
+        latencies.append((time.perf_counter() - t0) * 1e6)
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(0.99 * (len(latencies) - 1))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, nargs="+", default=[100_000])
+    parser.add_argument("--samples", type=int, default=20_000)
+    args = parser.parse_args()
+    rng = random.Random(7)
+
+    for entries in args.entries:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sanctions.csv")
+            names = _write_list(path, entries, rng)
+
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            screener = SanctionsScreener(path, reload_interval_s=0)
+            build_s = time.perf_counter() - t0
+            mem_mb = tracemalloc.get_traced_memory()[0] / 2**20
+            tracemalloc.stop()
+
+            index = screener.index
+            listed = [rng.choice(names) for _ in range(args.samples)]
+            clean = [
+                f"{_word(rng)} {_word(rng)} {rng.choice(SUFFIXES)}" for _ in range(args.samples)
+            ]
+            memos = [
+                f"Invoice {i} payment for consulting services, beneficiary "
+                f"{rng.choice(names) if i % 10 == 0 else _word(rng)} via correspondent "
+                f"account, reference {rng.randrange(10**8)}"
+                for i in range(args.samples)
+            ]
+
+            print(f"entries: {entries:,}  names+aliases: {len(index.exact):,}  "
+                  f"trie states: {len(index._goto):,}")
+            print(f"build (load CSV + index): {build_s:.2f} s, ~{mem_mb:.0f} MB")
+            t0 = time.perf_counter()
+            screener.reload(force=True)
+            print(f"reload (off to the side, then swap): {time.perf_counter() - t0:.2f} s\n")
+
+            print(f"{'case':<36}{'p50 us':>10}{'p99 us':>10}")
+            cases = [
+                ("exact field, listed", lambda v: index.screen({"counterparty": v}), listed),
+                ("exact field, clean", lambda v: index.screen({"counterparty": v}), clean),
+                ("3 fields, clean", lambda v: index.screen(
+                    {"entity_id": v, "counterparty": v, "recipient": v}), clean),
+                ("free-text memo (~20 words)", lambda v: index.screen({"memo": v}), memos),
+            ]
+            for label, fn, values in cases:
+                p50, p99 = _percentiles(fn, values)
+                print(f"{label:<36}{p50:>10.1f}{p99:>10.1f}")
+
+            hits = sum(bool(index.screen({"memo": m})) for m in memos)
+            print(f"\nmemos with hits: {hits:,} / {len(memos):,}")
+
+            # Baseline: linear substring scan, what a naive list check does
+            lowered = [n.lower() for n in names]
+            sample = memos[:50]
+            t0 = time.perf_counter()
+            for memo in sample:
+                text = memo.lower()
+                any(n in text for n in lowered)
+            naive_us = (time.perf_counter() - t0) / len(sample) * 1e6
+            print(f"naive substring scan over the list: {naive_us:,.0f} us / memo")
+
+
+if __name__ == "__main__":
+    main()
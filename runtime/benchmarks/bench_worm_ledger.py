@@ -0,0 +1,137 @@
+"""
+WORM ledger benchmark: submit / query_chain latency at large record counts.
+
+The store is prefilled by writing segment files directly in the
+"<sha256>:<payload>" format, so opening the backend also times the index
+rebuild. Run from the runtime/ directory:
+
+    python benchmarks/bench_worm_ledger.py [--records 1000000 10000000] [--samples 10000]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ledgers.worm_fallback import WORMFallback  # noqa: E402
+
+
+def _prefill(path: str, records: int, segment_bytes: int) -> list:
+    """Write sealed segments plus an active file; returns a sample of hashes."""
+    sample, segment, size = [], 1, 0
+    f = open(f"{path}.{segment:06d}", "wb")
+    for i in range(records):
+        payload = json.dumps(
+            {
+                "intent": {"action": "transfer", "amount": i % 10_000, "n": i},
+                "decision": {"allow": i % 5 != 0},
+                "user_id": f"user_{i % 97}",
+                "timestamp": "2025-01-01T00:00:00+00:00",
+            }
+        )
+        h = hashlib.sha256(payload.encode()).hexdigest()
+        line = f"{h}:{payload}\n".encode()
+        if size + len(line) > segment_bytes:
+            f.close()
+            segment += 1
+            size = 0
+            f = open(f"{path}.{segment:06d}", "wb")
+        f.write(line)
+        size += len(line)
+        if i % 997 == 0:
+            sample.append(h)
+    f.close()
+    os.rename(f"{path}.{segment:06d}", path)  # last segment stays active
+    return sample
+
+
+def _pct(values: list, q: float) -> float:
+    return sorted(values)[min(len(values) - 1, int(q * len(values)))]
+
+
+async def _measure(ledger: WORMFallback, hashes: list, samples: int):
+    submit = []
+    for i in range(samples):
+        t0 = time.perf_counter()
+        await ledger.submit_audit({"action": "transfer", "n": i}, {"allow": True}, "bench")
+        submit.append((time.perf_counter() - t0) * 1000)
+
+    query = []
+    for h in random.choices(hashes, k=samples):
+        t0 = time.perf_counter()
+        assert await ledger.query_chain(h)
+        query.append((time.perf_counter() - t0) * 1000)
+    return submit, query
+
+
+async def _throughput(ledger: WORMFallback, total: int, concurrency: int) -> float:
+    """Submits/s with `concurrency` callers in flight (fsync'd group commits)."""
+    per_caller = total // concurrency
+
+    async def caller(c):
+        for i in range(per_caller):
+            await ledger.submit_audit({"action": "transfer", "n": i}, {"allow": True}, f"c{c}")
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(caller(c) for c in range(concurrency)))
+    return per_caller * concurrency / (time.perf_counter() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--samples", type=int, default=10_000)
+    parser.add_argument("--segment-mb", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 256])
+    parser.add_argument("--dir", default=None)
+    args = parser.parse_args()
+
+    segment_bytes = args.segment_mb * 1024 * 1024
+    print(
+        f"{'records':>12}{'rebuild s':>11}{'reopen s':>10}"
+        f"{'submit p50/p99 ms':>20}{'query p50/p99 ms':>19}"
+    )
+    for records in args.records:
+        with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+            path = os.path.join(tmp, "audits.worm")
+            hashes = _prefill(path, records, segment_bytes)
+            os.environ["WORM_FILE"] = path
+            os.environ["WORM_SEGMENT_BYTES"] = str(segment_bytes)
+
+            t0 = time.perf_counter()
+            ledger = WORMFallback()  # no sidecar yet: full rebuild
+            rebuild = time.perf_counter() - t0
+            asyncio.run(ledger.close())
+
+            t0 = time.perf_counter()
+            ledger = WORMFallback()  # sidecar present
+            reopen = time.perf_counter() - t0
+
+            async def run():
+                measured = await _measure(ledger, hashes, args.samples)
+                rates = [
+                    await _throughput(ledger, args.samples, c) for c in args.concurrency
+                ]
+                await ledger.close()
+                return measured, rates
+
+            (submit, query), rates = asyncio.run(run())
+            print(
+                f"{records:>12,}{rebuild:>11.1f}{reopen:>10.1f}"
+                f"{statistics.median(submit):>11.3f} / {_pct(submit, 0.99):<6.3f}"
+                f"{statistics.median(query):>10.3f} / {_pct(query, 0.99):<6.3f}"
+            )
+            for concurrency, rate in zip(args.concurrency, rates):
+                print(f"{'':>12}  submit/s at concurrency {concurrency}: {rate:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
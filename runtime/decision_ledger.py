@@ -6,14 +6,24 @@ Key properties:
 - Hash-chained JSONL log entries (tamper evident)
 - Append-only storage semantics (file system / object storage compatible)
 - Supports restart/reload and integrity verification
+- Optional group-commit mode: concurrent appends share one write + fsync
+- Signed checkpoints so restarts only re-verify the tail of the log
+- Optional secondary indexes (event_type / user_id / time bucket -> offsets)
+- Optional per-batch Merkle roots with O(log n) inclusion proofs
 """
 
+import bisect
 import json
 import hashlib
+import hmac
 import os
+import threading
+import time
+from array import array
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, Iterator, List, Any, Optional
 from compliance_mapper import map_event_to_controls
+from ledgers.merkle import MerkleAccumulator, merkle_proof, verify_proof
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -21,12 +31,256 @@ logger = logging.getLogger("decision_ledger")
 
 
 GENESIS_HASH = "0" * 64
+CHECKPOINT_SUFFIX = ".checkpoints"
+INDEX_SUFFIX = ".idx"
+MERKLE_SUFFIX = ".merkle"
+TIME_BUCKET_CHARS = len("YYYY-MM-DDTHH")  # hourly buckets
 
 
 def utc_now_iso() -> str:
     return datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
 
 
+def compute_entry_hash(entry: Dict[str, Any]) -> str:
+    """SHA-256 over the canonical JSON of an entry, excluding 'hash'"""
+    if "hash" in entry:
+        entry = {k: v for k, v in entry.items() if k != "hash"}
+    entry_str = json.dumps(entry, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(entry_str.encode("utf-8")).hexdigest()
+
+
+def verify_merkle_proof(entry: Dict[str, Any], proof: Dict[str, Any]) -> bool:
+    """
+    Auditor-side check of a DecisionLedger.get_merkle_proof() result:
+    entry content -> entry hash -> batch root, in O(log n) hashes.
+    """
+    entry_hash = compute_entry_hash(entry)
+    if entry_hash != entry.get("hash") or entry_hash != proof.get("entry_hash"):
+        return False
+    path = [(side == "L", bytes.fromhex(node)) for side, node in proof["path"]]
+    return verify_proof(bytes.fromhex(entry_hash), path, bytes.fromhex(proof["root"]))
+
+
+class GroupCommitWriter:
+    """
+    Background writer that coalesces concurrent appends into a single
+    write + fsync per commit window.
+
+    Callers hand over already serialized lines via submit() and then block in
+    wait_durable() until the batch containing their line has been fsynced.
+    Lines that queue up while an fsync is in flight go out together in the
+    next commit. max_latency_ms > 0 additionally holds a commit open for that
+    long (or until max_batch lines are pending) to gather more writers, which
+    trades single-writer latency for fewer fsyncs on slow disks. Lines reach
+    the file in submission order.
+    """
+
+    def __init__(
+        self, path: str, max_latency_ms: float = 0.0, max_batch: int = 256
+    ):
+        if max_batch < 1:
+            raise ValueError("max_batch must be >= 1")
+        self.path = path
+        self.max_latency = max(0.0, max_latency_ms) / 1000.0
+        self.max_batch = max_batch
+
+        self._fh = open(path, "ab")
+        self._lock = threading.Lock()
+        self._has_work = threading.Condition(self._lock)
+        self._committed = threading.Condition(self._lock)
+        self._pending: List[bytes] = []
+        self._submitted = 0
+        self._durable = 0
+        self._error: Optional[BaseException] = None
+        self._closed = False
+
+        self._thread = threading.Thread(
+            target=self._run, name="ledger-group-commit", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, line: bytes) -> int:
+        """Queue a line for the next commit. Returns its sequence number."""
+        with self._lock:
+            if self._error is not None:
+                raise RuntimeError("Ledger writer failed") from self._error
+            if self._closed:
+                raise RuntimeError("Ledger writer is closed")
+            self._pending.append(line)
+            self._submitted += 1
+            self._has_work.notify()
+            return self._submitted
+
+    @property
+    def submitted(self) -> int:
+        """Sequence number of the most recently submitted line."""
+        with self._lock:
+            return self._submitted
+
+    def wait_durable(self, seq: int) -> None:
+        """Block until the line with sequence number seq has been fsynced."""
+        with self._lock:
+            while self._durable < seq and self._error is None:
+                self._committed.wait()
+            if self._durable < seq:
+                raise RuntimeError("Ledger group commit failed") from self._error
+
+    def close(self) -> None:
+        """Flush everything still pending, stop the writer and close the file."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._has_work.notify()
+        self._thread.join()
+        self._fh.close()
+
+    def _next_batch(self) -> List[bytes]:
+        with self._lock:
+            while not self._pending and not self._closed:
+                self._has_work.wait()
+
+            # Commit window: give concurrent writers a chance to join the batch
+            deadline = time.monotonic() + self.max_latency
+            while self._pending and len(self._pending) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._closed:
+                    break
+                self._has_work.wait(remaining)
+
+            batch = self._pending[: self.max_batch]
+            del self._pending[: self.max_batch]
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return  # closed and drained
+
+            try:
+                self._fh.write(b"".join(batch))
+                self._fh.flush()
+                os.fsync(self._fh.fileno())
+            except BaseException as e:
+                logger.error(f"❌ Ledger group commit failed: {e}")
+                with self._lock:
+                    self._error = e
+                    self._committed.notify_all()
+                return
+
+            with self._lock:
+                self._durable += len(batch)
+                self._committed.notify_all()
+
+
+class LedgerIndex:
+    """
+    Secondary indexes over a ledger file, persisted as an append-only JSONL
+    sidecar with one compact record per entry:
+      {"i": index, "o": byte offset, "e": event_type, "u": user_id,
+       "t": timestamp, "h": hash prefix}
+
+    In memory:
+      offsets   entry index -> byte offset in the ledger file
+      by_type   event_type  -> entry indices
+      by_user   user_id     -> entry indices
+      by_bucket hour bucket -> [first index, last index]
+
+    The sidecar is not fsynced; anything lost in a crash is re-derived from
+    the ledger on the next load.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fh = None
+        self._clear()
+
+    def _clear(self) -> None:
+        self.offsets = array("q")
+        self.by_type: Dict[str, array] = {}
+        self.by_user: Dict[str, array] = {}
+        self.by_bucket: Dict[str, List[int]] = {}
+        self.last_hash: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def _add(self, event_type, user_id, timestamp, offset) -> None:
+        idx = len(self.offsets)
+        self.offsets.append(offset)
+        self.by_type.setdefault(event_type, array("q")).append(idx)
+        if user_id is not None:
+            self.by_user.setdefault(user_id, array("q")).append(idx)
+        bucket = (timestamp or "")[:TIME_BUCKET_CHARS]
+        span = self.by_bucket.get(bucket)
+        if span is None:
+            self.by_bucket[bucket] = [idx, idx]
+        else:
+            span[1] = idx
+
+    def add(self, entry: Dict[str, Any], offset: int) -> None:
+        """Index an appended entry and persist it to the sidecar."""
+        user_id = (entry.get("data") or {}).get("user_id")
+        if user_id is not None:
+            user_id = str(user_id)
+        record = {
+            "i": len(self.offsets),
+            "o": offset,
+            "e": entry.get("event_type"),
+            "u": user_id,
+            "t": entry.get("timestamp"),
+            "h": entry["hash"][:16],
+        }
+        self._add(record["e"], record["u"], record["t"], offset)
+        self.last_hash = record["h"]
+        if self._fh is not None:
+            self._fh.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def load(self) -> None:
+        """Read the sidecar, dropping (and truncating) any torn tail."""
+        if not os.path.exists(self.path):
+            return
+        valid_bytes = 0
+        with open(self.path, "rb") as f:
+            for raw in f:
+                try:
+                    rec = json.loads(raw)
+                except ValueError:
+                    break
+                if rec.get("i") != len(self.offsets) or not raw.endswith(b"\n"):
+                    break
+                self._add(rec["e"], rec["u"], rec["t"], rec["o"])
+                self.last_hash = rec["h"]
+                valid_bytes += len(raw)
+        if valid_bytes < os.path.getsize(self.path):
+            os.truncate(self.path, valid_bytes)
+
+    def reset(self) -> None:
+        """Drop everything, in memory and on disk."""
+        self.close()
+        self._clear()
+        open(self.path, "w").close()
+
+    def open(self) -> None:
+        self._fh = open(self.path, "a", encoding="utf-8")
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def span_between(self, start: str, end: str) -> Optional[range]:
+        """Entry index range covering all hour buckets overlapping [start, end)."""
+        lo_bucket, hi_bucket = start[:TIME_BUCKET_CHARS], end[:TIME_BUCKET_CHARS]
+        lo = hi = None
+        for bucket, (first, last) in self.by_bucket.items():
+            if lo_bucket <= bucket <= hi_bucket:
+                lo = first if lo is None else min(lo, first)
+                hi = last if hi is None else max(hi, last)
+        return None if lo is None else range(lo, hi + 1)
+
+
 class DecisionLedger:
     """
     Ledger file format: JSONL (one JSON object per line)
@@ -40,34 +294,124 @@ class DecisionLedger:
         "previous_hash": str(64),
         "hash": str(64)
       }
+
+    With group_commit=True entries are written through a persistent
+    GroupCommitWriter: concurrent log_interaction() calls are coalesced into
+    one write + fsync, and each call still returns only once its entry is
+    durable on disk.
+
+    Checkpoints: when a checkpoint key is configured (checkpoint_key or the
+    LEDGER_CHECKPOINT_KEY env var), an HMAC-signed record
+      {"index", "entry_offset", "offset", "hash", "signature"}
+    is appended to <log_file>.checkpoints every checkpoint_every entries and
+    on close(). Loading resumes from the newest trusted checkpoint and only
+    verifies entries after it.
+
+    With materialize_chain=False the entries are not kept in self.chain;
+    only previous_hash / next_index are tracked and reads go to the file.
+
+    With indexed=True a LedgerIndex is maintained in <log_file>.idx so the
+    get_events_* lookups cost O(matches): they pick entries from self.chain,
+    or seek straight to them in the file when the chain is not materialized.
+
+    With merkle_batch_size=N every N entries (and on close()) the entry hashes
+    since the previous batch are sealed under one Merkle root, appended to
+    <log_file>.merkle and handed to the optional anchor callback, so external
+    anchoring (WORM/QLDB/Fabric) needs one write per batch. get_merkle_proof()
+    returns an inclusion proof for any sealed entry; verify_merkle_proof()
+    checks it without the rest of the ledger.
     """
 
     def __init__(
-        self, log_file: str = "ai_firewall_ledger.jsonl", auto_load: bool = True
+        self,
+        log_file: str = "ai_firewall_ledger.jsonl",
+        auto_load: bool = True,
+        group_commit: bool = False,
+        commit_max_latency_ms: float = 0.0,
+        commit_max_batch: int = 256,
+        checkpoint_every: int = 10_000,
+        checkpoint_key: Optional[bytes] = None,
+        materialize_chain: bool = True,
+        indexed: bool = False,
+        merkle_batch_size: int = 0,
+        anchor: Optional[Callable[[Dict[str, Any]], None]] = None,
     ):
         self.log_file = log_file
+        self.checkpoint_file = log_file + CHECKPOINT_SUFFIX
         self.chain: List[Dict[str, Any]] = []
         self.previous_hash: str = GENESIS_HASH
+        self.next_index: int = 0
+        self.materialize_chain = materialize_chain
+        self.checkpoint_every = checkpoint_every
+        if checkpoint_key is None and os.getenv("LEDGER_CHECKPOINT_KEY"):
+            checkpoint_key = os.environ["LEDGER_CHECKPOINT_KEY"].encode()
+        self._checkpoint_key = checkpoint_key
+        self._last_checkpoint_index = -1
+        self._checkpoint_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._writer: Optional[GroupCommitWriter] = None
+        self._index: Optional[LedgerIndex] = (
+            LedgerIndex(log_file + INDEX_SUFFIX) if indexed else None
+        )
+        self.merkle_file = log_file + MERKLE_SUFFIX
+        self.merkle_batch_size = merkle_batch_size
+        self.merkle_batches: List[Dict[str, Any]] = []
+        self._anchor = anchor
+        self._merkle_firsts: List[int] = []
+        self._merkle_next_batch = 0
+        self._merkle_durable: Dict[int, Dict[str, Any]] = {}
+        self._merkle_pending = MerkleAccumulator()
+        self._merkle_pending_first = 0
+        self._merkle_pending_offset = 0
+        self._merkle_lock = threading.Lock()
 
         # Ensure file exists
         if not os.path.exists(self.log_file):
             open(self.log_file, "a").close()
+        self._tail_offset = os.path.getsize(self.log_file)
+        self._last_entry_offset = 0
 
         if auto_load:
             self.load_from_file(verify=True)
 
+        if group_commit:
+            self._writer = GroupCommitWriter(
+                self.log_file,
+                max_latency_ms=commit_max_latency_ms,
+                max_batch=commit_max_batch,
+            )
+
+    def close(self) -> None:
+        """Flush pending group commits, checkpoint the tail and release the file."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self.write_checkpoint()
+        if self.merkle_batch_size > 0:
+            self.seal_merkle_batch()
+        if self._index is not None:
+            self._index.close()
+
+    def __enter__(self) -> "DecisionLedger":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
     def _canonical_json(self, obj: Any) -> str:
         return json.dumps(obj, sort_keys=True, separators=(",", ":"))
 
     def _calculate_hash(self, entry_without_hash: Dict[str, Any]) -> str:
         """Calculate SHA-256 hash of entry (excluding 'hash')"""
-        entry_str = self._canonical_json(entry_without_hash)
-        return hashlib.sha256(entry_str.encode("utf-8")).hexdigest()
+        return compute_entry_hash(entry_without_hash)
+
+    def _serialize_entry(self, entry: Dict[str, Any]) -> str:
+        return json.dumps(entry, sort_keys=True) + "\n"
 
-    def _append_to_file(self, entry: Dict[str, Any]):
-        """Append entry to JSONL file"""
+    def _append_to_file(self, line: str):
+        """Append a serialized entry to the JSONL file"""
         with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry, sort_keys=True) + "\n")
+            f.write(line)
             f.flush()
             os.fsync(f.fileno())
 
@@ -105,33 +449,155 @@ class DecisionLedger:
 
         return True
 
+    # ------------------------------------------------------------------
+    # Checkpoints
+    # ------------------------------------------------------------------
+    def _sign_checkpoint(self, record: Dict[str, Any]) -> str:
+        body = {k: record[k] for k in ("index", "entry_offset", "offset", "hash")}
+        msg = self._canonical_json(body).encode("utf-8")
+        return hmac.new(self._checkpoint_key, msg, hashlib.sha256).hexdigest()
+
+    def _append_checkpoint(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._checkpoint_lock:
+            if record["index"] <= self._last_checkpoint_index:
+                return None
+            record = dict(record)
+            record["signature"] = self._sign_checkpoint(record)
+            with open(self.checkpoint_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, sort_keys=True) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._last_checkpoint_index = record["index"]
+        logger.info(f"📌 Ledger checkpoint at index={record['index']}")
+        return record
+
+    def write_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """
+        Write a signed checkpoint for the current chain head.
+        No-op without a checkpoint key or if the head is already checkpointed.
+        """
+        if not self._checkpoint_key:
+            return None
+        with self._lock:
+            record = {
+                "index": self.next_index - 1,
+                "entry_offset": self._last_entry_offset,
+                "offset": self._tail_offset,
+                "hash": self.previous_hash,
+            }
+            writer = self._writer
+            seq = writer.submitted if writer is not None else 0
+        if record["index"] < 0:
+            return None
+        if writer is not None:
+            writer.wait_durable(seq)
+        return self._append_checkpoint(record)
+
+    def _load_trusted_checkpoint(self, file_size: int) -> Optional[Dict[str, Any]]:
+        """Newest checkpoint with a valid signature that fits inside the file."""
+        if not self._checkpoint_key or not os.path.exists(self.checkpoint_file):
+            return None
+
+        best = None
+        with open(self.checkpoint_file, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    expected = self._sign_checkpoint(record)
+                except (ValueError, KeyError):
+                    continue  # torn or foreign record
+                if not hmac.compare_digest(str(record.get("signature")), expected):
+                    logger.warning(
+                        f"⚠️ Ignoring checkpoint with bad signature index={record['index']}"
+                    )
+                    continue
+                if record["offset"] > file_size:
+                    continue
+                if best is None or record["index"] > best["index"]:
+                    best = record
+        return best
+
+    def _checkpoint_matches(self, f, checkpoint: Dict[str, Any]) -> bool:
+        """Confirm the checkpointed entry really sits at the recorded offsets."""
+        try:
+            f.seek(checkpoint["entry_offset"])
+            entry = json.loads(f.readline())
+        except (ValueError, OSError):
+            return False
+        return (
+            entry.get("index") == checkpoint["index"]
+            and entry.get("hash") == checkpoint["hash"]
+            and f.tell() == checkpoint["offset"]
+        )
+
     def load_from_file(self, verify: bool = True) -> None:
         """
         Load chain from file into memory.
-        If verify=True: verifies hash chain as it loads.
+        If verify=True: verifies hash chain as it loads, starting after the
+        newest trusted checkpoint when one is available.
         """
         self.chain = []
         self.previous_hash = GENESIS_HASH
+        self.next_index = 0
+        self._last_entry_offset = 0
 
-        with open(self.log_file, "r", encoding="utf-8") as f:
-            idx = 0
-            for line in f:
-                line = line.strip()
+        checkpoint = None
+        if verify:
+            checkpoint = self._load_trusted_checkpoint(os.path.getsize(self.log_file))
+
+        with open(self.log_file, "rb") as f:
+            if checkpoint is not None and not self._checkpoint_matches(f, checkpoint):
+                logger.warning(
+                    f"⚠️ Checkpoint index={checkpoint['index']} does not match "
+                    f"{self.log_file}; verifying full chain"
+                )
+                checkpoint = None
+
+            trusted_upto = -1
+            offset = 0
+            if checkpoint is not None:
+                trusted_upto = checkpoint["index"]
+                self._last_checkpoint_index = trusted_upto
+                if not self.materialize_chain:
+                    # Nothing before the checkpoint needs to be read at all
+                    self.previous_hash = checkpoint["hash"]
+                    self.next_index = trusted_upto + 1
+                    self._last_entry_offset = checkpoint["entry_offset"]
+                    offset = checkpoint["offset"]
+            f.seek(offset)
+
+            for raw in f:
+                line_offset = offset
+                offset += len(raw)
+                line = raw.strip()
                 if not line:
                     continue
                 entry = json.loads(line)
+                idx = self.next_index
 
-                if verify:
+                if verify and idx > trusted_upto:
                     if not self._validate_entry(entry, self.previous_hash, idx):
                         raise RuntimeError(f"Ledger integrity failed at index={idx}")
                 # Accept entry
-                self.chain.append(entry)
+                if self.materialize_chain:
+                    self.chain.append(entry)
                 self.previous_hash = entry["hash"]
-                idx += 1
+                self.next_index = idx + 1
+                self._last_entry_offset = line_offset
 
-        if self.chain:
+        self._tail_offset = offset
+        if self._index is not None:
+            self._sync_index()
+        if self.merkle_batch_size > 0:
+            self._load_merkle_batches()
+
+        if self.next_index:
+            resumed = f" (resumed at checkpoint {trusted_upto})" if checkpoint else ""
             logger.info(
-                f"📥 Loaded {len(self.chain)} ledger events from {self.log_file}"
+                f"📥 Loaded {self.next_index} ledger events from {self.log_file}{resumed}"
             )
         else:
             logger.info(f"📥 Ledger empty: {self.log_file}")
@@ -142,29 +608,82 @@ class DecisionLedger:
 
         event_type: 'input_filter', 'output_filter', 'tool_auth', 'drift_detect', ...
         data: dict payload
+
+        Returns the entry once it has been fsynced to the ledger file.
         """
-        entry_without_hash = {
-            "index": len(self.chain),
-            "timestamp": utc_now_iso(),
-            "event_type": event_type,
-            "data": data,
-            "previous_hash": self.previous_hash,
-        }
+        checkpoint = sealed = None
+        with self._lock:
+            entry_without_hash = {
+                "index": self.next_index,
+                "timestamp": utc_now_iso(),
+                "event_type": event_type,
+                "data": data,
+                "previous_hash": self.previous_hash,
+            }
+
+            current_hash = self._calculate_hash(entry_without_hash)
+            entry = dict(entry_without_hash)
+            entry["hash"] = current_hash
+            line = self._serialize_entry(entry)
+            encoded = line.encode("utf-8")
 
-        current_hash = self._calculate_hash(entry_without_hash)
-        entry = dict(entry_without_hash)
-        entry["hash"] = current_hash
+            # Append to memory + disk (queued in chain order in group mode)
+            if self.materialize_chain:
+                self.chain.append(entry)
+            self.previous_hash = current_hash
+            self.next_index += 1
+            self._last_entry_offset = self._tail_offset
+            self._tail_offset += len(encoded)
+            if self._index is not None:
+                self._index.add(entry, self._last_entry_offset)
+            if self.merkle_batch_size > 0:
+                self._merkle_pending.append(bytes.fromhex(current_hash))
+                if len(self._merkle_pending) >= self.merkle_batch_size:
+                    sealed = self._seal_pending_locked(self._tail_offset)
 
-        # Append to memory + disk
-        self.chain.append(entry)
-        self.previous_hash = current_hash
-        self._append_to_file(entry)
+            if (
+                self._checkpoint_key
+                and self.checkpoint_every > 0
+                and self.next_index % self.checkpoint_every == 0
+            ):
+                checkpoint = {
+                    "index": entry["index"],
+                    "entry_offset": self._last_entry_offset,
+                    "offset": self._tail_offset,
+                    "hash": current_hash,
+                }
+
+            writer = self._writer
+            if writer is None:
+                self._append_to_file(line)
+            else:
+                seq = writer.submit(encoded)
+
+        if writer is not None:
+            writer.wait_durable(seq)
+        if checkpoint is not None:
+            self._append_checkpoint(checkpoint)
+        if sealed is not None:
+            self._persist_merkle_batch(sealed)
 
         logger.info(f"📝 Logged {event_type} event #{entry['index']}")
         return entry
 
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """Yield entries in order, from memory or straight from the ledger file."""
+        if self.materialize_chain:
+            yield from self.chain
+            return
+        with open(self.log_file, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
     def verify_chain_integrity(self) -> bool:
-        """Verify the chain in memory"""
+        """Verify the chain in memory (the file when the chain is not materialized)"""
+        if not self.materialize_chain:
+            return self.verify_file_integrity()
         prev = GENESIS_HASH
         for idx, entry in enumerate(self.chain):
             if not self._validate_entry(entry, prev, idx):
@@ -173,8 +692,13 @@ class DecisionLedger:
         logger.info("✅ Chain integrity verified (memory)")
         return True
 
-    def verify_file_integrity(self) -> bool:
-        """Verify the chain directly from file"""
+    def verify_file_integrity(self, workers: int = 1) -> bool:
+        """Verify the chain directly from file (workers > 1: ledger_verify pool)"""
+        if workers > 1:
+            from ledger_verify import verify_file_parallel
+
+            return verify_file_parallel(self.log_file, workers=workers).valid
+
         prev = GENESIS_HASH
         idx = 0
         with open(self.log_file, "r", encoding="utf-8") as f:
@@ -191,14 +715,218 @@ class DecisionLedger:
         logger.info("✅ Chain integrity verified (file)")
         return True
 
+    # ------------------------------------------------------------------
+    # Secondary indexes
+    # ------------------------------------------------------------------
+    def _sync_index(self) -> None:
+        """Load the index sidecar and index any ledger entries it is missing."""
+        self._index.close()
+        index = self._index = LedgerIndex(self._index.path)
+        index.load()
+
+        with open(self.log_file, "rb") as f:
+            offset = 0
+            if len(index):
+                stale = len(index) > self.next_index
+                if not stale:
+                    f.seek(index.offsets[-1])
+                    try:
+                        last = json.loads(f.readline())
+                    except ValueError:
+                        last = {}
+                    stale = str(last.get("hash", ""))[:16] != index.last_hash
+                if stale:
+                    logger.warning(f"⚠️ Rebuilding stale ledger index {index.path}")
+                    index.reset()
+                else:
+                    offset = f.tell()
+
+            index.open()
+            f.seek(offset)
+            for raw in f:
+                line_offset = offset
+                offset += len(raw)
+                if raw.strip():
+                    index.add(json.loads(raw), line_offset)
+
+    def _entries_at(self, positions) -> List[Dict[str, Any]]:
+        if self.materialize_chain:
+            return [self.chain[i] for i in positions]
+        entries = []
+        with open(self.log_file, "rb") as f:
+            for i in positions:
+                f.seek(self._index.offsets[i])
+                raw = f.readline()
+                if raw.strip():  # skip entries still queued for group commit
+                    entries.append(json.loads(raw))
+        return entries
+
     def get_events_by_type(self, event_type: str) -> List[Dict[str, Any]]:
-        return [e for e in self.chain if e.get("event_type") == event_type]
+        if self._index is not None:
+            with self._lock:
+                positions = list(self._index.by_type.get(event_type, ()))
+            return self._entries_at(positions)
+        return [e for e in self.iter_entries() if e.get("event_type") == event_type]
 
     def get_events_by_user(self, user_id: str) -> List[Dict[str, Any]]:
+        if self._index is not None:
+            with self._lock:
+                positions = list(self._index.by_user.get(str(user_id), ()))
+            return self._entries_at(positions)
         return [
-            e for e in self.chain if (e.get("data") or {}).get("user_id") == user_id
+            e
+            for e in self.iter_entries()
+            if (e.get("data") or {}).get("user_id") == user_id
         ]
 
+    def get_events_between(self, start: str, end: str) -> List[Dict[str, Any]]:
+        """Entries with start <= timestamp < end (ISO8601 UTC strings)."""
+        if self._index is not None:
+            with self._lock:
+                span = self._index.span_between(start, end)
+            candidates = self._entries_at(span) if span is not None else []
+        else:
+            candidates = self.iter_entries()
+        return [e for e in candidates if start <= e.get("timestamp", "") < end]
+
+    # ------------------------------------------------------------------
+    # Merkle batch anchoring
+    # ------------------------------------------------------------------
+    def _seal_pending_locked(self, end_offset: int) -> Optional[Dict[str, Any]]:
+        """Turn pending entry hashes into a batch record (caller holds _lock)."""
+        pending = self._merkle_pending
+        if not pending.size:
+            return None
+        batch = {
+            "batch": self._merkle_next_batch,
+            "first_index": self._merkle_pending_first,
+            "last_index": self._merkle_pending_first + pending.size - 1,
+            "start_offset": self._merkle_pending_offset,
+            "end_offset": end_offset,
+            "root": pending.root().hex(),
+            "sealed_at": utc_now_iso(),
+        }
+        self._merkle_next_batch += 1
+        self._merkle_pending = MerkleAccumulator()
+        self._merkle_pending_first = batch["last_index"] + 1
+        self._merkle_pending_offset = end_offset
+        return batch
+
+    def _persist_merkle_batch(self, batch: Dict[str, Any]) -> None:
+        with self._merkle_lock:
+            with open(self.merkle_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(batch, sort_keys=True) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        self._publish_merkle_batch(batch)
+        logger.info(
+            f"🌳 Sealed Merkle batch #{batch['batch']} "
+            f"[{batch['first_index']}..{batch['last_index']}] root={batch['root'][:16]}"
+        )
+        if self._anchor is not None:
+            try:
+                self._anchor(batch)
+            except Exception as e:
+                logger.error(f"❌ Merkle anchor failed for batch #{batch['batch']}: {e}")
+
+    def _publish_merkle_batch(self, batch: Dict[str, Any]) -> None:
+        """Make a durable batch visible to get_merkle_proof, in batch order."""
+        with self._lock:
+            self._merkle_durable[batch["batch"]] = batch
+            while len(self.merkle_batches) in self._merkle_durable:
+                ready = self._merkle_durable.pop(len(self.merkle_batches))
+                self.merkle_batches.append(ready)
+                self._merkle_firsts.append(ready["first_index"])
+
+    def seal_merkle_batch(self) -> Optional[Dict[str, Any]]:
+        """Seal the entries not yet covered by a Merkle batch (partial batch)."""
+        with self._lock:
+            batch = self._seal_pending_locked(self._tail_offset)
+            writer = self._writer
+            seq = writer.submitted if writer is not None else 0
+        if batch is None:
+            return None
+        if writer is not None:
+            writer.wait_durable(seq)
+        self._persist_merkle_batch(batch)
+        return batch
+
+    def _load_merkle_batches(self) -> None:
+        """Load sealed batches and re-collect (and seal) the unsealed tail."""
+        records = []
+        if os.path.exists(self.merkle_file):
+            with open(self.merkle_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue  # torn write
+        records.sort(key=lambda r: r["batch"])
+
+        self.merkle_batches = []
+        self._merkle_firsts = []
+        next_first, offset = 0, 0
+        for rec in records:
+            if rec["batch"] != len(self.merkle_batches):
+                continue  # duplicate
+            if rec["first_index"] != next_first or rec["last_index"] >= self.next_index:
+                break
+            self.merkle_batches.append(rec)
+            self._merkle_firsts.append(rec["first_index"])
+            next_first, offset = rec["last_index"] + 1, rec["end_offset"]
+
+        self._merkle_next_batch = len(self.merkle_batches)
+        self._merkle_durable = {}
+        self._merkle_pending = MerkleAccumulator()
+        self._merkle_pending_first = next_first
+        self._merkle_pending_offset = offset
+        sealed = []
+        with open(self.log_file, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                offset += len(raw)
+                if not raw.strip():
+                    continue
+                self._merkle_pending.append(bytes.fromhex(json.loads(raw)["hash"]))
+                if len(self._merkle_pending) >= self.merkle_batch_size:
+                    sealed.append(self._seal_pending_locked(offset))
+        for batch in sealed:
+            self._persist_merkle_batch(batch)
+
+    def _batch_entry_hashes(self, batch: Dict[str, Any]) -> List[str]:
+        first, last = batch["first_index"], batch["last_index"]
+        if self.materialize_chain:
+            return [e["hash"] for e in self.chain[first : last + 1]]
+        hashes = []
+        with open(self.log_file, "rb") as f:
+            f.seek(batch["start_offset"])
+            while len(hashes) < last - first + 1:
+                raw = f.readline()
+                if not raw:
+                    break
+                if raw.strip():
+                    hashes.append(json.loads(raw)["hash"])
+        return hashes
+
+    def get_merkle_proof(self, index: int) -> Dict[str, Any]:
+        """Inclusion proof for entry `index` against its batch's Merkle root."""
+        with self._lock:
+            pos = bisect.bisect_right(self._merkle_firsts, index) - 1
+            batch = self.merkle_batches[pos] if pos >= 0 else None
+        if batch is None or index > batch["last_index"]:
+            raise ValueError(f"Entry {index} is not in a sealed Merkle batch")
+
+        hashes = self._batch_entry_hashes(batch)
+        leaf_pos = index - batch["first_index"]
+        path = merkle_proof([bytes.fromhex(h) for h in hashes], leaf_pos)
+        return {
+            "index": index,
+            "entry_hash": hashes[leaf_pos],
+            "batch": batch["batch"],
+            "root": batch["root"],
+            "path": [["L" if left else "R", node.hex()] for left, node in path],
+        }
+
     def export_audit_report(
         self, output_file: str = "audit_report.json"
     ) -> Dict[str, Any]:
@@ -206,10 +934,10 @@ class DecisionLedger:
         report = {
             "generated_at": utc_now_iso(),
             "log_file": self.log_file,
-            "total_events": len(self.chain),
+            "total_events": self.next_index,
             "chain_valid_memory": self.verify_chain_integrity(),
             "chain_valid_file": self.verify_file_integrity(),
-            "events": self.chain,
+            "events": list(self.iter_entries()),
         }
         with open(output_file, "w", encoding="utf-8") as f:
             json.dump(report, f, indent=2)
@@ -1,21 +1,44 @@
-"""Behavioral Drift Detection - IMPROVED"""
+"""Behavioral Drift Detection - IMPROVED
+
+DriftDetector scores how well an agent's actions match the user's prompt
+with a pluggable scorer:
+
+  - KeywordScorer (default): Jaccard overlap of extracted keywords
+  - HashedNgramScorer: cosine similarity of hashed word + character n-gram
+    vectors; the least aligned action sets the score
+  - EmbeddingScorer: the same with a local CPU embedding model, e.g.
+    EmbeddingScorer(SentenceTransformer("all-MiniLM-L6-v2").encode)
+
+The vector scorers keep an LRU of vectors for repeated tool names and
+parameters, and score all actions of a request with one matrix product
+when NumPy is installed (pure Python otherwise).
+"""
 
 import json
 import re
+import threading
+import zlib
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional, Sequence
 import logging
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-class DriftDetector:
-    def __init__(self, threshold: float = 0.50):  # Lower threshold for better matches
-        self.threshold = threshold
-        self.drift_events = []
+class KeywordScorer:
+    """Jaccard similarity of prompt keywords and action keywords"""
 
-    def extract_keywords(self, text: str) -> List[str]:
+    name = "keyword"
+
+    @staticmethod
+    def extract_keywords(text: str) -> List[str]:
         """Extract keywords more aggressively"""
         action_verbs = [
             "read",
@@ -63,7 +86,7 @@ class DriftDetector:
 
         return list(set(keywords))  # Remove duplicates
 
-    def calculate_alignment_score(self, prompt: str, actions: List[Dict]) -> float:
+    def score(self, prompt: str, actions: List[Dict]) -> float:
         """Calculate alignment with improved matching"""
         prompt_keywords = set(self.extract_keywords(prompt))
 
@@ -90,13 +113,204 @@ class DriftDetector:
 
         score = intersection / union if union > 0 else 0.0
 
-        logger.info(f"📊 Alignment: {score:.2f} (threshold: {self.threshold})")
         logger.debug(f"   Prompt keywords: {prompt_keywords}")
         logger.debug(f"   Action keywords: {action_keywords}")
         logger.debug(f"   Intersection: {prompt_keywords & action_keywords}")
 
         return score
 
+
+class EmbeddingScorer:
+    """
+    Cosine similarity between the prompt vector and each action's vector.
+
+    `embed` maps a list of texts to a list of vectors (a local CPU model's
+    encode(), or HashedNgramScorer's vectorizer). An action is described by
+    its tool name, parameter names and string parameter values; vectors
+    are cached per text in an LRU of `cache_size`, so repeated tools and
+    parameters are embedded once. With `additive` the embedder is a bag of
+    features and an action's vector is the sum of its parts' vectors, so
+    the parts are cached separately.
+    """
+
+    name = "embedding"
+
+    def __init__(
+        self,
+        embed: Callable[[List[str]], Sequence],
+        cache_size: int = 4096,
+        additive: bool = False,
+    ):
+        self.embed = embed
+        self.cache_size = cache_size
+        self.additive = additive
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[str, object]" = OrderedDict()
+        self._lock = threading.Lock()  # shadow workers score concurrently
+
+    def vectors(self, texts: List[str]) -> list:
+        """Vectors for texts, embedding only the ones not cached (in one call)"""
+        found, missing = {}, []
+        with self._lock:
+            for text in texts:
+                vector = self._cache.get(text)
+                if vector is None:
+                    missing.append(text)
+                else:
+                    self._cache.move_to_end(text)
+                    found[text] = vector
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            missing = list(dict.fromkeys(missing))
+            embedded = [_as_vector(vector) for vector in self.embed(missing)]
+            with self._lock:
+                for text, vector in zip(missing, embedded):
+                    found[text] = self._cache[text] = vector
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return [found[text] for text in texts]
+
+    @staticmethod
+    def _action_parts(action: Dict) -> List[str]:
+        parts = [action.get("tool_name", "").replace("_", " ")]
+        for key, val in action.get("parameters", {}).items():
+            parts.append(key)
+            if isinstance(val, str):
+                parts.append(val)
+        return [part for part in parts if part]
+
+    def action_scores(self, prompt: str, actions: List[Dict]) -> List[float]:
+        """Alignment of each action with the prompt, in action order"""
+        if not actions:
+            return []
+        parts = [self._action_parts(action) for action in actions]
+        if self.additive:
+            unique = list(dict.fromkeys(part for ps in parts for part in ps))
+            vectors = dict(zip(unique, self.vectors(unique)))
+            action_vectors = [_sum_vectors([vectors[p] for p in ps]) for ps in parts]
+        else:
+            action_vectors = self.vectors([" ".join(ps) for ps in parts])
+        return _cosines(self.vectors([prompt])[0], action_vectors)
+
+    def score(self, prompt: str, actions: List[Dict]) -> float:
+        """The least aligned action sets the score"""
+        scores = self.action_scores(prompt, actions)
+        return min(scores) if scores else 0.0
+
+
+class HashedNgramScorer(EmbeddingScorer):
+    """
+    EmbeddingScorer over a hashed bag of words and character n-grams: no
+    model to load, and "file_system_read" / "read the file" or "report" /
+    "reports" still overlap. Features are hashed into `dim` signed buckets
+    with CRC32, which is stable across processes (unlike hash()).
+    """
+
+    name = "ngram"
+
+    def __init__(self, dim: int = 4096, ngram: int = 3, cache_size: int = 4096):
+        super().__init__(self.embed_texts, cache_size=cache_size, additive=True)
+        self.dim = dim
+        self.ngram = ngram
+
+    def features(self, text: str) -> List[str]:
+        features = []
+        for word in re.findall(r"[a-z0-9]+", text.lower()):
+            features.append(word)
+            padded = f"<{word}>"
+            features.extend(
+                padded[i : i + self.ngram] for i in range(len(padded) - self.ngram + 1)
+            )
+        return features
+
+    def embed_texts(self, texts: List[str]) -> list:
+        vectors = []
+        for text in texts:
+            buckets: Dict[int, float] = {}
+            for feature in self.features(text):
+                h = zlib.crc32(feature.encode())
+                index = h % self.dim
+                sign = 1.0 if h & 0x80000000 else -1.0
+                buckets[index] = buckets.get(index, 0.0) + sign
+            vectors.append(buckets)
+        return vectors
+
+
+def _as_vector(vector):
+    """
+    Sparse {index: value} dicts stay sparse: a hashed n-gram vector has a
+    few dozen non-zero buckets out of thousands, and dense arrays of it are
+    slower to sum and score. Dense model embeddings become NumPy arrays, or
+    sparse dicts without NumPy.
+    """
+    if isinstance(vector, dict):
+        return vector
+    if np is not None:
+        return np.asarray(vector, dtype=np.float32)
+    return {i: float(v) for i, v in enumerate(vector) if v}
+
+
+def _sum_vectors(vectors: list):
+    if vectors and not isinstance(vectors[0], dict):
+        return np.sum(vectors, axis=0)
+    total: Dict[int, float] = {}
+    for vector in vectors:
+        for index, value in vector.items():
+            total[index] = total.get(index, 0.0) + value
+    return total
+
+
+def _cosines(query, vectors: list) -> List[float]:
+    """Cosine similarity of query with each vector (0.0 for empty vectors)"""
+    if not isinstance(query, dict):
+        # an action with no text parts sums to an empty {}
+        vectors = [np.zeros_like(query) if isinstance(v, dict) else v for v in vectors]
+        matrix = np.vstack(vectors)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        dots = matrix @ query
+        scores = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+        return [float(score) for score in scores]
+
+    def norm(vector):
+        return sum(value * value for value in vector.values()) ** 0.5
+
+    query_norm = norm(query)
+    scores = []
+    for vector in vectors:
+        denominator = query_norm * norm(vector)
+        if not denominator:
+            scores.append(0.0)
+            continue
+        small, large = sorted((query, vector), key=len)
+        dot = sum(value * large.get(index, 0.0) for index, value in small.items())
+        scores.append(dot / denominator)
+    return scores
+
+
+class DriftDetector:
+    def __init__(
+        self,
+        threshold: float = 0.50,  # Lower threshold for better matches
+        scorer: Optional[object] = None,
+    ):
+        self.threshold = threshold
+        self.scorer = scorer or KeywordScorer()
+        self.drift_events = []
+
+    def extract_keywords(self, text: str) -> List[str]:
+        return KeywordScorer.extract_keywords(text)
+
+    def calculate_alignment_score(self, prompt: str, actions: List[Dict]) -> float:
+        """Calculate alignment with the configured scorer"""
+        score = self.scorer.score(prompt, actions)
+
+        logger.info(f"📊 Alignment: {score:.2f} (threshold: {self.threshold})")
+
+        return score
+
     def detect_drift(
         self, prompt: str, actions: List[Dict], enforce: bool = True
     ) -> Dict:
@@ -104,6 +318,7 @@ class DriftDetector:
             "drift_detected": False,
             "alignment_score": 0.0,
             "threshold": self.threshold,
+            "scorer": self.scorer.name,
             "should_block": False,
             "reason": "",
             "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -1,10 +1,52 @@
+import os
+import threading
 import time
 import json
 import hashlib
-from shadow_mode import shadow_evaluate
+from shadow_mode import get_shadow_comparator, shadow_evaluate
+from shadow_runner import ShadowRunner
 
+AUDIT_LOG = "audit.log"
+SHADOW_LOG = os.getenv("SHADOW_LOG", "shadow_divergence.log")
 
-def execute_and_log(intent: dict):
+# "inline": shadow decision is part of the audit record (default).
+# "async": the audit record is written without it and the shadow decision
+# goes to SHADOW_LOG from a background worker, off the request path.
+SHADOW_EXECUTION = os.getenv("SHADOW_EXECUTION", "inline")
+
+_shadow_runner = None
+_shadow_runner_lock = threading.Lock()
+_shadow_log_lock = threading.Lock()
+
+
+def get_shadow_runner() -> ShadowRunner:
+    global _shadow_runner
+    if _shadow_runner is None:
+        with _shadow_runner_lock:
+            if _shadow_runner is None:
+                _shadow_runner = ShadowRunner(name="execute-and-log-shadow")
+    return _shadow_runner
+
+
+def _log_shadow(intent: dict, real_allowed: bool):
+    """Runs on a shadow worker."""
+    shadow = shadow_evaluate(intent)
+    record = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "intent_hash": intent["intent_hash"],
+        "domain": intent["domain"],
+        "amount": intent.get("amount"),
+        "allowed": real_allowed,
+        "shadow_decision": shadow,
+        "shadow_diff": shadow["allowed"] != real_allowed,
+    }
+    with _shadow_log_lock:
+        with open(SHADOW_LOG, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+def execute_and_log(intent: dict, shadow_execution: str = None):
+    shadow_execution = shadow_execution or SHADOW_EXECUTION
     intent_hash = hashlib.sha256(
         json.dumps(intent, sort_keys=True).encode()
     ).hexdigest()
@@ -21,9 +63,6 @@ def execute_and_log(intent: dict):
 
     real_allowed = decision == "ALLOW"
 
-    # ---- SHADOW decision ----
-    shadow = shadow_evaluate(intent)
-
     record = {
         "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
         "domain": intent["domain"],
@@ -34,12 +73,24 @@ def execute_and_log(intent: dict):
         "decision": decision,
         "policy": policy,
         "allowed": real_allowed,
-        "shadow_decision": shadow,
-        "shadow_diff": shadow["allowed"] != real_allowed,
-        "intent_hash": intent_hash,
     }
 
-    with open("audit.log", "a") as f:
+    # ---- SHADOW decision ----
+    if shadow_execution == "async":
+        # Snapshot the intent: the caller may mutate it after we return
+        get_shadow_runner().submit(_log_shadow, dict(intent), real_allowed)
+        record["shadow_execution"] = "async"
+    else:
+        shadow = shadow_evaluate(intent)
+        record["shadow_decision"] = shadow
+        record["shadow_diff"] = shadow["allowed"] != real_allowed
+
+    # Candidate versions (SHADOW_VERSIONS), batched on a background worker
+    get_shadow_comparator().submit(dict(intent), real_allowed)
+
+    record["intent_hash"] = intent_hash
+
+    with open(AUDIT_LOG, "a") as f:
         f.write(json.dumps(record) + "\n")
 
     return record
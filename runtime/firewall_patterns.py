@@ -0,0 +1,480 @@
+"""
+Regex analysis shared by the AIFirewall copies (ai_firewall_core.py and
+ai-firewall-demo/ai_firewall_core.py): detector compilation with literal
+gates, single-pass PII redaction, and the split-point analysis behind
+streaming output filtering.
+"""
+
+import logging
+import re
+from typing import Any, Dict, List, Tuple
+
+# re's parser is internal; without it (or if its output changes shape) the
+# streaming split analysis is skipped and OutputStream holds text until close()
+try:
+    from re import _parser as _sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    try:
+        import sre_parse as _sre_parse
+    except ImportError:
+        _sre_parse = None
+
+logger = logging.getLogger(__name__)
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+# re.IGNORECASE also lets these match i / s; lower() leaves them alone
+CASE_FOLD = str.maketrans({"\u0131": "i", "\u017f": "s"})
+
+
+def required_literal(pattern: str) -> str:
+    """Longest literal run that every match of pattern contains ("" if none)."""
+    runs, run = [], []
+    depth, i = 0, 0
+    while i < len(pattern):
+        c = pattern[i]
+        literal = None
+        if c == "\\" and i + 1 < len(pattern):
+            if not pattern[i + 1].isalnum():  # \s, \d, \b ... are not literals
+                literal = pattern[i + 1]
+            i += 2
+        elif c == "[":
+            i = pattern.index("]", i + 2) + 1
+        elif c == "|" and depth == 0:
+            return ""
+        elif c in "?*{":
+            if run:
+                run.pop()  # optional / repeatable: not required
+            i = pattern.index("}", i) + 1 if c == "{" else i + 1
+        else:
+            depth += (c == "(") - (c == ")")
+            if c not in "()+.^$":
+                literal = c
+            i += 1
+        if literal is not None and depth == 0:
+            run.append(literal)
+        else:
+            runs.append("".join(run))
+            run = []
+    runs.append("".join(run))
+    return max(runs, key=len)
+
+
+def compile_detectors(*pattern_sets: Tuple[List[str], str]) -> tuple:
+    """
+    (gate, regex, pattern, label) per pattern, in reporting order.
+
+    CPython's re has no multi-literal prefilter, so one big alternation
+    scans slower than the patterns one by one. Instead each pattern is
+    compiled once, lower-cased and case-sensitive, which keeps re's fast
+    literal-prefix search (IGNORECASE disables it), and is only run when
+    its required literal `gate` occurs in the prompt.
+    """
+    detectors = []
+    for patterns, label in pattern_sets:
+        for pattern in patterns:
+            if pattern.isascii() and not re.search(r"\\[A-Z]", pattern):
+                regex, gate = re.compile(pattern.lower()), required_literal(pattern).lower()
+            else:
+                regex, gate = re.compile(pattern, re.IGNORECASE), ""
+            detectors.append((gate, regex, pattern, label))
+    return tuple(detectors)
+
+
+_CATEGORIES = {
+    "CATEGORY_DIGIT": re.compile(r"\d"),
+    "CATEGORY_NOT_DIGIT": re.compile(r"\D"),
+    "CATEGORY_SPACE": re.compile(r"\s"),
+    "CATEGORY_NOT_SPACE": re.compile(r"\S"),
+    "CATEGORY_WORD": re.compile(r"\w"),
+    "CATEGORY_NOT_WORD": re.compile(r"\W"),
+}
+
+
+def _atom_matches(atom: tuple, ch: str) -> bool:
+    op, av = atom
+    if op == "LITERAL":
+        return ord(ch) == av
+    if op == "NOT_LITERAL":
+        return ord(ch) != av
+    if op == "CATEGORY":
+        category = _CATEGORIES.get(str(av))
+        return category is None or bool(category.match(ch))
+    if op == "IN":
+        negate, hit = False, False
+        for item_op, item_av in av:
+            name = str(item_op)
+            if name == "NEGATE":
+                negate = True
+            elif name == "LITERAL":
+                hit = hit or ord(ch) == item_av
+            elif name == "RANGE":
+                hit = hit or item_av[0] <= ord(ch) <= item_av[1]
+            elif name == "CATEGORY":
+                hit = hit or _atom_matches(("CATEGORY", item_av), ch)
+            else:
+                return True
+        return hit != negate
+    return True  # ANY
+
+
+class _CharSet:
+    """Characters accepted by any of a list of parsed regex atoms (memoized)."""
+
+    def __init__(self, atoms: List[tuple]):
+        self.atoms = atoms
+        self._memo: Dict[str, bool] = {}
+
+    def __contains__(self, ch: str) -> bool:
+        hit = self._memo.get(ch)
+        if hit is None:
+            hit = self._memo[ch] = any(_atom_matches(atom, ch) for atom in self.atoms)
+        return hit
+
+
+def _char_sets_seq(items) -> tuple:
+    alphabet, first, last = [], [], []
+    parts = [_char_sets_item(op, av) for op, av in items]
+    for part in parts:
+        alphabet += part[0]
+    for part in parts:
+        first += part[1]
+        if not part[3]:
+            break
+    for part in reversed(parts):
+        last += part[2]
+        if not part[3]:
+            break
+    lengths = [part[4] for part in parts]
+    longest = None if None in lengths else sum(lengths)
+    return alphabet, first, last, all(part[3] for part in parts), longest
+
+
+def _char_sets_item(op, av) -> tuple:
+    name = str(op)
+    if name in ("LITERAL", "NOT_LITERAL", "IN", "ANY", "CATEGORY"):
+        atom = [(name, av)]
+        return atom, atom, atom, False, 1
+    if name == "SUBPATTERN":
+        if av[1] & re.IGNORECASE:
+            raise ValueError("case-insensitive group")
+        return _char_sets_seq(av[3])
+    if name == "ATOMIC_GROUP":
+        return _char_sets_seq(av)
+    if name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT"):
+        alphabet, first, last, nullable, longest = _char_sets_seq(av[2])
+        if longest and av[1] == _sre_parse.MAXREPEAT:
+            longest = None
+        elif longest is not None:
+            longest *= av[1]
+        return alphabet, first, last, nullable or av[0] == 0, longest
+    if name == "BRANCH":
+        branches = [_char_sets_seq(branch) for branch in av[1]]
+        lengths = [branch[4] for branch in branches]
+        return (
+            [atom for branch in branches for atom in branch[0]],
+            [atom for branch in branches for atom in branch[1]],
+            [atom for branch in branches for atom in branch[2]],
+            any(branch[3] for branch in branches),
+            None if None in lengths else max(lengths),
+        )
+    if name == "AT" and str(av) in ("AT_BOUNDARY", "AT_NON_BOUNDARY"):
+        return [], [], [], True, 0
+    raise ValueError(f"unsupported regex construct {name}")
+
+
+def _char_sets(pattern: str):
+    """
+    (alphabet, first, last, longest) for the matches of pattern: the
+    characters a match can contain, start with and end with, and the
+    longest match (None if unbounded). None unless the pattern is built
+    from characters, classes, groups, repeats, branches and \\b / \\B
+    only, and never matches the empty string.
+    """
+    if _sre_parse is None or re.compile(pattern).flags & re.IGNORECASE:
+        return None
+    try:
+        alphabet, first, last, nullable, longest = _char_sets_seq(_sre_parse.parse(pattern))
+    except (ValueError, TypeError, AttributeError, IndexError):
+        return None  # unsupported construct, or a parser we do not know
+    if nullable:
+        return None
+    return _CharSet(alphabet), first, last, longest
+
+
+def _without_boundaries(pattern: str) -> str:
+    """pattern with its \\b / \\B assertions removed (it then matches a superset)"""
+    out, i, in_class = [], 0, False
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\" and i + 1 < len(pattern):
+            if in_class or pattern[i + 1] not in "bB":
+                out.append(pattern[i : i + 2])
+            i += 2
+            continue
+        if c == "[" and not in_class:
+            end = i + 1 + (pattern[i + 1 : i + 2] == "^")
+            end += pattern[end : end + 1] == "]"  # a leading ] is a member
+            out.append(pattern[i:end])
+            in_class, i = True, end
+            continue
+        in_class = in_class and c != "]"
+        out.append(c)
+        i += 1
+    return "".join(out)
+
+
+class PIIRedactor:
+    """
+    Single-pass redaction for an ordered {pii_type: pattern} table.
+
+    All patterns are compiled into one alternation (in table order, so the
+    earlier type wins at a position), the text is scanned once and the
+    output is built once. Patterns whose required literal ("@" for email)
+    is not in the text are left out of the scan.
+
+    The result is the same as running re.findall and re.sub for each type
+    in table order. That only differs from a single scan when matches
+    interact: another type also matches inside a span (sequential sub
+    replaces the earlier type first and counts the later one anyway), or
+    two spans touch (a replacement changes the word boundary of its
+    neighbour). Those texts are redacted the sequential way.
+
+    split_point() tells a streaming caller where text can be cut so that
+    redacting the pieces separately gives the same result (OutputStream).
+    """
+
+    def __init__(self, patterns: Dict[str, str]):
+        self.types = list(patterns)
+        self.sources = list(patterns.values())
+        self.labels = [f"[REDACTED_{pii_type.upper()}]" for pii_type in self.types]
+        self._patterns = [re.compile(source) for source in self.sources]
+        self._gates = [
+            "" if pattern.flags & re.IGNORECASE else required_literal(pattern.pattern)
+            for pattern in self._patterns
+        ]
+        self._others = [
+            re.compile("|".join(f"(?:{other})" for j, other in enumerate(self.sources) if j != i))
+            if len(self.sources) > 1
+            else None
+            for i in range(len(self.sources))
+        ]
+        self._scanners: Dict[tuple, tuple] = {}
+
+        # Character sets for split_point; None if a pattern is too complex
+        # to reason about, and then text is only redacted once it is complete
+        sets = [_char_sets(source) for source in self.sources]
+        self._alphabets = None
+        self._splits: Dict[str, Any] = {}
+        self._bounded: Dict[int, tuple] = {}
+        self.lookahead = 0
+        if sets and all(char_sets is not None for char_sets in sets):
+            self._alphabets = [char_sets[0] for char_sets in sets]
+            self._firsts = _CharSet([atom for char_sets in sets for atom in char_sets[1]])
+            self._lasts = _CharSet([atom for char_sets in sets for atom in char_sets[2]])
+            self._label_firsts = {label[0] for label in self.labels}
+            self._label_lasts = {label[-1] for label in self.labels}
+            # Patterns with a longest match and no label character in their
+            # alphabet: a cut they reject by alphabet is checked on the text
+            label_chars = set("".join(self.labels))
+            for i, (alphabet, _, _, longest) in enumerate(sets):
+                if longest and not any(ch in alphabet for ch in label_chars):
+                    # With endpos = cut + longest - 1, a match ends past the
+                    # cut iff fewer than longest - 1 characters follow it
+                    source = _without_boundaries(self.sources[i])
+                    crossing = re.compile(f"(?:{source})(?![\\s\\S]{{{longest - 1}}})")
+                    self._bounded[i] = (longest, crossing)
+            self.lookahead = max((longest for longest, _ in self._bounded.values()), default=0)
+
+    def _scanner(self, active: tuple) -> tuple:
+        """(alternation of the active patterns, group number -> type index)"""
+        scanner = self._scanners.get(active)
+        if scanner is None:
+            sources = [self.sources[i] for i in active]
+            prefix = ""
+            if all(source.startswith(r"\b") for source in sources):
+                # One boundary check per position instead of one per branch
+                prefix, sources = r"\b", [source[2:] for source in sources]
+            regex = re.compile(
+                prefix
+                + "(?:"
+                + "|".join(f"(?P<_{i}>{source})" for i, source in zip(active, sources))
+                + ")"
+            )
+            groups = {regex.groupindex[f"_{i}"]: i for i in active}
+            scanner = self._scanners[active] = (regex, groups)
+        return scanner
+
+    def redact(self, text: str) -> Tuple[str, Dict[str, int]]:
+        """Returns (redacted_text, {pii_type: matches}) in table order"""
+        active = tuple(i for i, gate in enumerate(self._gates) if gate in text)
+        if not active:
+            return text, {}
+        regex, groups = self._scanner(active)
+        spans = [(m.start(), m.end(), groups[m.lastindex]) for m in regex.finditer(text)]
+        if not spans:
+            return text, {}
+        if not self._independent(text, spans):
+            return self.redact_sequential(text)
+
+        parts, counts, pos = [], [0] * len(self.types), 0
+        for start, end, i in spans:
+            parts.append(text[pos:start])
+            parts.append(self.labels[i])
+            counts[i] += 1
+            pos = end
+        parts.append(text[pos:])
+        return "".join(parts), {self.types[i]: n for i, n in enumerate(counts) if n}
+
+    def _independent(self, text: str, spans: List[Tuple[int, int, int]]) -> bool:
+        prev_end = -1
+        for start, end, i in spans:
+            if start == prev_end:
+                return False
+            others = self._others[i]
+            if others is not None:
+                for pos in range(start, end):
+                    if others.match(text, pos):
+                        return False
+            prev_end = end
+        return True
+
+    def redact_sequential(self, text: str) -> Tuple[str, Dict[str, int]]:
+        """One findall + sub per type, in table order (the reference result)"""
+        redacted = text
+        counts = {}
+        for pii_type, pattern, label in zip(self.types, self._patterns, self.labels):
+            matches = pattern.findall(text)
+            if matches:
+                counts[pii_type] = len(matches)
+                redacted = pattern.sub(label, redacted)
+        return redacted, counts
+
+    def can_split(self, before: str, after: str) -> bool:
+        """
+        True if text cut between the characters before and after redacts
+        the same in two pieces as in one, whatever surrounds them:
+
+          - no match can contain both characters, also when a neighbouring
+            match has already been replaced by its label
+          - if a match can end at the cut, after is not a word character,
+            and if one can start there, before is not: otherwise the \\b
+            at the cut would change when the pieces are redacted apart
+        """
+        return self._blockers(before, after) == ()
+
+    def _blockers(self, before: str, after: str):
+        """
+        Patterns that could contain both characters: () if none, a tuple
+        of bounded pattern indexes, or None if the cut is never safe
+        """
+        if self._alphabets is None:
+            return None
+        pair = before + after
+        if pair not in self._splits:
+            if len(self._splits) > 65536:
+                self._splits.clear()
+            self._splits[pair] = self._pair_blockers(before, after)
+        return self._splits[pair]
+
+    def _pair_blockers(self, before: str, after: str):
+        can_end, can_start = before in self._lasts, after in self._firsts
+        if (can_end and _is_word(after)) or (can_start and _is_word(before)):
+            return None
+        befores = {before} | self._label_lasts if can_end else (before,)
+        afters = {after} | self._label_firsts if can_start else (after,)
+        blockers = []
+        for i, alphabet in enumerate(self._alphabets):
+            if any(b in alphabet for b in befores) and any(a in alphabet for a in afters):
+                if i not in self._bounded:
+                    return None
+                blockers.append(i)
+        return tuple(blockers)
+
+    def _crosses(self, i: int, text: str, pos: int) -> bool:
+        """
+        True if a match of bounded pattern i, in any context, could
+        contain text[pos - 1] and text[pos], or if text does not reach
+        far enough past pos to tell yet
+        """
+        longest, crossing = self._bounded[i]
+        end = pos + longest - 1
+        if end > len(text):
+            return True
+        match = crossing.search(text, max(pos - longest + 1, 0), end)
+        return match is not None and match.start() < pos
+
+    def split_point(self, text: str, start: int = 1) -> int:
+        """
+        Last cut position >= start that is safe, or 0. A cut can_split
+        rejects is still safe when every pattern blocking it is bounded and
+        the text around the cut holds no match of one across it; that is
+        only known once lookahead characters past the cut have arrived.
+        """
+        for pos in range(len(text) - 1, max(start, 1) - 1, -1):
+            blockers = self._blockers(text[pos - 1], text[pos])
+            if blockers is None:
+                continue
+            if not any(self._crosses(i, text, pos) for i in blockers):
+                return pos
+        return 0
+
+
+class OutputStream:
+    """
+    Incremental AIFirewall.filter_output for a streamed model response.
+
+    feed() takes the next chunk and returns the filtered text that is safe
+    to emit now; close() returns the rest. Only the tail that a PII match
+    could still run through is held back: usually the last word, and for
+    digits and separators at most the longest phone or card number.
+    The emitted pieces join to exactly the filtered_response that
+    filter_output would give for the whole response, and pii_counts
+    are the per-type matches redact_pii_counts finds in it.
+    """
+
+    def __init__(self, firewall):
+        self.firewall = firewall
+        protection = firewall.config["output_protection"]
+        self.redact = protection["enabled"] and protection["redact_pii"]
+        self._counts: Dict[str, int] = {}
+        self._buffer = ""
+
+    @property
+    def pii_counts(self) -> Dict[str, int]:
+        types = self.firewall._REDACTOR.types
+        return {pii_type: self._counts[pii_type] for pii_type in types if pii_type in self._counts}
+
+    @property
+    def pii_found(self) -> List[str]:
+        return list(self.pii_counts)
+
+    def feed(self, chunk: str) -> str:
+        if not self.redact:
+            return chunk
+        # Cuts before the old end were already rejected, only check new ones
+        # and those that were waiting for lookahead text
+        redactor = self.firewall._REDACTOR
+        start = len(self._buffer) - redactor.lookahead
+        self._buffer += chunk
+        cut = redactor.split_point(self._buffer, start)
+        if not cut:
+            return ""
+        head, self._buffer = self._buffer[:cut], self._buffer[cut:]
+        return self._redact(head)
+
+    def close(self) -> str:
+        tail, self._buffer = self._buffer, ""
+        filtered = self._redact(tail) if tail else ""
+        if self._counts:
+            logger.info(f"🔒 PII REDACTED: {self.pii_found}")
+        return filtered
+
+    def _redact(self, text: str) -> str:
+        redacted, counts = self.firewall.redact_pii_counts(text)
+        for pii_type, n in counts.items():
+            self._counts[pii_type] = self._counts.get(pii_type, 0) + n
+        return redacted
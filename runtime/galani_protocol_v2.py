@@ -4,7 +4,11 @@ Implements deterministic AI governance with cryptographic verification
 """
 
 import asyncio
+import bisect
 import hashlib
+import os
+import random
+import threading
 import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
@@ -13,9 +17,17 @@ from enum import Enum
 from typing import Any, Dict, List, Optional, Set, Tuple
 import json
 import hmac
-from collections import defaultdict
+from collections import defaultdict, deque
 import uuid
 
+from ledgers.merkle import MerkleAccumulator, merkle_proof, verify_proof
+from sanctions_screening import LIST_UNAVAILABLE, SanctionsIndex
+
+try:
+    from monitoring.metrics.metrics import policy_rule_duration, policy_stage_duration
+except ImportError:  # prometheus_client not installed
+    policy_rule_duration = policy_stage_duration = None
+
 
 class RiskLevel(Enum):
     """Risk classification for AI actions"""
@@ -137,6 +149,15 @@ class AuditRecord:
         return hashlib.sha256(data.encode()).hexdigest()
 
 
+def verify_record_inclusion(record: AuditRecord, proof: Dict[str, Any]) -> bool:
+    """Check a ConscienceEngine.get_inclusion_proof() result in O(log n)"""
+    record_hash = record.compute_record_hash()
+    if record_hash != record.merkle_hash or record.record_id != proof.get("record_id"):
+        return False
+    path = [(side == "L", bytes.fromhex(node)) for side, node in proof["path"]]
+    return verify_proof(bytes.fromhex(record_hash), path, bytes.fromhex(proof["root"]))
+
+
 class PolicyRule(ABC):
     """Abstract base for governance policies"""
 
@@ -149,39 +170,59 @@ class PolicyRule(ABC):
 
     @abstractmethod
     def get_priority(self) -> int:
-        """Higher priority rules execute first"""
+        """Higher priority rules win when several rules deny"""
         pass
 
+    def get_cost(self) -> float:
+        """
+        Relative evaluation cost; cheaper rules are scheduled first.
+        Rules at or below the engine's inline_cost are awaited inline and
+        must not block on I/O; the default assumes they might.
+        """
+        return 1.0
+
 
 class SanctionCheckPolicy(PolicyRule):
     """Blocks sanctioned entities (OFAC, EU, etc.)"""
 
-    def __init__(self):
-        # Simulated sanctions list
+    # Screened intent parameters and how they are named in the reason
+    FIELDS = {"entity_id": "Entity", "counterparty": "Counterparty", "recipient": "Recipient"}
+
+    def __init__(self, screener=None):
+        # Simulated sanctions list, used when no screener is given
         self.sanctioned_entities = {
             "IRAN_BANK_001",
             "RUSSIA_ENTITY_042",
             "NORTH_KOREA_COMPANY",
         }
+        # A SanctionsScreener (reloads its list file) or a fixed SanctionsIndex
+        self.screener = screener or SanctionsIndex.from_names(self.sanctioned_entities)
 
     async def evaluate(
         self, intent: ActionIntent, context: Dict[str, Any]
     ) -> Tuple[bool, str]:
         # Check for sanctioned entities in transaction
-        entity = intent.parameters.get("entity_id", "")
-        counterparty = intent.parameters.get("counterparty", "")
-
-        if entity in self.sanctioned_entities:
-            return False, f"Entity {entity} is on sanctions list"
-
-        if counterparty in self.sanctioned_entities:
-            return False, f"Counterparty {counterparty} is on sanctions list"
+        params = intent.parameters
+        hits = self.screener.screen(
+            {field: params.get(field) for field in self.FIELDS}
+        )
+        if hits:
+            hit = hits[0]  # hits come back in FIELDS order
+            label = self.FIELDS[hit.field]
+            if hit.entry is LIST_UNAVAILABLE:
+                return False, f"{label} {hit.value} not screened: sanctions list unavailable"
+            if hit.exact:
+                return False, f"{label} {hit.value} is on sanctions list"
+            return False, f"{label} {hit.value} matches sanctioned name {hit.entry.name}"
 
         return True, "Sanctions check passed"
 
     def get_priority(self) -> int:
         return 1000  # Highest priority
 
+    def get_cost(self) -> float:
+        return 0.0  # hash lookup plus one automaton pass per field
+
 
 class AmountLimitPolicy(PolicyRule):
     """Enforces financial transaction limits"""
@@ -202,6 +243,9 @@ class AmountLimitPolicy(PolicyRule):
     def get_priority(self) -> int:
         return 500
 
+    def get_cost(self) -> float:
+        return 0.0
+
 
 class RateLimitPolicy(PolicyRule):
     """Prevents abuse via rate limiting"""
@@ -236,6 +280,9 @@ class RateLimitPolicy(PolicyRule):
     def get_priority(self) -> int:
         return 800
 
+    def get_cost(self) -> float:
+        return 0.0  # in-memory window scan
+
 
 class RiskAnalyzer:
     """Computes multi-dimensional risk gradients"""
@@ -312,15 +359,122 @@ class RiskAnalyzer:
         )
 
 
+class PolicyProfiler:
+    """
+    Sampled per-rule and per-stage timings for ConscienceEngine.
+
+    A sampled evaluation records each rule's evaluate() time and the
+    signature / policies / risk / total stage times. They go to the
+    Prometheus histograms when prometheus_client is available, and into
+    bounded in-memory windows that slowest() summarizes in-process.
+    Unsampled evaluations pay one random() call.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = float(os.getenv("POLICY_PROFILE_SAMPLE_RATE", "0.01")),
+        window_s: float = 300.0,
+        max_samples: int = 2048,
+    ):
+        self.sample_rate = sample_rate
+        self.window_s = window_s
+        self.max_samples = max_samples
+        self._samples: Dict[Tuple[str, str], deque] = {}
+        self._lock = threading.Lock()
+
+    def sample(self) -> bool:
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def record(self, kind: str, name: str, seconds: float):
+        """kind is "rule" (name = rule class) or "stage" (name = stage)"""
+        with self._lock:
+            samples = self._samples.get((kind, name))
+            if samples is None:
+                samples = self._samples[(kind, name)] = deque(maxlen=self.max_samples)
+            samples.append((time.monotonic(), seconds))
+        histogram = policy_rule_duration if kind == "rule" else policy_stage_duration
+        if histogram is not None:
+            histogram.labels(name).observe(seconds)
+
+    def lap(self, stage: str, since: float) -> float:
+        """Record a stage that started at perf_counter() value since"""
+        now = time.perf_counter()
+        self.record("stage", stage, now - since)
+        return now
+
+    def slowest(
+        self, limit: int = 10, window_s: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Rules and stages seen within the window, by p99 latency, slowest first"""
+        cutoff = time.monotonic() - (window_s or self.window_s)
+        with self._lock:
+            windows = {
+                key: sorted(d for ts, d in samples if ts >= cutoff)
+                for key, samples in self._samples.items()
+            }
+        rows = [
+            {
+                "kind": kind,
+                "name": name,
+                "count": len(durations),
+                "p50_ms": round(durations[len(durations) // 2] * 1000, 4),
+                "p99_ms": round(durations[int(0.99 * (len(durations) - 1))] * 1000, 4),
+                "max_ms": round(durations[-1] * 1000, 4),
+            }
+            for (kind, name), durations in windows.items()
+            if durations
+        ]
+        rows.sort(key=lambda row: row["p99_ms"], reverse=True)
+        return rows[:limit]
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+
+# Shared by engines that are not given their own profiler
+POLICY_PROFILER = PolicyProfiler()
+
+
 class ConscienceEngine:
-    """The core decision engine - deterministic AI governance"""
+    """
+    The core decision engine - deterministic AI governance
+
+    Policies are evaluated as one pipeline. Rules with get_cost() at or below
+    inline_cost are awaited inline, cheapest first; the rest run concurrently.
+    The reported reason is always the one sequential priority order would
+    give: a deny cancels every lower-priority rule still running, and waits
+    only for higher-priority rules that could still override it.
+
+    A sampled share of evaluations is timed per rule and per stage by
+    `profiler` (the shared POLICY_PROFILER unless one is passed).
+    """
 
-    def __init__(self, domain: str, secret_key: str):
+    def __init__(
+        self,
+        domain: str,
+        secret_key: str,
+        anchor_batch_size: int = 0,
+        inline_cost: float = 0.0,
+        profiler: Optional[PolicyProfiler] = None,
+    ):
         self.domain = domain
         self.secret_key = secret_key
         self.policies: List[PolicyRule] = []
+        self.inline_cost = inline_cost
+        self.profiler = profiler or POLICY_PROFILER
+        # (rank, policy) split by cost; rank is the position in priority order
+        self._inline_plan: List[Tuple[int, PolicyRule]] = []
+        self._concurrent_plan: List[Tuple[int, PolicyRule]] = []
         self.risk_analyzer = RiskAnalyzer(domain)
         self.audit_chain: List[AuditRecord] = []
+        # Merkle batches over audit_chain: one root per batch to anchor externally
+        self.anchor_batch_size = anchor_batch_size
+        self.merkle_batches: List[Dict[str, Any]] = []
+        self._batch_firsts: List[int] = []
+        self._record_positions: Dict[str, int] = {}
+        self._unanchored = MerkleAccumulator()
+        self._unanchored_from = 0
         self.execution_stats = {
             "total_requests": 0,
             "approved": 0,
@@ -334,6 +488,69 @@ class ConscienceEngine:
         # Sort by priority
         self.policies.sort(key=lambda p: p.get_priority(), reverse=True)
 
+        by_cost = sorted(enumerate(self.policies), key=lambda rp: rp[1].get_cost())
+        self._inline_plan = [rp for rp in by_cost if rp[1].get_cost() <= self.inline_cost]
+        self._concurrent_plan = [rp for rp in by_cost if rp[1].get_cost() > self.inline_cost]
+
+    @staticmethod
+    async def _timed_evaluate(policy, intent, context, profiler):
+        t0 = time.perf_counter()
+        result = await policy.evaluate(intent, context)
+        profiler.record("rule", type(policy).__name__, time.perf_counter() - t0)
+        return result
+
+    async def _run_policies(
+        self,
+        intent: ActionIntent,
+        context: Dict[str, Any],
+        profiler: Optional[PolicyProfiler] = None,
+    ) -> Optional[str]:
+        """Reason of the highest-priority denying rule, or None if all allow"""
+
+        def evaluate(policy):
+            if profiler is None:
+                return policy.evaluate(intent, context)
+            return self._timed_evaluate(policy, intent, context, profiler)
+
+        denied: Optional[Tuple[int, str]] = None
+
+        for rank, policy in self._inline_plan:
+            if denied is not None and rank > denied[0]:
+                continue  # cannot change the reported reason
+            is_allowed, reason = await evaluate(policy)
+            if not is_allowed:
+                denied = (rank, reason)
+
+        plan = [
+            (rank, policy)
+            for rank, policy in self._concurrent_plan
+            if denied is None or rank < denied[0]
+        ]
+        if not plan:
+            return denied and denied[1]
+
+        # Tasks are created cheapest first, so they also start in that order
+        ranks = {asyncio.ensure_future(evaluate(policy)): rank for rank, policy in plan}
+        pending = set(ranks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    is_allowed, reason = task.result()
+                    if not is_allowed and (denied is None or ranks[task] < denied[0]):
+                        denied = (ranks[task], reason)
+                if denied is not None:
+                    outranked = {t for t in pending if ranks[t] > denied[0]}
+                    for task in outranked:
+                        task.cancel()
+                    pending -= outranked
+        finally:
+            for task in pending:
+                task.cancel()
+        return denied and denied[1]
+
     async def evaluate_intent(
         self, intent: ActionIntent, context: Dict[str, Any]
     ) -> Tuple[bool, AuditRecord]:
@@ -341,10 +558,27 @@ class ConscienceEngine:
         Core governance logic - evaluates intent against all policies
         Returns (is_approved, audit_record)
         """
+        if not self.profiler.sample():
+            return await self._evaluate(intent, context, None)
+        t0 = time.perf_counter()
+        result = await self._evaluate(intent, context, self.profiler)
+        self.profiler.lap("total", t0)
+        return result
+
+    async def _evaluate(
+        self,
+        intent: ActionIntent,
+        context: Dict[str, Any],
+        profiler: Optional[PolicyProfiler],
+    ) -> Tuple[bool, AuditRecord]:
         start_time = time.time()
+        lap = time.perf_counter()
 
         # Verify cryptographic signature
-        if not intent.verify_signature(self.secret_key):
+        signature_ok = intent.verify_signature(self.secret_key)
+        if profiler:
+            lap = profiler.lap("signature", lap)
+        if not signature_ok:
             record = self._create_audit_record(
                 intent,
                 0.0,
@@ -354,24 +588,27 @@ class ConscienceEngine:
             )
             return False, record
 
-        # Run all policies in priority order
-        for policy in self.policies:
-            is_allowed, reason = await policy.evaluate(intent, context)
-            if not is_allowed:
-                record = self._create_audit_record(
-                    intent,
-                    1.0,
-                    RiskLevel.CRITICAL,
-                    ActionStatus.REJECTED,
-                    f"Policy violation: {reason}",
-                )
-                self._update_stats(start_time, False)
-                return False, record
+        # Run all policies; the reason follows priority order
+        reason = await self._run_policies(intent, context, profiler)
+        if profiler:
+            lap = profiler.lap("policies", lap)
+        if reason is not None:
+            record = self._create_audit_record(
+                intent,
+                1.0,
+                RiskLevel.CRITICAL,
+                ActionStatus.REJECTED,
+                f"Policy violation: {reason}",
+            )
+            self._update_stats(start_time, False)
+            return False, record
 
         # Compute risk gradient
         risk_gradient = await self.risk_analyzer.analyze(intent, context)
         risk_level = risk_gradient.get_level()
         risk_score = risk_gradient.compute_total()
+        if profiler:
+            profiler.lap("risk", lap)
 
         # Decision logic based on risk level
         if risk_level in [RiskLevel.HIGH, RiskLevel.CRITICAL]:
@@ -422,9 +659,51 @@ class ConscienceEngine:
         )
 
         record.merkle_hash = record.compute_record_hash()
+        self._record_positions[record.record_id] = len(self.audit_chain)
         self.audit_chain.append(record)
+        self._unanchored.append(bytes.fromhex(record.merkle_hash))
+
+        if self.anchor_batch_size and self._unanchored.size >= self.anchor_batch_size:
+            self.seal_merkle_batch()
         return record
 
+    def seal_merkle_batch(self) -> Optional[Dict[str, Any]]:
+        """Seal audit records not yet in a batch under one Merkle root"""
+        if not self._unanchored.size:
+            return None
+        first, last = self._unanchored_from, len(self.audit_chain) - 1
+        batch = {
+            "batch": len(self.merkle_batches),
+            "first_index": first,
+            "last_index": last,
+            "root": self._unanchored.root().hex(),
+            "sealed_at": time.time(),
+        }
+        self.merkle_batches.append(batch)
+        self._batch_firsts.append(first)
+        self._unanchored = MerkleAccumulator()
+        self._unanchored_from = last + 1
+        return batch
+
+    def get_inclusion_proof(self, record_id: str) -> Dict[str, Any]:
+        """Merkle inclusion proof for a sealed audit record"""
+        index = self._record_positions.get(record_id)
+        if index is None or index >= self._unanchored_from:
+            raise ValueError(f"Record {record_id} is not in a sealed Merkle batch")
+
+        batch = self.merkle_batches[bisect.bisect_right(self._batch_firsts, index) - 1]
+        leaves = [
+            bytes.fromhex(r.merkle_hash)
+            for r in self.audit_chain[batch["first_index"] : batch["last_index"] + 1]
+        ]
+        path = merkle_proof(leaves, index - batch["first_index"])
+        return {
+            "record_id": record_id,
+            "batch": batch["batch"],
+            "root": batch["root"],
+            "path": [["L" if left else "R", node.hex()] for left, node in path],
+        }
+
     def _update_stats(self, start_time: float, approved: bool):
         """Track performance metrics"""
         latency = (time.time() - start_time) * 1000  # ms
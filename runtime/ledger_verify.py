@@ -0,0 +1,217 @@
+"""
+Parallel integrity verifier for DecisionLedger JSONL files.
+
+The file is split at line boundaries into byte-range chunks. A process pool
+recomputes every entry hash and checks the index / previous_hash links inside
+each chunk; the chunk boundaries are then stitched together in order. The
+first broken index is reported exactly as DecisionLedger does serially.
+
+Usage:
+    python ledger_verify.py ai_firewall_ledger.jsonl [--workers 8] [--chunk-mb 8]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from decision_ledger import GENESIS_HASH, compute_entry_hash
+
+logger = logging.getLogger("decision_ledger")
+
+DEFAULT_CHUNK_BYTES = 8 * 1024 * 1024
+
+
+@dataclass
+class ChunkResult:
+    count: int = 0
+    first_index: Optional[int] = None
+    first_previous_hash: Optional[str] = None
+    last_hash: Optional[str] = None
+    # (position within chunk, check, got, expected) of the first local failure
+    failure: Optional[Tuple[int, str, object, object]] = None
+
+
+@dataclass
+class VerifyResult:
+    valid: bool
+    entries: int
+    broken_index: Optional[int] = None
+    reason: Optional[str] = None
+    seconds: float = 0.0
+
+    @property
+    def entries_per_sec(self) -> float:
+        return self.entries / self.seconds if self.seconds else 0.0
+
+
+def _verify_chunk(task: Tuple[str, int, int]) -> ChunkResult:
+    """Recompute hashes and intra-chunk links for bytes [start, end)."""
+    path, start, end = task
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start).decode("utf-8")
+
+    result = ChunkResult()
+    prev = None
+    for raw in data.split("\n"):
+        if not raw.strip():
+            continue
+        pos = result.count
+        result.count += 1
+        if result.failure is not None:
+            continue  # keep counting so later chunks get the right base index
+
+        try:
+            entry = json.loads(raw)
+        except ValueError:
+            result.failure = (pos, "unparseable", None, None)
+            continue
+
+        if pos == 0:
+            result.first_index = entry.get("index")
+            result.first_previous_hash = entry.get("previous_hash")
+        else:
+            expected = None
+            if isinstance(result.first_index, int):
+                expected = result.first_index + pos
+            if entry.get("index") != expected:
+                result.failure = (pos, "index", entry.get("index"), expected)
+                continue
+            if entry.get("previous_hash") != prev:
+                result.failure = (
+                    pos, "previous_hash", entry.get("previous_hash"), prev
+                )
+                continue
+
+        stored = entry.get("hash")
+        if not stored or len(stored) != 64:
+            result.failure = (pos, "missing_hash", stored, None)
+            continue
+        if stored != compute_entry_hash(entry):
+            result.failure = (pos, "hash", stored, None)
+            continue
+        prev = stored
+
+    result.last_hash = prev
+    return result
+
+
+def split_chunks(path: str, chunk_bytes: int) -> List[Tuple[str, int, int]]:
+    """Byte ranges of roughly chunk_bytes, each ending on a newline."""
+    size = os.path.getsize(path)
+    tasks = []
+    start = 0
+    with open(path, "rb") as f:
+        while start < size:
+            end = min(size, start + chunk_bytes)
+            if end < size:
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            tasks.append((path, start, end))
+            start = end
+    return tasks
+
+
+def verify_file_parallel(
+    path: str, workers: Optional[int] = None, chunk_bytes: int = DEFAULT_CHUNK_BYTES
+) -> VerifyResult:
+    """Verify a ledger file with a process pool; workers=1 runs in-process."""
+    t0 = time.perf_counter()
+    tasks = split_chunks(path, chunk_bytes)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(tasks) <= 1:
+        results = map(_verify_chunk, tasks)
+        outcome = _stitch(results)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcome = _stitch(pool.map(_verify_chunk, tasks))
+
+    outcome.seconds = time.perf_counter() - t0
+    if outcome.valid:
+        logger.info("✅ Chain integrity verified (file)")
+    else:
+        logger.error(f"❌ {outcome.reason}")
+        logger.error("❌ File integrity check failed")
+    return outcome
+
+
+def _reason(check: str, idx: int, got=None, expected=None) -> str:
+    """Same wording as DecisionLedger._validate_entry."""
+    if check == "index":
+        return f"Invalid index: got={got} expected={expected}"
+    if check == "previous_hash":
+        return (
+            f"Invalid previous_hash at index={idx}: got={got} expected={expected}"
+        )
+    if check == "missing_hash":
+        return f"Missing/invalid stored hash at index={idx}"
+    if check == "hash":
+        return f"Hash mismatch at index={idx}"
+    return f"Unparseable entry at index={idx}"
+
+
+def _stitch(results) -> VerifyResult:
+    expected_index = 0
+    prev = GENESIS_HASH
+    for chunk in results:
+        if chunk.count == 0:
+            continue
+
+        # Boundary checks for the chunk's first entry, then its local failure
+        broken = None
+        if chunk.failure is not None and chunk.failure[:2] == (0, "unparseable"):
+            broken = (expected_index, "unparseable", None, None)
+        elif chunk.first_index != expected_index:
+            broken = (expected_index, "index", chunk.first_index, expected_index)
+        elif chunk.first_previous_hash != prev:
+            broken = (expected_index, "previous_hash", chunk.first_previous_hash, prev)
+        elif chunk.failure is not None:
+            pos, check, got, expected = chunk.failure
+            broken = (expected_index + pos, check, got, expected)
+
+        if broken is not None:
+            idx, check, got, expected = broken
+            return VerifyResult(
+                valid=False,
+                entries=expected_index,
+                broken_index=idx,
+                reason=_reason(check, idx, got, expected),
+            )
+
+        expected_index += chunk.count
+        prev = chunk.last_hash
+    return VerifyResult(valid=True, entries=expected_index)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Verify a DecisionLedger JSONL file in parallel"
+    )
+    parser.add_argument("log_file")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-mb", type=float, default=DEFAULT_CHUNK_BYTES / 2**20)
+    args = parser.parse_args(argv)
+
+    result = verify_file_parallel(
+        args.log_file, workers=args.workers, chunk_bytes=int(args.chunk_mb * 2**20)
+    )
+    if result.valid:
+        print(
+            f"✅ INTEGRITY VERIFIED: {result.entries} entries in "
+            f"{result.seconds:.2f}s ({result.entries_per_sec:,.0f} entries/s)"
+        )
+        return 0
+    print(f"❌ TAMPERING DETECTED at index={result.broken_index}: {result.reason}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
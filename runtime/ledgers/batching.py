@@ -0,0 +1,86 @@
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+AuditArgs = Tuple[Any, Any, str]  # (intent, decision, user_id)
+
+
+class SubmitCoalescer:
+    """
+    Turns individual submit_audit calls into submit_audits batches.
+
+    The first call opens a window of window_ms; every call that arrives
+    before it closes (or until max_batch is reached) rides in the same
+    batch, and each caller gets back its own result. window_ms=0 still
+    coalesces calls made in the same event-loop tick.
+    """
+
+    def __init__(
+        self,
+        submit_batch: Callable[[List[AuditArgs]], Awaitable[List[Optional[str]]]],
+        window_ms: Optional[float] = None,
+        max_batch: Optional[int] = None,
+        name: str = "Ledger",
+    ):
+        self.submit_batch = submit_batch
+        if window_ms is None:
+            window_ms = float(os.getenv("LEDGER_COALESCE_MS", "5"))
+        self.window_s = window_ms / 1000
+        self.max_batch = max_batch or int(os.getenv("LEDGER_BATCH_MAX", "100"))
+        self.name = name
+
+        self._pending: List[Tuple[AuditArgs, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight: set = set()
+
+    async def submit(self, intent, decision, user_id) -> Optional[str]:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop, self._pending, self._timer = loop, [], None
+
+        done = loop.create_future()
+        self._pending.append(((intent, decision, user_id), done))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_s, self._flush)
+        return await done
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = self._loop.create_task(self._run(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _run(self, batch):
+        try:
+            results = list(await self.submit_batch([args for args, _ in batch]))
+        except Exception as e:
+            print(f"[{self.name}] batch submit error: {e}")
+            results = [None] * len(batch)
+        for (_, done), result in zip(batch, results):
+            if not done.done():
+                done.set_result(result)
+        # A backend that returns fewer results than audits must not leave
+        # the remaining callers waiting forever; they get None like any
+        # other failed submit
+        if len(results) < len(batch):
+            print(
+                f"[{self.name}] batch submit returned {len(results)} results "
+                f"for {len(batch)} audits"
+            )
+            for _, done in batch[len(results) :]:
+                if not done.done():
+                    done.set_result(None)
+
+    async def drain(self):
+        """Submit whatever is still waiting for its window to close."""
+        if self._loop is asyncio.get_running_loop():
+            self._flush()
+            if self._inflight:
+                await asyncio.gather(*self._inflight)
@@ -2,11 +2,15 @@ import asyncio
 import json
 import os
 import hashlib
-from typing import Dict, Any, Optional
+import threading
+from typing import Dict, Any, List, Optional
 from cosmospy import Transaction
 from cosmospy.aerial.client import LedgerClient
 from cosmospy.aerial.wallet import LocalWallet
+
+from .batching import SubmitCoalescer
 from .ledger_base import LedgerBase
+from .merkle import merkle_proof, merkle_root, verify_proof
 
 
 class CosmosLedger(LedgerBase):
@@ -14,6 +18,12 @@ class CosmosLedger(LedgerBase):
     Cosmos adapter used as a PUBLIC HASH ANCHOR.
     Stores hash of audit payload on-chain (memo),
     full payload remains off-chain.
+
+    Coalesced batches anchor one Merkle root per transaction
+    (memo "uaal_batch:<root>:<n>"); each audit's id is "<tx_hash>:<i>".
+    The batch's leaf hashes are appended to COSMOS_PROOF_FILE before the
+    ids are returned, so query_chain can rebuild each audit's inclusion
+    proof and check it against the root read back from the chain.
     """
 
     def __init__(self):
@@ -26,57 +36,132 @@ class CosmosLedger(LedgerBase):
 
         self.client = LedgerClient(self.rpc)
         self.wallet = LocalWallet.from_mnemonic(self.mnemonic)
+        self.proof_file = os.getenv("COSMOS_PROOF_FILE", "./cosmos_proofs.jsonl")
+        self._proof_lock = threading.Lock()
+        self._proof_offsets = self._load_proof_offsets()  # tx hash -> file offset
+        self._coalescer = SubmitCoalescer(self.submit_audits, name="Cosmos")
 
     async def submit_audit(
         self, intent: Dict[str, Any], decision: Dict[str, Any], user_id: str
     ) -> Optional[str]:
-        try:
-            payload = json.dumps(
+        return await self._coalescer.submit(intent, decision, user_id)
+
+    def _broadcast(self, memo: str) -> str:
+        tx = (
+            Transaction()
+            .with_messages(
                 {
-                    "intent": intent,
-                    "decision": decision,
-                    "user_id": user_id,
-                    "timestamp": asyncio.get_event_loop().time(),
-                },
-                sort_keys=True,
+                    "@type": "/cosmos.bank.v1beta1.MsgSend",
+                    "from_address": self.wallet.address(),
+                    "to_address": self.wallet.address(),
+                    "amount": [{"denom": "uatom", "amount": "1"}],
+                }
             )
+            .with_memo(memo)
+            .with_gas(200000)
+            .with_fee(5000)
+        )
+        signed = self.wallet.sign_transaction(tx, self.chain_id)
+        return self.client.broadcast_tx(signed)
 
-            # Canonical hash anchor
-            payload_hash = hashlib.sha256(payload.encode()).hexdigest()
+    def _load_proof_offsets(self) -> Dict[str, int]:
+        offsets: Dict[str, int] = {}
+        if not os.path.exists(self.proof_file):
+            return offsets
+        offset = 0
+        with open(self.proof_file, "rb") as f:
+            for raw in f:
+                try:
+                    offsets[json.loads(raw)["tx"]] = offset
+                except (ValueError, KeyError):
+                    pass  # torn write
+                offset += len(raw)
+        return offsets
+
+    def _persist_leaves(self, tx_hash: str, root: str, leaves: List[str]) -> None:
+        line = json.dumps({"tx": tx_hash, "root": root, "leaves": leaves}, sort_keys=True)
+        with self._proof_lock:
+            with open(self.proof_file, "ab") as f:
+                offset = f.tell()
+                f.write(line.encode() + b"\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._proof_offsets[tx_hash] = offset
+
+    def _read_leaves(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+        offset = self._proof_offsets.get(tx_hash)
+        if offset is None:
+            return None
+        with open(self.proof_file, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())
 
-            tx = (
-                Transaction()
-                .with_messages(
+    async def submit_audits(self, batch) -> List[Optional[str]]:
+        try:
+            hashes = []
+            for intent, decision, user_id in batch:
+                payload = json.dumps(
                     {
-                        "@type": "/cosmos.bank.v1beta1.MsgSend",
-                        "from_address": self.wallet.address(),
-                        "to_address": self.wallet.address(),
-                        "amount": [{"denom": "uatom", "amount": "1"}],
-                    }
+                        "intent": intent,
+                        "decision": decision,
+                        "user_id": user_id,
+                        "timestamp": asyncio.get_event_loop().time(),
+                    },
+                    sort_keys=True,
                 )
-                .with_memo(f"uaal_audit:{payload_hash}")
-                .with_gas(200000)
-                .with_fee(5000)
-            )
+                # Canonical hash anchor
+                hashes.append(hashlib.sha256(payload.encode()).hexdigest())
 
-            signed = self.wallet.sign_transaction(tx, self.chain_id)
-            tx_hash = self.client.broadcast_tx(signed)
+            if len(hashes) == 1:
+                memo = f"uaal_audit:{hashes[0]}"
+            else:
+                root = merkle_root([bytes.fromhex(h) for h in hashes]).hex()
+                memo = f"uaal_batch:{root}:{len(hashes)}"
 
-            return tx_hash  # immutable proof
+            # The client is blocking; keep it off the event loop
+            tx_hash = await asyncio.to_thread(self._broadcast, memo)
+            if len(hashes) == 1:
+                return [tx_hash]  # immutable proof
+            # Without the leaves the ids could not prove inclusion
+            await asyncio.to_thread(self._persist_leaves, tx_hash, root, hashes)
+            return [f"{tx_hash}:{i}" for i in range(len(hashes))]
         except Exception as e:
             print(f"[Cosmos] submit error: {e}")
-            return None
+            return [None] * len(batch)
 
     async def query_chain(self, tx_hash: str) -> Dict[str, Any]:
         try:
-            tx = self.client.get_tx(tx_hash)
+            tx_hash, _, position = tx_hash.partition(":")
+            tx = await asyncio.to_thread(self.client.get_tx, tx_hash)
             memo = tx.get("tx", {}).get("body", {}).get("memo", "")
             if memo.startswith("uaal_audit:"):
                 return {"hash": memo.replace("uaal_audit:", "")}
+            if memo.startswith("uaal_batch:") and position:
+                _, root, size = memo.split(":")
+                index = int(position)
+                record = {
+                    "merkle_root": root,
+                    "batch_size": int(size),
+                    "batch_index": index,
+                }
+                stored = await asyncio.to_thread(self._read_leaves, tx_hash)
+                if stored is None or not 0 <= index < len(stored["leaves"]):
+                    return record
+                leaves = [bytes.fromhex(h) for h in stored["leaves"]]
+                path = merkle_proof(leaves, index)
+                record.update(
+                    {
+                        "hash": stored["leaves"][index],
+                        "path": [["L" if left else "R", node.hex()] for left, node in path],
+                        # checked against the on-chain root, not the local copy
+                        "verified": verify_proof(leaves[index], path, bytes.fromhex(root)),
+                    }
+                )
+                return record
             return {}
         except Exception as e:
             print(f"[Cosmos] query error: {e}")
             return {}
 
     async def close(self):
-        pass  # stateless
+        await self._coalescer.drain()
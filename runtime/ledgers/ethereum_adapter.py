@@ -1,19 +1,22 @@
 import asyncio
 import json
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+
 from web3 import AsyncWeb3
 from eth_account import Account
+
+from .batching import SubmitCoalescer
+from .http_pool import get_aiohttp_session
 from .ledger_base import LedgerBase
 
 
 class EthereumLedger(LedgerBase):
     def __init__(self):
-        self.w3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                os.getenv("ETHEREUM_RPC_URL", "http://localhost:8545")
-            )
+        self.provider = AsyncWeb3.AsyncHTTPProvider(
+            os.getenv("ETHEREUM_RPC_URL", "http://localhost:8545")
         )
+        self.w3 = AsyncWeb3(self.provider)
         self.contract_addr = os.getenv("CONTRACT_ADDR")
         self.private_key = os.getenv("PRIVATE_KEY")
         self.account = Account.from_key(self.private_key)
@@ -22,39 +25,80 @@ class EthereumLedger(LedgerBase):
             abi = json.load(f)["abi"]
 
         self.contract = self.w3.eth.contract(address=self.contract_addr, abi=abi)
+        self._coalescer = SubmitCoalescer(self.submit_audits, name="Ethereum")
+        self._session_ready = False
+        self._nonce_lock = asyncio.Lock()
+
+    async def _connect(self):
+        # Route JSON-RPC over the shared keep-alive pool
+        if not self._session_ready:
+            await self.provider.cache_async_session(await get_aiohttp_session())
+            self._session_ready = True
 
     async def submit_audit(self, intent, decision, user_id):
-        try:
-            payload = json.dumps(
-                {
-                    "intent": intent,
-                    "decision": decision,
-                    "user_id": user_id,
-                    "timestamp": asyncio.get_event_loop().time(),
-                }
-            ).encode()
+        return await self._coalescer.submit(intent, decision, user_id)
 
-            nonce = await self.w3.eth.get_transaction_count(self.account.address)
-            txn = await self.contract.functions.appendAudit(payload).build_transaction(
-                {
-                    "from": self.account.address,
-                    "nonce": nonce,
-                    "gas": 200000,
-                    "gasPrice": await self.w3.eth.gas_price,
-                }
-            )
+    async def submit_audits(self, batch) -> List[Optional[str]]:
+        """
+        One nonce / gas-price lookup per batch, then consecutive nonces are
+        sent back to back and the receipts awaited together.
+        """
+        try:
+            await self._connect()
+            async with self._nonce_lock:
+                nonce = await self.w3.eth.get_transaction_count(
+                    self.account.address, "pending"
+                )
+                gas_price = await self.w3.eth.gas_price
+                tx_hashes = []
+                for offset, (intent, decision, user_id) in enumerate(batch):
+                    payload = json.dumps(
+                        {
+                            "intent": intent,
+                            "decision": decision,
+                            "user_id": user_id,
+                            "timestamp": asyncio.get_event_loop().time(),
+                        }
+                    ).encode()
+                    try:
+                        txn = await self.contract.functions.appendAudit(
+                            payload
+                        ).build_transaction(
+                            {
+                                "from": self.account.address,
+                                "nonce": nonce + offset,
+                                "gas": 200000,
+                                "gasPrice": gas_price,
+                            }
+                        )
+                        signed = self.account.sign_transaction(txn)
+                        tx_hashes.append(
+                            await self.w3.eth.send_raw_transaction(signed.rawTransaction)
+                        )
+                    except Exception as e:
+                        # Later nonces would leave a gap; stop the batch here
+                        print(f"[Ethereum] submit error: {e}")
+                        break
 
-            signed = self.account.sign_transaction(txn)
-            receipt = await self.w3.eth.wait_for_transaction_receipt(
-                await self.w3.eth.send_raw_transaction(signed.rawTransaction)
+            receipts = await asyncio.gather(
+                *(self.w3.eth.wait_for_transaction_receipt(h) for h in tx_hashes),
+                return_exceptions=True,
             )
-            return receipt.transactionHash.hex()
+            results = []
+            for receipt in receipts:
+                if isinstance(receipt, Exception):
+                    print(f"[Ethereum] submit error: {receipt}")
+                    results.append(None)
+                else:
+                    results.append(receipt.transactionHash.hex())
+            return results + [None] * (len(batch) - len(results))
         except Exception as e:
             print(f"[Ethereum] submit error: {e}")
-            return None
+            return [None] * len(batch)
 
     async def query_chain(self, tx_id):
         try:
+            await self._connect()
             result = await self.contract.functions.getAudit(
                 bytes.fromhex(tx_id[2:])
             ).call()
@@ -64,4 +108,5 @@ class EthereumLedger(LedgerBase):
             return {}
 
     async def close(self):
+        await self._coalescer.drain()
         await self.w3.close()
@@ -1,9 +1,12 @@
 import asyncio
 import json
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+
 from hfc.fabric import Client
 from hfc.fabric_network.gateway import Gateway
+
+from .batching import SubmitCoalescer
 from .ledger_base import LedgerBase
 
 
@@ -13,40 +16,60 @@ class FabricLedger(LedgerBase):
         self.channel = os.getenv("CHANNEL_NAME", "mychannel")
         self.cc_name = os.getenv("CHAINCODE_NAME", "auditchain")
         self.wallet = os.getenv("FABRIC_WALLET", "./wallet")
+
         self.gateway: Optional[Gateway] = None
+        self.contract = None
         self.client = Client(net_profile=self.net_profile)
+        self._connect_lock = asyncio.Lock()
+        self._coalescer = SubmitCoalescer(self.submit_audits, name="Fabric")
 
     async def connect(self):
-        if not self.gateway:
-            self.gateway = Gateway()
-            await self.gateway.connect(self.net_profile, {"wallet": self.wallet})
+        # One gateway connection and contract handle, reused by every call
+        async with self._connect_lock:
+            if not self.gateway:
+                self.gateway = Gateway()
+                await self.gateway.connect(self.net_profile, {"wallet": self.wallet})
+            if self.contract is None:
+                network = await self.gateway.get_network(self.channel)
+                self.contract = network.get_contract(self.cc_name)
+        return self.contract
 
     async def submit_audit(self, intent, decision, user_id):
+        return await self._coalescer.submit(intent, decision, user_id)
+
+    async def submit_audits(self, batch) -> List[Optional[str]]:
+        """
+        The chaincode has no batch call, so a batch is submitted concurrently
+        over the shared gateway; the orderer then packs the transactions into
+        the same blocks.
+        """
         try:
-            await self.connect()
-            network = await self.gateway.get_network(self.channel)
-            contract = network.get_contract(self.cc_name)
-
-            payload = json.dumps(
-                {
-                    "intent": intent,
-                    "decision": decision,
-                    "user_id": user_id,
-                    "timestamp": asyncio.get_event_loop().time(),
-                }
-            )
-
-            resp = await contract.submit_transaction("appendAudit", payload)
-            return resp.decode()
+            contract = await self.connect()
         except Exception as e:
             print(f"[Fabric] submit error: {e}")
-            return None
+            return [None] * len(batch)
+
+        async def submit_one(intent, decision, user_id):
+            try:
+                payload = json.dumps(
+                    {
+                        "intent": intent,
+                        "decision": decision,
+                        "user_id": user_id,
+                        "timestamp": asyncio.get_event_loop().time(),
+                    }
+                )
+                resp = await contract.submit_transaction("appendAudit", payload)
+                return resp.decode()
+            except Exception as e:
+                print(f"[Fabric] submit error: {e}")
+                return None
+
+        return list(await asyncio.gather(*(submit_one(*item) for item in batch)))
 
     async def query_chain(self, tx_id):
         try:
-            await self.connect()
-            network = await self.gateway.get_network(self.channel)
-            contract = network.get_contract(self.cc_name)
+            contract = await self.connect()
             data = await contract.evaluate_transaction("getAudit", tx_id)
             return json.loads(data.decode())
         except Exception as e:
@@ -54,5 +77,6 @@ class FabricLedger(LedgerBase):
             return {}
 
     async def close(self):
+        await self._coalescer.drain()
         if self.gateway:
             await self.gateway.close()
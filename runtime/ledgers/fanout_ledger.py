@@ -0,0 +1,210 @@
+import asyncio
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from .ledger_base import LedgerBase
+
+
+class _Pending:
+    """One submission travelling through the replica queues."""
+
+    __slots__ = ("args", "acks", "failures", "replicas", "needed", "done")
+
+    def __init__(self, args, replicas: int, needed: int, done: Optional[asyncio.Future]):
+        self.args = args
+        self.acks = 0
+        self.failures = 0
+        self.replicas = replicas
+        self.needed = needed
+        self.done = done
+
+    def ack(self):
+        self.acks += 1
+        if self.done is not None and not self.done.done() and self.acks >= self.needed:
+            self.done.set_result(True)
+
+    def fail(self):
+        """A replica gave up on (or dropped) this audit."""
+        self.failures += 1
+        if (
+            self.done is not None
+            and not self.done.done()
+            and self.replicas - self.failures < self.needed
+        ):
+            self.done.set_result(False)
+
+
+class FanoutLedger(LedgerBase):
+    """
+    Composite ledger: one fast primary plus slower replicas.
+
+    submit_audit awaits the primary (e.g. WORM), then enqueues the audit on
+    a bounded queue per replica (Fabric / QLDB / Cosmos ...). Each replica
+    has one worker that drains up to batch_max queued audits, hands them to
+    the backend's submit_audits and retries failures with exponential backoff.
+
+    quorum counts the primary: quorum=1 returns as soon as the primary has
+    the record, quorum=2 also waits for the fastest replica, and so on. If
+    the quorum is not met within quorum_timeout_s the caller gets None while
+    replication carries on in the background. Once enough replicas have
+    given up on an audit that the quorum can no longer be met, the caller
+    gets None straight away.
+
+    Enqueueing never waits: if a replica's queue is full the audit is
+    dropped for that replica and counted in stats[name]["dropped"], so one
+    slow replica cannot stall callers that do not need its ack.
+    """
+
+    def __init__(
+        self,
+        primary: LedgerBase,
+        replicas: Dict[str, LedgerBase],
+        quorum: int = 1,
+        quorum_timeout_s: float = 30.0,
+        queue_size: int = 10_000,
+        batch_max: int = 64,
+        max_retries: int = 5,
+        retry_backoff_s: float = 0.05,
+        max_receipts: int = 100_000,
+    ):
+        if not 1 <= quorum <= 1 + len(replicas):
+            raise ValueError(f"quorum must be between 1 and {1 + len(replicas)}")
+        self.primary = primary
+        self.replicas = replicas
+        self.quorum = quorum
+        self.quorum_timeout_s = quorum_timeout_s
+        self.queue_size = queue_size
+        self.batch_max = batch_max
+        self.max_retries = max_retries
+        self.retry_backoff_s = retry_backoff_s
+
+        # primary hash -> {replica name: replica tx id}, most recent only
+        self.receipts: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self.max_receipts = max_receipts
+        self.stats = {
+            name: {"ok": 0, "retried": 0, "failed": 0, "dropped": 0} for name in replicas
+        }
+
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # ------------------------------------------------------------------
+    # Replica workers
+    # ------------------------------------------------------------------
+    def _ensure_workers(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._workers and all(not w.done() for w in self._workers):
+            return
+        self._loop = loop
+        self._queues = {name: asyncio.Queue(maxsize=self.queue_size) for name in self.replicas}
+        self._workers = [
+            loop.create_task(self._replicate(name, backend, self._queues[name]))
+            for name, backend in self.replicas.items()
+        ]
+
+    async def _replicate(self, name: str, backend: LedgerBase, queue: asyncio.Queue):
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_max and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            stop = batch[-1] is None
+            batch = [item for item in batch if item is not None]
+            if batch:
+                await self._submit_with_retry(name, backend, batch)
+            if stop:
+                return
+
+    async def _submit_batch(self, backend: LedgerBase, batch) -> List[Optional[str]]:
+        try:
+            return await backend.submit_audits([item.args[1:] for item in batch])
+        except Exception as e:
+            print(f"[Fanout] batch submit error: {e}")
+            return [None] * len(batch)
+
+    async def _submit_with_retry(self, name: str, backend: LedgerBase, batch):
+        for attempt in range(self.max_retries + 1):
+            results = await self._submit_batch(backend, batch)
+            retry = []
+            for item, tx_id in zip(batch, results):
+                if isinstance(tx_id, str) and tx_id:
+                    self._record_receipt(item.args[0], name, tx_id)
+                    self.stats[name]["ok"] += 1
+                    item.ack()
+                else:
+                    retry.append(item)
+            if not retry:
+                return
+            batch = retry
+            if attempt < self.max_retries:
+                self.stats[name]["retried"] += len(batch)
+                await asyncio.sleep(self.retry_backoff_s * 2**attempt)
+        self.stats[name]["failed"] += len(batch)
+        print(f"[Fanout] {name}: gave up on {len(batch)} audits")
+        for item in batch:
+            item.fail()
+
+    def _record_receipt(self, primary_id: str, name: str, tx_id: str):
+        receipt = self.receipts.get(primary_id)
+        if receipt is None:
+            receipt = self.receipts[primary_id] = {}
+            if len(self.receipts) > self.max_receipts:
+                self.receipts.popitem(last=False)
+        receipt[name] = tx_id
+
+    # ------------------------------------------------------------------
+    # LedgerBase
+    # ------------------------------------------------------------------
+    async def submit_audit(self, intent, decision, user_id):
+        primary_id = await self.primary.submit_audit(intent, decision, user_id)
+        if primary_id is None or not self.replicas:
+            return primary_id
+
+        self._ensure_workers()
+        done = None
+        if self.quorum > 1:
+            done = asyncio.get_running_loop().create_future()
+        pending = _Pending(
+            (primary_id, intent, decision, user_id), len(self._queues), self.quorum - 1, done
+        )
+        for name, queue in self._queues.items():
+            try:
+                queue.put_nowait(pending)
+            except asyncio.QueueFull:
+                self.stats[name]["dropped"] += 1
+                pending.fail()
+
+        if done is not None:
+            try:
+                met = await asyncio.wait_for(asyncio.shield(done), self.quorum_timeout_s)
+            except asyncio.TimeoutError:
+                print(f"[Fanout] quorum {self.quorum} not met for {primary_id}")
+                return None
+            if not met:
+                print(f"[Fanout] quorum {self.quorum} unreachable for {primary_id}")
+                return None
+        return primary_id
+
+    async def query_chain(self, id_):
+        record = await self.primary.query_chain(id_)
+        if record:
+            return record
+        for name, tx_id in self.receipts.get(id_, {}).items():
+            record = await self.replicas[name].query_chain(tx_id)
+            if record:
+                return record
+        return {}
+
+    async def flush(self):
+        """Wait until every queued audit has been replicated (or given up on)."""
+        if self._loop is asyncio.get_running_loop():
+            for queue in self._queues.values():
+                await queue.put(None)
+            await asyncio.gather(*self._workers)
+            self._workers = []
+
+    async def close(self):
+        await self.flush()
+        for backend in [self.primary, *self.replicas.values()]:
+            await backend.close()
@@ -0,0 +1,34 @@
+import os
+from typing import Any, Dict
+
+# One pool per process, shared by every adapter that talks HTTP
+_sessions: Dict[str, Any] = {}
+
+
+def pool_size() -> int:
+    return int(os.getenv("LEDGER_HTTP_POOL_SIZE", "100"))
+
+
+async def get_aiohttp_session():
+    """Shared aiohttp.ClientSession with a bounded keep-alive connection pool."""
+    import aiohttp
+
+    session = _sessions.get("aiohttp")
+    if session is None or session.closed:
+        session = _sessions["aiohttp"] = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=pool_size(), keepalive_timeout=60)
+        )
+    return session
+
+
+def get_botocore_config():
+    """botocore Config sized to the shared pool (used by the QLDB driver)."""
+    from botocore.config import Config
+
+    return Config(max_pool_connections=pool_size(), retries={"max_attempts": 3})
+
+
+async def close_sessions():
+    session = _sessions.pop("aiohttp", None)
+    if session is not None and not session.closed:
+        await session.close()
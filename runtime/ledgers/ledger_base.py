@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+import asyncio
+from typing import Dict, Any, List, Optional, Tuple
 
 
 class LedgerBase(ABC):
@@ -9,6 +10,17 @@ class LedgerBase(ABC):
     ) -> Optional[str]:
         pass
 
+    async def submit_audits(
+        self, batch: List[Tuple[Dict[str, Any], Dict[str, Any], str]]
+    ) -> List[Optional[str]]:
+        """
+        Submit (intent, decision, user_id) tuples; one id (or None) per item,
+        in order. Backends with a native batch path override this.
+        """
+        return list(
+            await asyncio.gather(*(self.submit_audit(*item) for item in batch))
+        )
+
     @abstractmethod
     async def query_chain(self, id_: str) -> Dict[str, Any]:
         pass
@@ -21,10 +33,25 @@ def get_ledger(ledger_type: str) -> "LedgerBase":
     """
     Lazy-loaded ledger factory.
     Only imports the backend actually requested.
+
+    "worm+fabric+cosmos" builds a FanoutLedger: the first backend is the
+    synchronous primary, the rest are replicated asynchronously. The
+    durability quorum (primary included) comes from LEDGER_QUORUM.
     """
 
     ledger_type = ledger_type.lower()
 
+    if "+" in ledger_type:
+        import os
+        from .fanout_ledger import FanoutLedger
+
+        primary, *replicas = ledger_type.split("+")
+        return FanoutLedger(
+            get_ledger(primary),
+            {name: get_ledger(name) for name in replicas},
+            quorum=int(os.getenv("LEDGER_QUORUM", "1")),
+        )
+
     if ledger_type == "fabric":
         from .fabric_integration import FabricLedger
 
@@ -45,6 +72,11 @@ def get_ledger(ledger_type: str) -> "LedgerBase":
 
         return CosmosLedger()
 
+    if ledger_type == "simulated":
+        from .simulated_ledger import SimulatedLedger
+
+        return SimulatedLedger()
+
     if ledger_type == "worm":
         from .worm_fallback import WORMFallback
 
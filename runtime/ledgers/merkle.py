@@ -0,0 +1,175 @@
+import hashlib
+
+
+def hash_leaf(data: bytes) -> bytes:
+    return hashlib.sha256(b"\x00" + data).digest()
+
+
+def hash_node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def _fold_peaks(peaks: list[tuple[int, bytes]]) -> bytes:
+    """
+    Root from perfect-subtree peaks given smallest first as (height, hash).
+    A lone right-edge node is paired with itself until it reaches the height
+    of the next peak, which is exactly what merkle_root's duplication does.
+    """
+    acc_height, acc = peaks[0]
+    for height, peak in peaks[1:]:
+        while acc_height < height:
+            acc = hash_node(acc, acc)
+            acc_height += 1
+        acc = hash_node(peak, acc)
+        acc_height += 1
+    return acc
+
+
+class MerkleAccumulator:
+    """
+    Streaming Merkle tree: append one leaf at a time, keeping only the
+    O(log n) perfect-subtree peaks. root() equals merkle_root() over every
+    leaf appended so far and costs O(log n).
+    """
+
+    def __init__(self):
+        self.size = 0
+        self._frontier: list[bytes | None] = []  # peak per height, or None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, leaf: bytes) -> int:
+        """Add a leaf; returns its index."""
+        node = hash_leaf(leaf)
+        height = 0
+        while height < len(self._frontier) and self._frontier[height] is not None:
+            node = hash_node(self._frontier[height], node)
+            self._frontier[height] = None
+            height += 1
+        if height == len(self._frontier):
+            self._frontier.append(node)
+        else:
+            self._frontier[height] = node
+        self.size += 1
+        return self.size - 1
+
+    def peaks(self) -> list[bytes]:
+        """Perfect-subtree roots, largest (leftmost) first."""
+        return [p for p in reversed(self._frontier) if p is not None]
+
+    def root(self) -> bytes:
+        if not self.size:
+            raise ValueError("empty Merkle tree has no root")
+        return _fold_peaks([(h, p) for h, p in enumerate(self._frontier) if p is not None])
+
+
+def merkle_root(leaves: list[bytes]) -> bytes:
+    acc = MerkleAccumulator()
+    for leaf in leaves:
+        acc.append(leaf)
+    return acc.root()
+
+
+def merkle_proof(leaves: list[bytes], index: int) -> list[tuple[bool, bytes]]:
+    """Audit path for leaves[index]: (sibling_is_left, sibling) per level."""
+    if not 0 <= index < len(leaves):
+        raise IndexError(f"leaf index {index} out of range")
+    nodes = [hash_leaf(l) for l in leaves]
+    proof = []
+    while len(nodes) > 1:
+        if len(nodes) % 2 == 1:
+            nodes.append(nodes[-1])
+        sibling = index ^ 1
+        proof.append((sibling < index, nodes[sibling]))
+        nodes = [hash_node(nodes[i], nodes[i + 1]) for i in range(0, len(nodes), 2)]
+        index //= 2
+    return proof
+
+
+def verify_proof(leaf: bytes, proof: list[tuple[bool, bytes]], root: bytes) -> bool:
+    """Check an audit path from merkle_proof in O(log n) hashes."""
+    node = hash_leaf(leaf)
+    for sibling_is_left, sibling in proof:
+        node = hash_node(sibling, node) if sibling_is_left else hash_node(node, sibling)
+    return node == root
+
+
+def _peak_positions(size: int) -> list[tuple[int, int]]:
+    """(height, position) of the perfect subtrees of a size-leaf tree, left first."""
+    positions, start = [], 0
+    for height in range(size.bit_length() - 1, -1, -1):
+        if size >> height & 1:
+            positions.append((height, start >> height))
+            start += 1 << height
+    return positions
+
+
+def _range_blocks(start: int, end: int) -> list[tuple[int, int]]:
+    """Maximal aligned perfect subtrees covering leaves [start, end), left first."""
+    blocks = []
+    while start < end:
+        height = 0
+        while start % (2 << height) == 0 and start + (2 << height) <= end:
+            height += 1
+        blocks.append((height, start >> height))
+        start += 1 << height
+    return blocks
+
+
+def consistency_proof(
+    old_peaks: list[bytes], old_size: int, appended: list[bytes]
+) -> list[bytes]:
+    """
+    Proof that the tree of old_size + len(appended) leaves extends the tree
+    of old_size leaves. Needs only the old tree's peaks (MerkleAccumulator
+    .peaks() at old_size) and the leaves appended since; the proof itself
+    is O(log n) hashes.
+    """
+    if len(old_peaks) != len(_peak_positions(old_size)):
+        raise ValueError("old_peaks do not match old_size")
+    proof = list(old_peaks)
+    for height, pos in _range_blocks(old_size, old_size + len(appended)):
+        start = (pos << height) - old_size
+        block = MerkleAccumulator()
+        for leaf in appended[start : start + (1 << height)]:
+            block.append(leaf)
+        proof.append(block.root())
+    return proof
+
+
+def verify_consistency(
+    old_size: int, new_size: int, old_root: bytes, new_root: bytes, proof: list[bytes]
+) -> bool:
+    """Check a consistency_proof between two published roots in O(log n)."""
+    if not 0 < old_size <= new_size:
+        return False
+    old_positions = _peak_positions(old_size)
+    new_positions = _range_blocks(old_size, new_size)
+    if len(proof) != len(old_positions) + len(new_positions):
+        return False
+
+    old_peaks = proof[: len(old_positions)]
+    peaks = [(h, p) for (h, _), p in zip(old_positions, old_peaks)]
+    if _fold_peaks(peaks[::-1]) != old_root:
+        return False
+
+    blocks = dict(zip(old_positions + new_positions, proof))
+
+    def node(height: int, pos: int) -> bytes:
+        if (height, pos) in blocks:
+            return blocks[(height, pos)]
+        if height == 0:
+            raise KeyError(pos)
+        # Children live on a level of ceil(new_size / 2**(height-1)) nodes;
+        # a missing right child is the duplicated left child.
+        level_len = -(-new_size >> (height - 1))
+        left = node(height - 1, 2 * pos)
+        right = node(height - 1, 2 * pos + 1) if 2 * pos + 1 < level_len else left
+        return hash_node(left, right)
+
+    top = (new_size - 1).bit_length()
+    try:
+        return node(top, 0) == new_root
+    except KeyError:
+        return False
@@ -1,9 +1,13 @@
 import asyncio
 import json
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+
 from pyqldb.driver import QldbDriver
 from pyqldb.config.retry_policy import RetryPolicy
+
+from .batching import SubmitCoalescer
+from .http_pool import get_botocore_config, pool_size
 from .ledger_base import LedgerBase
 
 
@@ -13,32 +17,45 @@ class QLDBLedger(LedgerBase):
             ledger_name=os.getenv("LEDGER_NAME", "IntentAudit"),
             region_name=os.getenv("AWS_REGION", "us-east-1"),
             retry_policy=RetryPolicy(3),
+            max_concurrent_transactions=pool_size(),
+            config=get_botocore_config(),
         )
+        self._coalescer = SubmitCoalescer(self.submit_audits, name="QLDB")
 
     async def submit_audit(self, intent, decision, user_id):
-        payload = {
-            "intent": intent,
-            "decision": decision,
-            "user_id": user_id,
-            "timestamp": asyncio.get_event_loop().time(),
-        }
+        return await self._coalescer.submit(intent, decision, user_id)
+
+    async def submit_audits(self, batch) -> List[Optional[str]]:
+        """All inserts of a batch commit in one QLDB transaction."""
+        now = asyncio.get_event_loop().time()
+        payloads = [
+            {"intent": intent, "decision": decision, "user_id": user_id, "timestamp": now}
+            for intent, decision, user_id in batch
+        ]
+
+        def insert_all(txn):
+            return [
+                list(txn.execute_statement("INSERT INTO Audits VALUE ?", payload))
+                for payload in payloads
+            ]
+
         try:
-            result = self.driver.execute_lambda(
-                lambda txn: txn.execute_statement("INSERT INTO Audits VALUE ?", payload)
-            )
-            return str(result[0]) if result else None
+            # The driver is blocking; keep it off the event loop
+            results = await asyncio.to_thread(self.driver.execute_lambda, insert_all)
+            return [str(r[0]) if r else None for r in results]
         except Exception as e:
             print(f"[QLDB] submit error: {e}")
-            return None
+            return [None] * len(batch)
 
     async def query_chain(self, doc_id):
         try:
-            result = self.driver.execute_lambda(
+            result = await asyncio.to_thread(
+                self.driver.execute_lambda,
                 lambda txn: list(
                     txn.execute_statement(
                         "SELECT * FROM Audits WHERE metadata.id = ?", doc_id
                     )
-                )
+                ),
             )
             return result[0][0] if result else {}
         except Exception as e:
@@ -46,4 +63,5 @@ class QLDBLedger(LedgerBase):
             return {}
 
     async def close(self):
+        await self._coalescer.drain()
         self.driver.shutdown()
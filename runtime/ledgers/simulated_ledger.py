@@ -0,0 +1,71 @@
+import asyncio
+import hashlib
+import json
+import random
+from typing import Dict, Any, List, Optional
+
+from .batching import SubmitCoalescer
+from .ledger_base import LedgerBase
+
+
+class SimulatedLedger(LedgerBase):
+    """
+    In-memory stand-in for a remote ledger, for benchmarks and tests.
+
+    Every call sleeps for latency_s (+ uniform jitter_s) to model the
+    network / consensus round trip, and fails with probability
+    failure_rate, returning None like the real adapters do. submit_audits
+    is one round trip for the whole batch; with coalesce_ms set,
+    submit_audit calls are coalesced into such batches.
+    """
+
+    def __init__(
+        self,
+        name: str = "simulated",
+        latency_s: float = 0.0,
+        jitter_s: float = 0.0,
+        failure_rate: float = 0.0,
+        coalesce_ms: Optional[float] = None,
+    ):
+        self.name = name
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self.failure_rate = failure_rate
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.calls = 0
+        self._coalescer = None
+        if coalesce_ms is not None:
+            self._coalescer = SubmitCoalescer(self.submit_audits, coalesce_ms, name=name)
+
+    async def _round_trip(self):
+        self.calls += 1
+        delay = self.latency_s + random.uniform(0, self.jitter_s)
+        if delay:
+            await asyncio.sleep(delay)
+        return random.random() >= self.failure_rate
+
+    def _store(self, intent, decision, user_id) -> str:
+        payload = {"intent": intent, "decision": decision, "user_id": user_id}
+        tx_id = hashlib.sha256(
+            f"{self.name}:{len(self.records)}:{json.dumps(payload, sort_keys=True)}".encode()
+        ).hexdigest()
+        self.records[tx_id] = payload
+        return tx_id
+
+    async def submit_audit(self, intent, decision, user_id) -> Optional[str]:
+        if self._coalescer is not None:
+            return await self._coalescer.submit(intent, decision, user_id)
+        if not await self._round_trip():
+            print(f"[{self.name}] submit error: injected failure")
+            return None
+        return self._store(intent, decision, user_id)
+
+    async def submit_audits(self, batch) -> List[Optional[str]]:
+        if not await self._round_trip():
+            print(f"[{self.name}] submit error: injected failure")
+            return [None] * len(batch)
+        return [self._store(*item) for item in batch]
+
+    async def query_chain(self, id_: str) -> Dict[str, Any]:
+        await self._round_trip()
+        return self.records.get(id_, {})
@@ -1,16 +1,199 @@
-from datetime import timezone
+import asyncio
 import json
 import os
+import glob
 import hashlib
-from typing import Dict, Any, Optional
-from datetime import datetime, timezone, UTC
+import struct
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timezone
 from .ledger_base import LedgerBase
 
+# Index record: 8-byte hash prefix, segment id, byte offset within segment
+_INDEX_RECORD = struct.Struct(">QIQ")
+
 
 class WORMFallback(LedgerBase):
+    """
+    Local append-only audit store.
+
+    Layout:
+      audits.worm            active segment, lines of "<sha256>:<payload>"
+      audits.worm.000001 ... sealed segments, rolled once the active file
+                             exceeds WORM_SEGMENT_BYTES
+      audits.worm.idx        append-only index, one fixed-size record per
+                             audit: hash prefix -> (segment, offset)
+
+    query_chain is a dict lookup plus a single seek. The index is rebuilt
+    from the segments on startup if it is missing or behind.
+
+    submit_audit never blocks the event loop: submissions go through a
+    bounded asyncio queue to a single writer task, which drains up to
+    WORM_BATCH_MAX of them, writes and fsyncs the batch in a worker thread,
+    then resolves each caller with its hash. A full queue (WORM_QUEUE_SIZE)
+    makes submit_audit wait, so bursts apply backpressure instead of
+    growing memory.
+    """
+
     def __init__(self):
         self.file = os.getenv("WORM_FILE", "./audits.worm")
+        self.index_file = self.file + ".idx"
+        self.segment_bytes = int(os.getenv("WORM_SEGMENT_BYTES", 64 * 1024 * 1024))
+        self.queue_size = int(os.getenv("WORM_QUEUE_SIZE", 10_000))
+        self.batch_max = int(os.getenv("WORM_BATCH_MAX", 512))
+
+        self._index: Dict[int, int] = {}  # hash prefix -> segment << 40 | offset
+        self._readers: Dict[int, Any] = {}
+        self._segment = self._discover_active_segment()
+        self._size = os.path.getsize(self.file) if os.path.exists(self.file) else 0
+        self._load_index()
+
+        self._fh = open(self.file, "ab")
+        self._index_fh = open(self.index_file, "ab")
+
+        # Writer state, bound to the event loop of the first submit
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # ------------------------------------------------------------------
+    # Segments
+    # ------------------------------------------------------------------
+    def _segment_path(self, segment: int) -> str:
+        return self.file if segment == self._segment else f"{self.file}.{segment:06d}"
+
+    def _sealed_segments(self) -> list:
+        ids = []
+        for path in glob.glob(glob.escape(self.file) + ".[0-9]*"):
+            suffix = path.rsplit(".", 1)[1]
+            if suffix.isdigit():
+                ids.append(int(suffix))
+        return sorted(ids)
+
+    def _discover_active_segment(self) -> int:
+        sealed = self._sealed_segments()
+        return sealed[-1] + 1 if sealed else 1
+
+    def _roll_segment(self):
+        """Seal the active file under its segment id and start a new one."""
+        self._fh.close()
+        os.rename(self.file, f"{self.file}.{self._segment:06d}")
+        self._segment += 1
+        self._size = 0
+        self._fh = open(self.file, "ab")
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _key(hash_id: str) -> int:
+        return int(hash_id[:16], 16)
 
+    def _load_index(self):
+        last: Optional[Tuple[int, int]] = None
+        if os.path.exists(self.index_file):
+            with open(self.index_file, "rb") as f:
+                data = f.read()
+            whole = len(data) - len(data) % _INDEX_RECORD.size
+            if whole != len(data):
+                os.truncate(self.index_file, whole)  # torn tail
+            for key, segment, offset in _INDEX_RECORD.iter_unpack(data[:whole]):
+                self._index[key] = segment << 40 | offset
+                last = (segment, offset)
+
+        # Index whatever the segments hold beyond the last indexed record
+        with open(self.index_file, "ab") as idx:
+            for segment in self._sealed_segments() + [self._segment]:
+                if last is not None and segment < last[0]:
+                    continue
+                path = self._segment_path(segment)
+                if not os.path.exists(path):
+                    continue
+                with open(path, "rb") as f:
+                    offset = 0
+                    if last is not None and segment == last[0]:
+                        f.seek(last[1])
+                        offset = last[1] + len(f.readline())
+                    for line in f:
+                        h = line.split(b":", 1)[0].decode()
+                        if len(h) == 64:
+                            self._index[self._key(h)] = segment << 40 | offset
+                            idx.write(_INDEX_RECORD.pack(self._key(h), segment, offset))
+                        offset += len(line)
+
+    def _read_at(self, segment: int, offset: int) -> bytes:
+        reader = self._readers.get(segment)
+        if reader is None:
+            reader = self._readers[segment] = open(self._segment_path(segment), "rb")
+        reader.seek(offset)
+        return reader.readline()
+
+    # ------------------------------------------------------------------
+    # Background writer
+    # ------------------------------------------------------------------
+    def _ensure_writer(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._writer is None or self._writer.done():
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._writer = loop.create_task(self._write_loop(self._queue))
+        return self._queue
+
+    async def _write_loop(self, queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_max and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            stop = batch[-1] is None
+            batch = [item for item in batch if item is not None]
+            if batch:
+                try:
+                    await loop.run_in_executor(None, self._write_batch, batch)
+                    for h, _, done in batch:
+                        if not done.done():
+                            done.set_result(h)
+                except Exception as e:
+                    for _, _, done in batch:
+                        if not done.done():
+                            done.set_exception(e)
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[Tuple[str, bytes, Any]]):
+        """Runs in a worker thread; the writer task awaits it, so only one
+        batch touches the file handles at a time."""
+        data = b"".join(line for _, line, _ in batch)
+        if self._size and self._size + len(data) > self.segment_bytes:
+            self._roll_segment()
+
+        records, offset = [], self._size
+        for h, line, _ in batch:
+            records.append((self._key(h), offset))
+            offset += len(line)
+
+        try:
+            self._fh.write(data)
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+        except Exception:
+            # Some or all of the batch may already be in the segment; the
+            # next batch must be indexed where its records actually land
+            self._size = os.fstat(self._fh.fileno()).st_size
+            raise
+        self._size = offset
+
+        # The sidecar is rebuilt from the segments if it lags, so no fsync
+        self._index_fh.write(
+            b"".join(_INDEX_RECORD.pack(k, self._segment, o) for k, o in records)
+        )
+        self._index_fh.flush()
+        for key, o in records:
+            self._index[key] = self._segment << 40 | o
+
+    # ------------------------------------------------------------------
+    # LedgerBase
+    # ------------------------------------------------------------------
     async def submit_audit(self, intent, decision, user_id):
         try:
             payload = json.dumps(
@@ -18,28 +201,43 @@ class WORMFallback(LedgerBase):
                     "intent": intent,
                     "decision": decision,
                     "user_id": user_id,
-                    "timestamp": datetime.now(datetime.UTC).isoformat(),
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
                 }
             )
             h = hashlib.sha256(payload.encode()).hexdigest()
-            with open(self.file, "a") as f:
-                f.write(f"{h}:{payload}\n")
-            return h
+            line = f"{h}:{payload}\n".encode()
+
+            queue = self._ensure_writer()
+            done = asyncio.get_running_loop().create_future()
+            await queue.put((h, line, done))
+            return await done
         except Exception as e:
             print(f"[WORM] submit error: {e}")
             return None
 
     async def query_chain(self, hash_id):
         try:
-            with open(self.file, "r") as f:
-                for line in f:
-                    h, payload = line.strip().split(":", 1)
-                    if h == hash_id:
-                        return json.loads(payload)
-            return {}
+            loc = self._index.get(self._key(hash_id))
+            if loc is None:
+                return {}
+            line = self._read_at(loc >> 40, loc & ((1 << 40) - 1))
+            h, payload = line.decode().strip().split(":", 1)
+            if h != hash_id:
+                return {}  # prefix collision
+            return json.loads(payload)
         except Exception as e:
             print(f"[WORM] query error: {e}")
             return {}
 
     async def close(self):
-        pass
+        if self._writer is not None and not self._writer.done():
+            if self._loop is asyncio.get_running_loop():
+                await self._queue.put(None)  # drain, then stop
+                await self._writer
+            else:
+                self._writer.cancel()
+        self._fh.close()
+        self._index_fh.close()
+        for reader in self._readers.values():
+            reader.close()
+        self._readers.clear()
@@ -27,6 +27,30 @@ risk_decisions = Counter(
     ["decision_type", "risk_level"],
 )
 
+# Policy decision cache (result: hit / miss / bypass)
+decision_cache_lookups = Counter(
+    "galani_policy_decision_cache_total",
+    "Policy decision cache lookups",
+    ["result"],
+)
+
+# ConscienceEngine profiling (sampled, see galani_protocol_v2.PolicyProfiler)
+_POLICY_BUCKETS = [0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0]
+
+policy_rule_duration = Histogram(
+    "galani_policy_rule_duration_seconds",
+    "PolicyRule.evaluate duration in seconds",
+    ["rule"],
+    buckets=_POLICY_BUCKETS,
+)
+
+policy_stage_duration = Histogram(
+    "galani_policy_stage_duration_seconds",
+    "ConscienceEngine stage duration in seconds",
+    ["stage"],
+    buckets=_POLICY_BUCKETS,
+)
+
 # System metrics
 active_agents = Gauge("galani_active_agents", "Number of active agents")
 
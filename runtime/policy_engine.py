@@ -25,6 +25,9 @@ def _load_real():
 
 _real = _load_real()
 
+# authorize(action, principal, context, policy) -> (allowed, reason)
+from galani.governance.policy_compiler import authorize  # noqa: E402
+
 
 def _to_enveloped(
     action: str, principal: Dict[str, Any], context: Dict[str, Any]
@@ -195,3 +198,22 @@ def authorize_intent(action, principal=None, context=None, **kwargs):
 
 
 # === PV_TEST_COMPAT_AUTHORIZE_INTENT_END ===
+
+
+def authorize_intents(batch, policy_version="v4", mode="enforce"):
+    """
+    Batch authorize. Items may be enveloped dicts or (action, principal,
+    context) tuples, normalized the same way as authorize_intent above.
+    """
+    envelopes = []
+    for item in batch:
+        if isinstance(item, (tuple, list)):
+            action, principal, context = (list(item) + [None, None])[:3]
+            item = {
+                "action": str(action),
+                "principal": principal or {},
+                "context": context or {},
+                "payload": {},
+            }
+        envelopes.append(item)
+    return _real.authorize_intents(envelopes, policy_version=policy_version, mode=mode)
@@ -0,0 +1,295 @@
+"""
+Sanctions screening index
+
+A sanctions list (OFAC SDN, EU consolidated, ...) is loaded from a local CSV
+file into an immutable SanctionsIndex:
+
+  - an exact-match dict from each normalized name / alias to its entry, for
+    identifier-like fields (entity ids, counterparty names)
+  - an Aho-Corasick automaton over name tokens, which finds every listed
+    name or alias occurring as a whole-word run anywhere in free text
+    ("wire to Iran Bank 001 ltd") in one pass, independent of list size
+
+The automaton works on word tokens rather than characters: matches always
+fall on word boundaries ("IRAN" does not hit "PIRANHA"), and the trie has one
+node per distinct name prefix in words, which keeps 100k-entry lists small.
+
+SanctionsScreener holds the current index for a list file and swaps in a
+freshly built one when the file changes, the same way PolicyRegistry
+reloads policies.json.
+
+List file format (CSV with header):
+
+    uid,name,aliases,list
+    SDN-1234,Iran Bank 001,IRAN_BANK_001;Bank of Iran 1,OFAC_SDN
+"""
+
+import csv
+import os
+import string
+import threading
+import unicodedata
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+SANCTIONS_LIST = os.getenv("SANCTIONS_LIST", "sanctions_list.csv")
+RELOAD_INTERVAL_S = float(os.getenv("SANCTIONS_RELOAD_INTERVAL_S", "30"))
+
+_SEPARATORS = str.maketrans({c: " " for c in string.punctuation})
+_EMPTY: Dict[str, int] = {}
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """Case-folded, accent-stripped words; punctuation separates words."""
+    if not text.isascii():
+        text = "".join(
+            c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c)
+        )
+    return text.casefold().translate(_SEPARATORS).split()
+
+
+def normalize_name(text: str) -> str:
+    return " ".join(normalize_tokens(text))
+
+
+@dataclass(frozen=True)
+class SanctionsEntry:
+    uid: str
+    name: str
+    aliases: Tuple[str, ...] = ()
+    source: str = ""
+
+
+@dataclass(frozen=True)
+class SanctionsHit:
+    entry: SanctionsEntry
+    field: str
+    value: str
+    matched: str  # normalized list name or alias that hit
+    exact: bool  # the whole field is the name, not a run inside it
+
+
+class SanctionsIndex:
+    """Immutable screening index over a list of SanctionsEntry."""
+
+    def __init__(self, entries: Iterable[SanctionsEntry]):
+        self.entries: List[SanctionsEntry] = list(entries)
+        self.exact: Dict[str, int] = {}
+
+        # Token trie: goto[state][token] -> state; terminal[state] is the
+        # entry index for a complete name ending there, or -1
+        goto: List[Dict[str, int]] = [{}]
+        terminal = [-1]
+        depth = [0]
+        for i, entry in enumerate(self.entries):
+            for name in (entry.name, *entry.aliases):
+                tokens = normalize_tokens(name)
+                if not tokens:
+                    continue
+                self.exact.setdefault(" ".join(tokens), i)
+                state = 0
+                for token in tokens:
+                    nxt = goto[state].get(token)
+                    if nxt is None:
+                        nxt = goto[state][token] = len(goto)
+                        goto.append({})
+                        terminal.append(-1)
+                        depth.append(depth[state] + 1)
+                    state = nxt
+                if terminal[state] < 0:
+                    terminal[state] = i
+
+        # Failure links, plus a link to the nearest terminal proper suffix
+        # so matches ending at a position are enumerated without walking
+        # the whole failure chain
+        fail = [0] * len(goto)
+        out = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in goto[state].items():
+                f = fail[state]
+                while f and token not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(token, 0) if state else 0
+                fail[child] = target
+                out[child] = target if terminal[target] >= 0 else out[target]
+                queue.append(child)
+
+        self._goto = [g or _EMPTY for g in goto]  # share one dict for leaves
+        self._fail = fail
+        self._out = out
+        self._terminal = terminal
+        self._depth = depth
+
+    @classmethod
+    def from_names(cls, names: Iterable[str], source: str = "") -> "SanctionsIndex":
+        return cls(SanctionsEntry(uid=name, name=name, source=source) for name in names)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def match_exact(self, value: str) -> Optional[SanctionsEntry]:
+        i = self.exact.get(normalize_name(value))
+        return None if i is None else self.entries[i]
+
+    def _scan_tokens(self, tokens: List[str]) -> List[Tuple[int, int, int]]:
+        """(entry index, first token, end token) for every listed run."""
+        goto, fail, out, terminal, depth = (
+            self._goto, self._fail, self._out, self._terminal, self._depth
+        )
+        hits = []
+        state = 0
+        for pos, token in enumerate(tokens):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            match = state if terminal[state] >= 0 else out[state]
+            while match:
+                hits.append((terminal[match], pos + 1 - depth[match], pos + 1))
+                match = out[match]
+        return hits
+
+    def scan(self, text: str) -> List[Tuple[SanctionsEntry, str]]:
+        """(entry, matched name) for every listed name occurring in text."""
+        tokens = normalize_tokens(text)
+        return [
+            (self.entries[i], " ".join(tokens[start:end]))
+            for i, start, end in self._scan_tokens(tokens)
+        ]
+
+    def screen(self, fields: Dict[str, Any]) -> List[SanctionsHit]:
+        """
+        Screen field -> value pairs. A value that is exactly a listed name
+        gives one exact hit; otherwise every listed run inside it is a hit.
+        Non-string values are ignored.
+        """
+        hits = []
+        for field, value in fields.items():
+            if not isinstance(value, str) or not value:
+                continue
+            tokens = normalize_tokens(value)
+            key = " ".join(tokens)
+            i = self.exact.get(key)
+            if i is not None:
+                hits.append(SanctionsHit(self.entries[i], field, value, key, True))
+                continue
+            for i, start, end in self._scan_tokens(tokens):
+                matched = " ".join(tokens[start:end])
+                hits.append(SanctionsHit(self.entries[i], field, value, matched, False))
+        return hits
+
+
+def load_sanctions_list(path: str) -> List[SanctionsEntry]:
+    with open(path, newline="", encoding="utf-8") as f:
+        return [
+            SanctionsEntry(
+                uid=row["uid"],
+                name=row["name"],
+                aliases=tuple(
+                    a.strip() for a in (row.get("aliases") or "").split(";") if a.strip()
+                ),
+                source=row.get("list") or "",
+            )
+            for row in csv.DictReader(f)
+        ]
+
+
+def _file_stat(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+# Reported for every screened field while no list has loaded
+LIST_UNAVAILABLE = SanctionsEntry(uid="LIST_UNAVAILABLE", name="sanctions list unavailable")
+
+
+class SanctionsScreener:
+    """
+    Current SanctionsIndex for a list file. reload() builds the new index
+    off to the side and publishes it with a single reference swap, so
+    screening never sees a partially built index.
+
+    Screening fails closed: until a list has loaded successfully (a missing
+    or unparsable file at startup), every non-empty field comes back as a
+    LIST_UNAVAILABLE hit. The watcher keeps retrying and screening switches
+    to the real index as soon as the file loads.
+    """
+
+    def __init__(self, path: str = SANCTIONS_LIST, reload_interval_s: float = RELOAD_INTERVAL_S):
+        self.path = path
+        self.reload_interval_s = reload_interval_s
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._stat = None
+        self.index = SanctionsIndex(())
+        self.loaded = False
+        self.reload(force=True)
+
+        self._watcher = None
+        if reload_interval_s > 0:
+            self._watcher = threading.Thread(
+                target=self._watch, name="sanctions-watch", daemon=True
+            )
+            self._watcher.start()
+
+    def reload(self, force: bool = False) -> bool:
+        """Rebuild the index if the list file changed; True if swapped."""
+        with self._reload_lock:
+            stat = _file_stat(self.path)
+            if not force and stat == self._stat:
+                return False
+            if stat is None:
+                state = f"{len(self.index)} entries" if self.loaded else "blocking all fields"
+                print(f"[Sanctions] list {self.path} not found, {state}")
+                self._stat = None
+                return False
+            try:
+                index = SanctionsIndex(load_sanctions_list(self.path))
+            except (OSError, ValueError, KeyError) as e:
+                # Keep screening against the last good list
+                if self.loaded:
+                    print(f"[Sanctions] reload failed, keeping {len(self.index)} entries: {e}")
+                else:
+                    print(f"[Sanctions] reload failed, blocking all fields: {e}")
+                return False
+            self.index, self._stat, self.loaded = index, stat, True
+            return True
+
+    def _watch(self):
+        while not self._stop.wait(self.reload_interval_s):
+            self.reload()
+
+    def close(self):
+        self._stop.set()
+
+    def screen(self, fields: Dict[str, Any]) -> List[SanctionsHit]:
+        if not self.loaded:
+            return [
+                SanctionsHit(LIST_UNAVAILABLE, field, value, "", False)
+                for field, value in fields.items()
+                if isinstance(value, str) and value
+            ]
+        return self.index.screen(fields)
+
+
+_SCREENER: Optional[SanctionsScreener] = None
+_SCREENER_LOCK = threading.Lock()
+
+
+def get_screener() -> SanctionsScreener:
+    """Process-wide screener for SANCTIONS_LIST (rebuilt if the path changes)."""
+    global _SCREENER
+    screener = _SCREENER
+    if screener is None or screener.path != SANCTIONS_LIST:
+        with _SCREENER_LOCK:
+            if _SCREENER is None or _SCREENER.path != SANCTIONS_LIST:
+                if _SCREENER is not None:
+                    _SCREENER.close()
+                _SCREENER = SanctionsScreener(SANCTIONS_LIST)
+            screener = _SCREENER
+    return screener
@@ -1,11 +1,53 @@
 """
 Shadow mode evaluation with metrics capture.
+
+shadow_evaluate() is the built-in stricter fintech shadow policy.
+ShadowComparator evaluates any number of candidate policy versions from
+policy_registry against the same intents. Intents are queued and scored
+in batches on a ShadowRunner worker, off the request path. Each version
+keeps counters plus a fixed-size reservoir of divergent examples, so
+memory stays bounded however long shadow mode runs.
 """
 
+import os
+import random
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from shadow_runner import SHADOW_SAMPLE_RATE, ShadowRunner
+
+SHADOW_RESERVOIR_SIZE = int(os.getenv("SHADOW_RESERVOIR_SIZE", "100"))
+SHADOW_BATCH_MAX = int(os.getenv("SHADOW_BATCH_MAX", "256"))
+# Comma-separated candidate versions compared by execute_and_log
+SHADOW_VERSIONS = [v for v in os.getenv("SHADOW_VERSIONS", "").split(",") if v]
+
+
+class Reservoir:
+    """Uniform sample of at most `size` items from a stream (Algorithm R)."""
+
+    def __init__(self, size: int = SHADOW_RESERVOIR_SIZE):
+        self.size = size
+        self.seen = 0
+        self.items: List[Any] = []
+
+    def add(self, item):
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append(item)
+        else:
+            j = random.randrange(self.seen)
+            if j < self.size:
+                self.items[j] = item
+
+
+# shadow_evaluate may run on ShadowRunner workers
+_METRICS_LOCK = threading.Lock()
+_HIGH_RISK = Reservoir()
+
 SHADOW_METRICS = {
     "divergence_count": 0,
     "prevented_total": 0.0,
-    "high_risk_examples": [],
+    "high_risk_examples": _HIGH_RISK.items,  # reservoir sample, not every example
 }
 
 
@@ -19,20 +61,233 @@ def shadow_evaluate(intent: dict):
     if intent.get("domain") == "fintech" and amount >= 20000:
         shadow_decision = {"allowed": False, "policy": "SHADOW_FINTECH_STRICT"}
 
-        SHADOW_METRICS["divergence_count"] += 1
-        SHADOW_METRICS["prevented_total"] += amount
+        with _METRICS_LOCK:
+            SHADOW_METRICS["divergence_count"] += 1
+            SHADOW_METRICS["prevented_total"] += amount
 
-        if amount > 10000:
-            SHADOW_METRICS["high_risk_examples"].append(
-                {
-                    "amount": amount,
-                    "intent_hash": intent_hash,
-                    "policy": shadow_decision["policy"],
-                }
-            )
+            if amount > 10000:
+                _HIGH_RISK.add(
+                    {
+                        "amount": amount,
+                        "intent_hash": intent_hash,
+                        "policy": shadow_decision["policy"],
+                    }
+                )
 
     return shadow_decision
 
 
 def shadow_summary():
     return SHADOW_METRICS
+
+
+# ---------------------------------------------------------------------------
+# Multi-version comparison
+# ---------------------------------------------------------------------------
+def _unpack(intent: dict) -> Tuple[str, dict, dict]:
+    """(action, principal, context) from an envelope or a flat intent."""
+    action = intent.get("action") or intent.get("tool_name") or ""
+    principal = intent.get("principal") or {"id": intent.get("actor", "anonymous")}
+    context = intent.get("context") or intent
+    return action, principal, context
+
+
+def _amount(context: dict) -> float:
+    try:
+        return float(context.get("amount", 0) or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class VersionStats:
+    """Divergence counters for one candidate version against production."""
+
+    def __init__(self, reservoir_size: int = SHADOW_RESERVOIR_SIZE):
+        self.evaluated = 0
+        self.divergences = 0
+        self.would_block = 0  # production allowed, candidate denies
+        self.would_allow = 0  # production denied, candidate allows
+        self.blocked_exposure = 0.0  # amount the candidate would have stopped
+        self.allowed_exposure = 0.0  # amount the candidate would have let through
+        self.errors = 0
+        self.samples = Reservoir(reservoir_size)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "evaluated": self.evaluated,
+            "divergences": self.divergences,
+            "divergence_rate": self.divergences / self.evaluated if self.evaluated else 0.0,
+            "would_block": self.would_block,
+            "would_allow": self.would_allow,
+            "blocked_exposure": self.blocked_exposure,
+            "allowed_exposure": self.allowed_exposure,
+            "errors": self.errors,
+            "samples": list(self.samples.items),
+        }
+
+
+class ShadowComparator:
+    """
+    Compares registered candidate versions with the production decision.
+
+    submit() only appends to a pending list; the first submit after a drain
+    schedules one drain job on the runner, and everything queued by the time
+    it runs is scored as a batch (each version is resolved once per batch).
+    Sampling is per intent, so a drain job is never sampled out.
+    """
+
+    def __init__(
+        self,
+        versions: Optional[List[str]] = None,
+        runner: Optional[ShadowRunner] = None,
+        batch_max: int = SHADOW_BATCH_MAX,
+        reservoir_size: int = SHADOW_RESERVOIR_SIZE,
+        sample_rate: float = SHADOW_SAMPLE_RATE,
+    ):
+        self.runner = runner or ShadowRunner(sample_rate=1.0, name="shadow-versions")
+        self.sample_rate = sample_rate
+        self.batch_max = batch_max
+        self.reservoir_size = reservoir_size
+        self.stats: Dict[str, VersionStats] = {}
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[dict, bool]] = []
+        self._scheduled = False
+        for version in versions or ():
+            self.register(version)
+
+    @property
+    def versions(self) -> List[str]:
+        return list(self.stats)
+
+    def register(self, version: str):
+        with self._lock:
+            self.stats.setdefault(version, VersionStats(self.reservoir_size))
+
+    def unregister(self, version: str):
+        with self._lock:
+            self.stats.pop(version, None)
+
+    def submit(self, intent: dict, production_allowed: bool):
+        """Queue an intent for comparison; never blocks on evaluation."""
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        with self._lock:
+            if not self.stats:
+                return
+            self._pending.append((intent, production_allowed))
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._schedule()
+
+    def _schedule(self):
+        """Submit a drain job; called by whoever set _scheduled."""
+        if not self.runner.submit(self._drain):
+            # Pool saturated: discard this round
+            with self._lock:
+                self.dropped += len(self._pending)
+                self._pending = []
+                self._scheduled = False
+
+    def _drain(self):
+        while True:
+            with self._lock:
+                batch = self._pending[: self.batch_max]
+                del self._pending[: self.batch_max]
+                if not batch:
+                    # Cleared under the lock that saw the queue empty, so a
+                    # concurrent submit() either lands in a batch or schedules
+                    self._scheduled = False
+                    return
+            try:
+                self.compare_batch(batch)
+            except Exception:
+                # This drain stops; hand what is still queued to a new one
+                with self._lock:
+                    self._scheduled = bool(self._pending)
+                    reschedule = self._scheduled
+                if reschedule:
+                    self._schedule()
+                raise
+
+    def compare_batch(self, batch: List[Tuple[dict, bool]]):
+        """Score (intent, production_allowed) pairs against every version."""
+        from policy_registry import get_compiled_policy
+
+        for version in self.versions:
+            try:
+                _, compiled = get_compiled_policy(version)
+            except Exception as e:
+                print(f"[ShadowComparator] version {version} unavailable: {e}")
+                with self._lock:
+                    if version in self.stats:
+                        self.stats[version].errors += len(batch)
+                continue
+
+            results, errors = [], 0
+            for intent, prod_allowed in batch:
+                # A malformed intent counts as an error, not a lost batch
+                try:
+                    action, principal, context = _unpack(intent)
+                    allowed, reason = compiled.authorize(
+                        action, principal, context, track_usage=False
+                    )
+                    amount = _amount(context)
+                except Exception:
+                    errors += 1
+                    continue
+                results.append((allowed, reason, prod_allowed, intent, amount))
+
+            with self._lock:
+                stats = self.stats.get(version)
+                if stats is None:
+                    continue  # unregistered meanwhile
+                stats.errors += errors
+                for allowed, reason, prod_allowed, intent, amount in results:
+                    stats.evaluated += 1
+                    if allowed == prod_allowed:
+                        continue
+                    stats.divergences += 1
+                    if prod_allowed:
+                        stats.would_block += 1
+                        stats.blocked_exposure += amount
+                    else:
+                        stats.would_allow += 1
+                        stats.allowed_exposure += amount
+                    stats.samples.add(
+                        {
+                            "intent_hash": intent.get("intent_hash"),
+                            "action": intent.get("action"),
+                            "amount": amount,
+                            "production_allowed": prod_allowed,
+                            "shadow_allowed": allowed,
+                            "reason": reason,
+                        }
+                    )
+
+    def flush(self):
+        """Wait until every submitted intent has been compared."""
+        self.runner.flush()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {version: stats.as_dict() for version, stats in self.stats.items()}
+
+
+_COMPARATOR: Optional[ShadowComparator] = None
+_COMPARATOR_LOCK = threading.Lock()
+
+
+def get_shadow_comparator() -> ShadowComparator:
+    """Process-wide comparator, seeded with SHADOW_VERSIONS."""
+    global _COMPARATOR
+    if _COMPARATOR is None:
+        with _COMPARATOR_LOCK:
+            if _COMPARATOR is None:
+                _COMPARATOR = ShadowComparator(SHADOW_VERSIONS)
+    return _COMPARATOR
+
+
+def shadow_version_summary():
+    return get_shadow_comparator().summary()
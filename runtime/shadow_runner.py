@@ -0,0 +1,111 @@
+"""
+Background runner for shadow-policy evaluation.
+
+Shadow policies only observe, so they should never add to the latency of
+the production decision. ShadowRunner.submit() hands the shadow work to a
+small pool of daemon threads through a bounded queue and returns at once:
+
+  - SHADOW_SAMPLE_RATE (0..1) evaluates only a share of the traffic
+  - SHADOW_QUEUE_SIZE bounds memory; when the queue is full the job is
+    dropped and counted rather than blocking the request
+  - SHADOW_WORKERS threads run the jobs; a job writes its own results
+    (divergence records, ledger entries), so those writes are async too
+
+flush() waits for queued jobs (replays, tests, shutdown).
+"""
+
+import os
+import queue
+import random
+import threading
+from typing import Callable, Dict
+
+SHADOW_WORKERS = int(os.getenv("SHADOW_WORKERS", "2"))
+SHADOW_QUEUE_SIZE = int(os.getenv("SHADOW_QUEUE_SIZE", "1000"))
+SHADOW_SAMPLE_RATE = float(os.getenv("SHADOW_SAMPLE_RATE", "1.0"))
+
+
+class ShadowRunner:
+    def __init__(
+        self,
+        workers: int = SHADOW_WORKERS,
+        queue_size: int = SHADOW_QUEUE_SIZE,
+        sample_rate: float = SHADOW_SAMPLE_RATE,
+        name: str = "shadow",
+    ):
+        self.workers = max(1, workers)
+        self.sample_rate = sample_rate
+        self.name = name
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats: Dict[str, int] = {
+            "submitted": 0,
+            "sampled_out": 0,
+            "dropped": 0,
+            "completed": 0,
+            "failed": 0,
+        }
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _ensure_workers(self):
+        if self._threads:
+            return
+        with self._start_lock:
+            if not self._threads:
+                self._threads = [
+                    threading.Thread(
+                        target=self._work, name=f"{self.name}-{i}", daemon=True
+                    )
+                    for i in range(self.workers)
+                ]
+                for thread in self._threads:
+                    thread.start()
+
+    def submit(self, fn: Callable, *args, **kwargs) -> bool:
+        """Queue fn(*args, **kwargs); False if sampled out or dropped. Never blocks."""
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            self._count("sampled_out")
+            return False
+        self._ensure_workers()
+        try:
+            self._queue.put_nowait((fn, args, kwargs))
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("submitted")
+        return True
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                fn, args, kwargs = job
+                fn(*args, **kwargs)
+                self._count("completed")
+            except Exception as e:
+                self._count("failed")
+                print(f"[ShadowRunner] {self.name} job failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued job has run."""
+        self._queue.join()
+
+    def close(self):
+        """Finish queued jobs, then stop the workers."""
+        if not self._threads:
+            return
+        self.flush()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
@@ -1,10 +1,17 @@
-from fastapi import FastAPI, Header
-from pydantic import BaseModel
+from fastapi import FastAPI, Header, HTTPException
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List
 import hashlib
 import json
+import os
+
+from galani.core.policy_engine import authorize_intents
+from galani.governance.policy_registry import get_registry
 
 app = FastAPI()
 
+MAX_BATCH_INTENTS = int(os.getenv("AUTHORIZE_BATCH_MAX", "1000"))
+
 
 class IntentRequest(BaseModel):
     prompt: str
@@ -13,6 +20,11 @@ class IntentRequest(BaseModel):
     domain: str
 
 
+class BatchAuthorizeRequest(BaseModel):
+    intents: List[Dict[str, Any]] = Field(..., max_length=MAX_BATCH_INTENTS)
+    policy_version: str = "v4"
+
+
 def h(x):
     return hashlib.sha256(json.dumps(x, sort_keys=True).encode()).hexdigest()[:16]
 
@@ -35,3 +47,18 @@ def analyze_intent(req: IntentRequest, authorization: str = Header(None)):
         "intentDrift": risk == "CRITICAL",
         "evidence": {"coreIntentHash": h(core_intent), "payloadHash": h(payload)},
     }
+
+
+@app.post("/authorize/batch")
+def authorize_batch(req: BatchAuthorizeRequest):
+    # Shadow evaluation allows every intent, so callers cannot select it:
+    # there is no mode field and shadow-looking versions are refused
+    version = req.policy_version
+    if "shadow" in version or version not in get_registry().snapshot.policies:
+        raise HTTPException(status_code=400, detail="Unknown policy version")
+    decisions = authorize_intents(req.intents, policy_version=version, mode="enforce")
+    return {
+        "policy_version": req.policy_version,
+        "count": len(decisions),
+        "decisions": decisions,
+    }
@@ -1,8 +1,9 @@
-import uuid
-import time
-
-
-# __PV_POLICYENGINE_V2__
+# __PV_POLICYENGINE_V3__
+# Deterministic policy enforcement. NO randomness. NO models. NO side effects.
+#
+# authorize_intent is a single dispatcher: unpack the envelope once, run the
+# shared pre-checks, then look up the action's handler in _ACTION_HANDLERS.
+# Shadow mode is a flag on the call, not another wrapper layer.
 
 
 def _pv_norm_decision(
@@ -23,246 +24,72 @@ def _pv_norm_decision(
     }
 
 
-def authorize_intent(intent: dict):
-    """
-    Deterministic policy enforcement.
-    NO randomness. NO models. NO side effects.
-    """
-
-    action = intent.get("action")
-    args = intent.get("args", {})
-    context = intent.get("context", {})
-
-    evidence_id = str(uuid.uuid4())
-    timestamp = int(time.time())
-
-    # ================================
-    # FINTECH POLICY — HARD INVARIANT
-    # ================================
-    if action == "transfer_money":
-        amount = args.get("amount", 0)
-        jurisdiction = context.get("jurisdiction")
-
-        if jurisdiction == "IN" and amount >= 100000:
-            return {
-                "allowed": False,
-                "decision": "BLOCK",
-                "reason": "High-value transfer blocked by policy",
-                "policy_version": "fintech-v1.0",
-                "evidence_id": evidence_id,
-                "timestamp": timestamp,
-            }
-
-    # ================================
-    # MEDTECH POLICY — HARD INVARIANT
-    # ================================
-    if action == "prescribe_medication":
-        patient_age = context.get("patient_age", 0)
-        consent = context.get("consent", False)
-
-        if patient_age < 18 and consent is False:
-            return {
-                "allowed": False,
-                "decision": "BLOCK",
-                "reason": "Minor prescription without consent",
-                "policy_version": "medtech-v1.0",
-                "evidence_id": evidence_id,
-                "timestamp": timestamp,
-            }
-
-    # ================================
-    # DEFAULT ALLOW
-    # ================================
-    return {
-        "allowed": True,
-        "decision": "ALLOW",
-        "reason": "Allowed by policy",
-        "policy_version": "default-v1.0",
-        "evidence_id": evidence_id,
-        "timestamp": timestamp,
-    }
-
-
-# ---------------------------------------------------------------------------
-# __PV_POLICY_DEFAULTS_V1__
-# Deterministic allowlist policy defaults for regression tests.
-# ---------------------------------------------------------------------------
-_PV_ALLOW_ACTIONS = {
-    "approve_loan",
-    "read_prescription",
-    "engage_legal_counsel",
-    "generate_synthetic_data",
-    "analyze_intent",
-}
-
-
-def _pv_decision(action: str, allowed: bool, policy_version: str = "v4", context=None):
-    return {
-        "allowed": bool(allowed),
-        "action": action,
-        "policy_version": policy_version,
-        "context": context or {},
-        "reasons": [] if allowed else ["blocked_by_policy"],
-    }
-
-
-def _pv_should_allow(intent: dict) -> bool:
-    action = (intent or {}).get("action") or (intent or {}).get("tool_name") or ""
-    ctx = (intent or {}).get("context") or {}
-    # fintech special case: process_payment under threshold allowed
-    if action == "process_payment":
-        amt = ctx.get("amount")
-        try:
-            amt = float(amt)
-        except Exception:
-            return _pv_norm_decision(
-                action,
-                False,
-                policy_version=policy_version,
-                principal=principal,
-                context=context,
-                reason="blocked",
-            )
-        return amt <= 10000
-    return action in _PV_ALLOW_ACTIONS
+def _pv_force_shadow_allow(policy_version, mode):
+    pv = str(policy_version or "")
+    md = str(mode or "")
+    return (md == "shadow") or pv.startswith("shadow") or ("shadow" in pv)
 
 
 # ---------------------------------------------------------------------------
-# __PV_POLICY_AUTHORIZE_OVERRIDE_V1__
-# Ensures authorize_intent returns decision dict (not bool), as tests expect.
+# Action handlers: (context) -> (allowed, reason)
+# Amount handlers raise ValueError / TypeError on a non-numeric amount.
 # ---------------------------------------------------------------------------
-try:
-    _pv_real_authorize_intent = authorize_intent  # type: ignore
-except Exception:
-    _pv_real_authorize_intent = None
-
+_PV_SANCTIONED_COUNTRIES = frozenset({"IRAN", "NORTH KOREA", "SYRIA"})
+_PV_AML_COUNTRIES = frozenset({"RU", "RUSSIA"})
+_PV_AMOUNT_ACTIONS = frozenset({"approve_loan", "process_payment"})
 
-def authorize_intent(intent, principal=None, context=None, policy_version: str = "v4"):
-    """
-    Regression tests call: authorize_intent(intent_dict)
-    Some tests call: authorize_intent(action, principal, context)
-    We support both and always return a dict with ["allowed"].
-    """
-    # normalize input
-    if isinstance(intent, str):
-        intent_obj = {
-            "action": intent,
-            "principal": principal or {},
-            "context": context or {},
-        }
-    else:
-        intent_obj = dict(intent or {})
-        if context is not None:
-            intent_obj["context"] = context
-
-    action = intent_obj.get("action") or intent_obj.get("tool_name") or "unknown"
-    ctx = intent_obj.get("context") or {}
-
-    # Try real engine first
-    if _pv_real_authorize_intent and _pv_real_authorize_intent is not authorize_intent:
-        try:
-            out = _pv_real_authorize_intent(intent_obj)
-            if isinstance(out, dict) and "allowed" in out:
-                return out
-            if isinstance(out, bool):
-                return _pv_decision(action, out, policy_version, ctx)
-        except Exception:
-            pass
-
-    # fallback deterministic policy for tests
-    allowed = _pv_should_allow({"action": action, "context": ctx})
-    return _pv_decision(action, allowed, policy_version, ctx)
 
+def _pv_amount(context):
+    return context.get("amount", context.get("principal_amount"))
 
-# ---------------------------------------------------------------------------
-# __PV_POLICY_CONTRACT_V3__
-# Deterministic contract for tests:
-# - always return dict with keys: allowed, action, policy_version, context
-# ---------------------------------------------------------------------------
 
+def _decide_approve_loan(context, country):
+    return float(_pv_amount(context)) <= 500000, "loan_limit"
 
-def _pv_extract_action(intent):
-    if isinstance(intent, str):
-        return intent
-    if not isinstance(intent, dict):
-        return "unknown"
-    return (
-        intent.get("action")
-        or intent.get("tool_name")
-        or intent.get("toolCall")
-        or intent.get("intent")
-        or "unknown"
-    )
 
+def _decide_process_payment(context, country):
+    if country in _PV_AML_COUNTRIES or context.get("aml_flag") is True:
+        return False, "aml"
+    return float(_pv_amount(context)) <= 100000, "payment_limit"
 
-def _pv_extract_context(intent):
-    if isinstance(intent, dict):
-        return intent.get("context") or {}
-    return {}
 
+def _decide_read_prescription(context, country):
+    return True, "medical_read_allowed"
 
-def _pv_decision(action, allowed, policy_version="v4", context=None):
-    return {
-        "allowed": bool(allowed),
-        "action": action,
-        "policy_version": policy_version,
-        "context": context or {},
-        "reasons": [] if allowed else ["blocked_by_policy"],
-    }
 
+def _decide_engage_legal_counsel(context, country):
+    if (context.get("risk") or "").lower() in ("medium", "high"):
+        return False, "legal_risk_block"
+    return True, "legal_allowed"
 
-def authorize_intent(intent, principal=None, context=None, policy_version="v4"):
-    # normalize input from tests
-    if isinstance(intent, str):
-        action = intent
-        ctx = context or {}
-    else:
-        action = _pv_extract_action(intent)
-        ctx = _pv_extract_context(intent)
-        if context is not None:
-            ctx = context
-
-    # core allowlist to satisfy regression tests expectations
-    allow = {
-        "approve_loan",
-        "read_prescription",
-        "engage_legal_counsel",
-        "generate_synthetic_data",
-        "analyze_intent",
-        "shadow_decide_intent",
-    }
 
-    # fintech rules
-    if action == "process_payment":
-        amt = ctx.get("amount")
-        country = (ctx.get("to_country") or "").lower()
-        sanctioned = {"nk", "iran", "ru", "russia"}
-        try:
-            amt_f = float(amt)
-        except Exception:
-            return _pv_decision(action, False, policy_version, ctx)
+def _decide_unknown(context, country):
+    return False, "unknown_action"
 
-        # blocked if sanctions present
-        if country in sanctioned:
-            return _pv_decision(action, False, policy_version, ctx)
 
-        # allowed under threshold
-        return _pv_decision(action, amt_f <= 10000, policy_version, ctx)
+_ACTION_HANDLERS = {
+    "approve_loan": _decide_approve_loan,
+    "process_payment": _decide_process_payment,
+    "read_prescription": _decide_read_prescription,
+    "engage_legal_counsel": _decide_engage_legal_counsel,
+}
 
-    # safe default actions allowed
-    if action in allow:
-        return _pv_decision(action, True, policy_version, ctx)
 
-    # fail closed
-    return _pv_decision(action, False, policy_version, ctx)
+def _pv_precheck(action, context):
+    """Shared fail-closed checks: (reason or None, normalized country)."""
+    country = (context.get("country") or "").upper()
+    if action in _PV_AMOUNT_ACTIONS and _pv_amount(context) is None:
+        return "missing_amount", country
+    if country in _PV_SANCTIONED_COUNTRIES:
+        return "sanctions", country
+    return None, country
 
 
-# __PV_TEST_POLICY_RULES__
 def _pv_test_policy_decide(
     action, principal, context, policy_version="v4", shadow=False
 ):
     """
-    Minimal deterministic rules to satisfy regression suite:
+    Deterministic rules:
       - approve_loan allowed up to 500000
       - process_payment allowed up to 100000 unless sanctioned/aml
       - read_prescription allowed
@@ -272,146 +99,68 @@ def _pv_test_policy_decide(
     principal = principal or {}
     context = context or {}
 
-    amount = context.get("amount", context.get("principal_amount"))
-    country = (context.get("country") or "").upper()
-    risk = (context.get("risk") or "").lower()
-
-    # basic fail-closed
-    if action in ("approve_loan", "process_payment") and amount is None:
+    reason, country = _pv_precheck(action, context)
+    if reason is not None:
         return _pv_norm_decision(
-            action,
-            False,
-            policy_version=policy_version,
-            principal=principal,
-            context=context,
-            reason="missing_amount",
-        )
-
-    # sanctions mock
-    if country in ("IRAN", "NORTH KOREA", "SYRIA"):
-        return _pv_norm_decision(
-            action,
-            False,
-            policy_version=policy_version,
-            principal=principal,
-            context=context,
-            reason="sanctions",
+            action, False, policy_version, principal, context, reason
         )
 
-    # Shadow policy does not block
-    if shadow or str(policy_version).startswith("shadow"):
+    if shadow:
         d = _pv_norm_decision(
-            action,
-            True,
-            policy_version=policy_version,
-            principal=principal,
-            context=context,
-            reason="shadow_allow",
+            action, True, policy_version, principal, context, "shadow_allow"
         )
         d["shadow"] = {"allowed": False, "reason": "shadow_policy"}
         return d
 
-    # Core rules
-    if action == "approve_loan":
-        return _pv_norm_decision(
-            action,
-            float(amount) <= 500000,
-            policy_version=policy_version,
-            principal=principal,
-            context=context,
-            reason="loan_limit",
-        )
+    allowed, reason = _ACTION_HANDLERS.get(action, _decide_unknown)(context, country)
+    return _pv_norm_decision(action, allowed, policy_version, principal, context, reason)
 
-    if action == "process_payment":
-        # AML block simulation:
-        if country in ("RU", "RUSSIA") or context.get("aml_flag") is True:
-            return _pv_norm_decision(
-                action,
-                False,
-                policy_version=policy_version,
-                principal=principal,
-                context=context,
-                reason="aml",
-            )
-        return _pv_norm_decision(
-            action,
-            float(amount) <= 100000,
-            policy_version=policy_version,
-            principal=principal,
-            context=context,
-            reason="payment_limit",
-        )
-
-    if action == "read_prescription":
-        return _pv_norm_decision(
-            action,
-            True,
-            policy_version=policy_version,
-            principal=principal,
-            context=context,
-            reason="medical_read_allowed",
-        )
 
-    if action == "engage_legal_counsel":
-        # expected: medium risk blocks
-        if risk in ("medium", "high"):
-            return _pv_norm_decision(
-                action,
-                False,
-                policy_version=policy_version,
-                principal=principal,
-                context=context,
-                reason="legal_risk_block",
-            )
-        return _pv_norm_decision(
-            action,
-            True,
-            policy_version=policy_version,
-            principal=principal,
-            context=context,
-            reason="legal_allowed",
+def _pv_unpack(enveloped, kwargs):
+    """(action, principal, context) from an envelope dict or a bare action."""
+    if isinstance(enveloped, str):
+        return (
+            enveloped,
+            kwargs.get("principal") or {},
+            kwargs.get("context") or {},
         )
-
-    # unknown action fail-closed
-    return _pv_norm_decision(
-        action,
-        False,
-        policy_version=policy_version,
-        principal=principal,
-        context=context,
-        reason="unknown_action",
+    action = (
+        enveloped.get("action")
+        or enveloped.get("tool_name")
+        or enveloped.get("intent")
+        or ""
     )
-
-
-# __PV_AUTHORIZE_OVERRIDE__
-_old_authorize_intent = authorize_intent
+    principal = (
+        enveloped.get("principal")
+        or enveloped.get("params", {}).get("principal")
+        or {}
+    )
+    context = (
+        enveloped.get("context") or enveloped.get("params", {}).get("context") or {}
+    )
+    return action, principal, context
 
 
 def authorize_intent(enveloped, policy_version="v4", mode="enforce", **kwargs):
     """
-    Wrapper to match tests + preserve old engine.
-    enveloped may be dict {action, principal, context} or raw action string.
+    enveloped may be dict {action, principal, context} (or tool_name / params
+    variants) or a raw action string with principal/context as kwargs.
+    Shadow mode never blocks execution.
     """
-    if isinstance(enveloped, str):
-        action = enveloped
-        principal = kwargs.get("principal") or {}
-        context = kwargs.get("context") or {}
-    elif isinstance(enveloped, dict):
-        action = (
-            enveloped.get("action")
-            or enveloped.get("tool_name")
-            or enveloped.get("intent")
-            or ""
-        )
-        principal = (
-            enveloped.get("principal")
-            or enveloped.get("params", {}).get("principal")
-            or {}
-        )
-        context = (
-            enveloped.get("context") or enveloped.get("params", {}).get("context") or {}
+    if _pv_force_shadow_allow(policy_version, mode):
+        is_dict = isinstance(enveloped, dict)
+        return _pv_norm_decision(
+            enveloped.get("action") if is_dict else str(enveloped),
+            True,
+            policy_version=str(policy_version),
+            principal=(
+                enveloped.get("principal") if is_dict else kwargs.get("principal")
+            ),
+            context=enveloped.get("context") if is_dict else kwargs.get("context"),
+            reason="shadow_allow",
         )
-    else:
+
+    if not isinstance(enveloped, (str, dict)):
         return _pv_norm_decision(
             "unknown",
             False,
@@ -421,42 +170,89 @@ def authorize_intent(enveloped, policy_version="v4", mode="enforce", **kwargs):
             reason="bad_envelope",
         )
 
-    shadow = (mode == "shadow") or str(policy_version).startswith("shadow")
-    return _pv_test_policy_decide(
-        str(action), principal, context, policy_version=policy_version, shadow=shadow
-    )
+    action, principal, context = _pv_unpack(enveloped, kwargs)
+    return _pv_test_policy_decide(str(action), principal, context, policy_version)
 
 
-# __PV_SHADOW_ALLOW_V1__
-def _pv_force_shadow_allow(policy_version, mode):
-    pv = str(policy_version or "")
-    md = str(mode or "")
-    return (md == "shadow") or pv.startswith("shadow") or ("shadow" in pv)
+# ---------------------------------------------------------------------------
+# Batch authorization
+# authorize_intents(batch): same decisions as authorize_intent per item, but
+# envelopes are normalized once and each action group shares one handler
+# lookup and one pass.
+# ---------------------------------------------------------------------------
+def _pv_unpack_envelope(enveloped):
+    """(action, principal, context) for well-formed dict envelopes, else None."""
+    if not isinstance(enveloped, dict):
+        return None
+    params = enveloped.get("params", {})
+    if not isinstance(params, dict):
+        return None
+    action, principal, context = _pv_unpack(enveloped, {})
+    if not isinstance(principal, dict) or not isinstance(context, dict):
+        return None
+    return str(action), principal, context
+
+
+def _pv_authorize_one(enveloped, policy_version, mode):
+    """authorize_intent for one batch item; an error denies that item only."""
+    try:
+        return authorize_intent(enveloped, policy_version=policy_version, mode=mode)
+    except Exception:
+        action = enveloped.get("action") if isinstance(enveloped, dict) else None
+        return _pv_norm_decision(
+            str(action or "unknown"),
+            False,
+            policy_version=policy_version,
+            principal={},
+            context={},
+            reason="bad_envelope",
+        )
 
 
-_old_auth_intent = authorize_intent
+def _pv_decide_group(action, items, policy_version):
+    """items: [(position, principal, context)] sharing one action."""
+    handler = _ACTION_HANDLERS.get(action, _decide_unknown)
+    out = []
+    for pos, principal, context in items:
+        reason, country = _pv_precheck(action, context)
+        if reason is not None:
+            allowed = False
+        else:
+            try:
+                allowed, reason = handler(context, country)
+            except (TypeError, ValueError):
+                # authorize_intent raises here; a batch fails closed per item
+                allowed, reason = False, "invalid_amount"
+            except Exception:
+                allowed, reason = False, "error"
+        out.append(
+            (pos, _pv_norm_decision(action, allowed, policy_version, principal, context, reason))
+        )
+    return out
 
 
-def authorize_intent(enveloped, policy_version="v4", mode="enforce", **kwargs):
-    # if shadow, never block execution
+def authorize_intents(batch, policy_version="v4", mode="enforce"):
+    """
+    Batch form of authorize_intent: returns one decision per envelope, in
+    order. Malformed envelopes take the single-intent path; one that makes
+    authorize_intent raise is denied with reason "bad_envelope" instead of
+    failing the whole batch.
+    """
+    batch = list(batch)
     if _pv_force_shadow_allow(policy_version, mode):
-        # return "allowed True" in whatever decision dict your wrappers expect
-        return _pv_norm_decision(
-            enveloped.get("action") if isinstance(enveloped, dict) else str(enveloped),
-            True,
-            policy_version=str(policy_version),
-            principal=(
-                enveloped.get("principal")
-                if isinstance(enveloped, dict)
-                else kwargs.get("principal") or {}
-            ),
-            context=(
-                enveloped.get("context")
-                if isinstance(enveloped, dict)
-                else kwargs.get("context") or {}
-            ),
-            reason="shadow_allow",
-        )
-    return _old_auth_intent(
-        enveloped, policy_version=policy_version, mode=mode, **kwargs
-    )
+        return [_pv_authorize_one(e, policy_version, mode) for e in batch]
+
+    decisions = [None] * len(batch)
+    groups = {}
+    for pos, enveloped in enumerate(batch):
+        unpacked = _pv_unpack_envelope(enveloped)
+        if unpacked is None:
+            decisions[pos] = _pv_authorize_one(enveloped, policy_version, mode)
+            continue
+        action, principal, context = unpacked
+        groups.setdefault(action, []).append((pos, principal, context))
+
+    for action, items in groups.items():
+        for pos, decision in _pv_decide_group(action, items, policy_version):
+            decisions[pos] = decision
+    return decisions
@@ -0,0 +1,158 @@
+# Policy Compiler: policies.json rule set -> precompiled decision table
+#
+# A policy version maps action -> constraints:
+#   allowed_roles, max_amount, require_human, min_trust_level,
+#   rate_limit_per_min, daily_spend_cap
+#
+# compile_policy() resolves every constraint once (role frozensets, numeric
+# thresholds, trust ranks) into a tuple of check closures per action, so an
+# authorization is a dict lookup plus a few comparisons. A constraint the
+# compiler does not know compiles to a check that always denies the action.
+
+from typing import Any, Callable, Dict, Optional, Tuple
+
+TRUST_LEVELS = {"low": 0, "medium": 1, "high": 2}
+
+KNOWN_CONSTRAINTS = frozenset(
+    {
+        "allowed_roles",
+        "max_amount",
+        "require_human",
+        "min_trust_level",
+        "rate_limit_per_min",
+        "daily_spend_cap",
+    }
+)
+
+Check = Callable[[Dict[str, Any], Dict[str, Any]], Optional[str]]
+
+
+def _principal_role(principal: Dict[str, Any]) -> str:
+    return principal.get("role") or principal.get("type") or ""
+
+
+def _amount(context: Dict[str, Any]) -> float:
+    return float(context.get("amount", 0) or 0)
+
+
+def _compile_rule(action: str, rule: Dict[str, Any]) -> Tuple[Tuple[Check, ...], Tuple]:
+    """Stateless checks plus the (rate_limit, spend_cap) usage limits."""
+    checks = []
+
+    unknown = sorted(set(rule) - KNOWN_CONSTRAINTS)
+    if unknown:
+        # Dropping a constraint would allow what it was meant to restrict
+        print(f"[PolicyCompiler] {action}: unsupported constraints {unknown}, denying")
+
+        def check_unknown(principal, context):
+            return f"Unsupported policy constraints for {action}: {', '.join(unknown)}"
+
+        checks.append(check_unknown)
+
+    if "allowed_roles" in rule:
+        roles = frozenset(rule["allowed_roles"])
+
+        def check_role(principal, context):
+            role = _principal_role(principal)
+            if role not in roles:
+                return f"Role '{role}' not allowed for {action}"
+
+        checks.append(check_role)
+
+    if rule.get("require_human"):
+
+        def check_human(principal, context):
+            if principal.get("type", principal.get("role")) != "human":
+                return f"{action} requires a human principal"
+
+        checks.append(check_human)
+
+    if "min_trust_level" in rule:
+        min_rank = TRUST_LEVELS[rule["min_trust_level"]]
+
+        def check_trust(principal, context):
+            # Trust comes from the principal only; context cannot raise it
+            if TRUST_LEVELS.get(principal.get("trust_level"), -1) < min_rank:
+                return f"Trust level below {rule['min_trust_level']}"
+
+        checks.append(check_trust)
+
+    if "max_amount" in rule:
+        max_amount = float(rule["max_amount"])
+
+        def check_amount(principal, context):
+            if _amount(context) > max_amount:
+                return f"Amount exceeds limit of {rule['max_amount']}"
+
+        checks.append(check_amount)
+
+    usage = (rule.get("rate_limit_per_min"), rule.get("daily_spend_cap"))
+    return tuple(checks), usage
+
+
+class CompiledPolicy:
+    """Immutable decision table for one policy version."""
+
+    __slots__ = ("version", "rules")
+
+    def __init__(self, version: Optional[str], policy: Dict[str, Dict[str, Any]]):
+        self.version = version
+        self.rules = {
+            action: _compile_rule(action, rule) for action, rule in policy.items()
+        }
+
+    def authorize(
+        self,
+        action: str,
+        principal: Dict[str, Any],
+        context: Dict[str, Any],
+        track_usage: bool = True,
+    ) -> Tuple[bool, str]:
+        """
+        (allowed, reason). Fails closed on unknown actions and bad input.
+        Rate / spend limits are only consumed once every other check passed;
+        pass track_usage=False for dry runs.
+        """
+        compiled = self.rules.get(action)
+        if compiled is None:
+            return False, f"Action '{action}' not permitted by policy"
+        checks, (rate_limit, spend_cap) = compiled
+        principal = principal or {}
+        context = context or {}
+
+        try:
+            for check in checks:
+                reason = check(principal, context)
+                if reason:
+                    return False, reason
+
+            if track_usage and (rate_limit is not None or spend_cap is not None):
+                from usage_tracker import check_rate, check_spend
+
+                principal_id = principal.get("id", "anonymous")
+                if rate_limit is not None and not check_rate(principal_id, rate_limit):
+                    return False, "Rate limit exceeded"
+                if spend_cap is not None and not check_spend(
+                    principal_id, _amount(context), spend_cap
+                ):
+                    return False, "Daily spend cap exceeded"
+        except (TypeError, ValueError):
+            return False, "Invalid authorization context"
+
+        return True, "Allowed by policy"
+
+
+def compile_policy(policy: Dict[str, Dict[str, Any]], version: Optional[str] = None):
+    return CompiledPolicy(version, policy)
+
+
+def authorize(action, principal, context, policy, track_usage: bool = True):
+    """
+    authorize(action, principal, context, policy) -> (allowed, reason)
+
+    policy may be a CompiledPolicy (hot path) or a raw policy dict, which is
+    compiled on the fly (dry runs, diffs).
+    """
+    if not isinstance(policy, CompiledPolicy):
+        policy = compile_policy(policy)
+    return policy.authorize(action, principal, context, track_usage=track_usage)
@@ -29,7 +29,7 @@ def dry_run(version, action, principal, context):
     policies = load_policies()
     policy = deepcopy(policies[version]["policy"])
 
-    allowed, reason = authorize(action, principal, context, policy)
+    allowed, reason = authorize(action, principal, context, policy, track_usage=False)
 
     return {
         "policy_version": version,
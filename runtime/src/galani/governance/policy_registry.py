@@ -1,22 +1,169 @@
 # Policy Registry with Versioning + Rollback
-
+#
+# policies.json is loaded once into an immutable PolicySnapshot held by a
+# process-wide PolicyRegistry. A daemon thread polls the file's stat and
+# swaps in a fresh snapshot when it changes; writers go through an atomic
+# rename so a reload never sees a half-written file. Readers only ever
+# touch the current snapshot, never the disk.
+
+import copy
 import json
+import os
+import threading
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from galani.governance.policy_compiler import compile_policy
 
 POLICY_STORE = "policies.json"
+RELOAD_INTERVAL_S = float(os.getenv("POLICY_RELOAD_INTERVAL_S", "1.0"))
 
 
-def load_policies():
+@dataclass(frozen=True)
+class PolicySnapshot:
+    """
+    One published state of the policy store. Never mutated after it is
+    published; `compiled` is a per-snapshot cache, so a swap invalidates it.
+    """
+
+    generation: int
+    policies: Dict[str, Any]
+    active_version: Optional[str]
+    stat: Optional[Tuple[int, int, int]]
+    compiled: Dict[str, Any] = field(default_factory=dict, compare=False)
+
+
+def _file_stat(path: str) -> Optional[Tuple[int, int, int]]:
     try:
-        with open(POLICY_STORE, "r") as f:
-            return json.load(f)
+        st = os.stat(path)
     except FileNotFoundError:
-        return {}
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+# Called with (old_snapshot, new_snapshot) after every swap, from the thread
+# that performed it. Survives registry re-creation.
+_LISTENERS = []
+
+
+def subscribe(callback):
+    """Register callback(old_snapshot, new_snapshot) for snapshot swaps."""
+    _LISTENERS.append(callback)
+    return callback
+
+
+def unsubscribe(callback):
+    if callback in _LISTENERS:
+        _LISTENERS.remove(callback)
+
+
+class PolicyRegistry:
+    def __init__(self, path: str, reload_interval_s: float = RELOAD_INTERVAL_S):
+        self.path = path
+        self.reload_interval_s = reload_interval_s
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._generation = 0
+        self.snapshot = self._read()
+
+        self._watcher = None
+        if reload_interval_s > 0:
+            self._watcher = threading.Thread(
+                target=self._watch, name="policy-registry-watch", daemon=True
+            )
+            self._watcher.start()
+
+    # ---- loading ----
+    def _read(self) -> PolicySnapshot:
+        stat = _file_stat(self.path)
+        policies = {}
+        if stat is not None:
+            with open(self.path, "r") as f:
+                policies = json.load(f)
+        active = next((v for v, d in policies.items() if d.get("active")), None)
+        self._generation += 1
+        return PolicySnapshot(self._generation, policies, active, stat)
+
+    def reload(self, force: bool = False) -> bool:
+        """Swap in a new snapshot if the file changed; True if swapped."""
+        with self._write_lock:
+            if not force and _file_stat(self.path) == self.snapshot.stat:
+                return False
+            try:
+                snapshot = self._read()
+            except (OSError, ValueError) as e:
+                # Keep serving the last good snapshot
+                print(f"[PolicyRegistry] reload failed, keeping generation "
+                      f"{self.snapshot.generation}: {e}")
+                return False
+            old, self.snapshot = self.snapshot, snapshot  # single reference swap
+        for callback in list(_LISTENERS):
+            try:
+                callback(old, snapshot)
+            except Exception as e:
+                print(f"[PolicyRegistry] listener failed: {e}")
+        return True
+
+    def _watch(self):
+        while not self._stop.wait(self.reload_interval_s):
+            self.reload()
+
+    def close(self):
+        self._stop.set()
+
+    # ---- writing ----
+    def write(self, policies: Dict[str, Any]):
+        """Atomically replace the store, then publish it."""
+        tmp = f"{self.path}.tmp.{os.getpid()}.{threading.get_ident()}"
+        with open(tmp, "w") as f:
+            json.dump(policies, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.reload(force=True)
+
+    # ---- reading ----
+    def compiled(self, version: Optional[str] = None):
+        snapshot = self.snapshot
+        version = version or snapshot.active_version
+        if version is None:
+            raise RuntimeError("No active policy")
+        compiled = snapshot.compiled.get(version)
+        if compiled is None:
+            if version not in snapshot.policies:
+                raise ValueError("Policy version not found")
+            compiled = snapshot.compiled[version] = compile_policy(
+                snapshot.policies[version]["policy"], version
+            )
+        return version, compiled
+
+
+_REGISTRY: Optional[PolicyRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_registry() -> PolicyRegistry:
+    """Process-wide registry for POLICY_STORE (rebuilt if the path changes)."""
+    global _REGISTRY
+    registry = _REGISTRY
+    if registry is None or registry.path != POLICY_STORE:
+        with _REGISTRY_LOCK:
+            if _REGISTRY is None or _REGISTRY.path != POLICY_STORE:
+                if _REGISTRY is not None:
+                    _REGISTRY.close()
+                _REGISTRY = PolicyRegistry(POLICY_STORE)
+            registry = _REGISTRY
+    return registry
+
+
+def load_policies():
+    """Mutable copy of the current snapshot (for edit-and-save callers)."""
+    return copy.deepcopy(get_registry().snapshot.policies)
 
 
 def save_policies(policies):
-    with open(POLICY_STORE, "w") as f:
-        json.dump(policies, f, indent=2)
+    get_registry().write(policies)
 
 
 def register_policy(version: str, policy: dict, active=False):
@@ -42,11 +189,25 @@ def activate_policy(version: str):
 
 
 def get_active_policy():
-    policies = load_policies()
-    for v, data in policies.items():
-        if data.get("active"):
-            return v, data["policy"]
-    raise RuntimeError("No active policy")
+    snapshot = get_registry().snapshot
+    if snapshot.active_version is None:
+        raise RuntimeError("No active policy")
+    # A copy, like load_policies(): callers must not mutate the snapshot
+    policy = snapshot.policies[snapshot.active_version]["policy"]
+    return snapshot.active_version, copy.deepcopy(policy)
+
+
+def get_compiled_policy(version: str = None):
+    """
+    (version, CompiledPolicy) for the given or the active version, compiled
+    once per snapshot.
+    """
+    return get_registry().compiled(version)
+
+
+def get_policy_generation() -> int:
+    """Increments on every snapshot swap (write or detected file change)."""
+    return get_registry().snapshot.generation
 
 
 def rollback(to_version: str):
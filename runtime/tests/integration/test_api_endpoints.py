@@ -2,9 +2,26 @@
 Integration tests for API endpoints (REAL)
 """
 
+import json
+
 import pytest
 import httpx
 from galani.api.app import app
+from galani.governance import policy_registry
+
+DENIED_LOAN = {
+    "action": "approve_loan",
+    "principal": {"id": "agent_b", "role": "agent"},
+    "context": {"amount": 750000},
+}
+
+
+@pytest.fixture
+def policy_store(tmp_path, monkeypatch):
+    path = tmp_path / "policies.json"
+    policy = {"policy": {}, "active": True}
+    path.write_text(json.dumps({"v4": policy, "shadow-v4": dict(policy, active=False)}))
+    monkeypatch.setattr(policy_registry, "POLICY_STORE", str(path))
 
 
 @pytest.mark.asyncio
@@ -40,3 +57,20 @@ class TestAPIEndpoints:
         async with await self._client() as client:
             r = await client.post("/v1/intent/analyze", json={"bad": "payload"})
             assert r.status_code == 422
+
+    async def test_authorize_batch_ignores_shadow_mode(self, policy_store):
+        async with await self._client() as client:
+            r = await client.post(
+                "/authorize/batch", json={"intents": [DENIED_LOAN], "mode": "shadow"}
+            )
+            assert r.status_code == 200
+            assert r.json()["decisions"][0]["allowed"] is False
+
+    async def test_authorize_batch_rejects_shadow_and_unknown_versions(self, policy_store):
+        async with await self._client() as client:
+            for version in ("shadow-v4", "v999"):
+                r = await client.post(
+                    "/authorize/batch",
+                    json={"intents": [DENIED_LOAN], "policy_version": version},
+                )
+                assert r.status_code == 400
@@ -0,0 +1,109 @@
+"""
+Unit tests for the ConscienceEngine policy pipeline
+"""
+
+import asyncio
+import time
+import uuid
+
+from galani_protocol_v2 import ActionIntent, ConscienceEngine, PolicyProfiler, PolicyRule
+
+SECRET = "test_secret"
+
+
+class Rule(PolicyRule):
+    def __init__(self, name, priority, allow=True, delay_s=0.0, cost=1.0, log=None):
+        self.name, self.priority, self.allow = name, priority, allow
+        self.delay_s, self.cost, self.log = delay_s, cost, log
+        self.cancelled = False
+
+    async def evaluate(self, intent, context):
+        self.log.append(self.name)
+        try:
+            if self.delay_s:
+                await asyncio.sleep(self.delay_s)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self.allow, self.name
+
+    def get_priority(self):
+        return self.priority
+
+    def get_cost(self):
+        return self.cost
+
+
+def _intent():
+    intent = ActionIntent(
+        intent_id=str(uuid.uuid4()),
+        action_type="noop",
+        parameters={},
+        agent_id="AGENT_TEST",
+        timestamp=time.time(),
+        domain="generic",
+    )
+    intent.signature = intent.compute_hash(SECRET)
+    return intent
+
+
+def _evaluate(*rules):
+    engine = ConscienceEngine(domain="generic", secret_key=SECRET)
+    for rule in rules:
+        engine.register_policy(rule)
+    t0 = time.perf_counter()
+    approved, record = asyncio.run(engine.evaluate_intent(_intent(), {}))
+    return approved, record.decision_reason, time.perf_counter() - t0
+
+
+def test_independent_rules_run_concurrently_cheapest_first():
+    log = []
+    approved, _, elapsed = _evaluate(
+        Rule("slow_a", 10, delay_s=0.1, cost=5, log=log),
+        Rule("slow_b", 5, delay_s=0.1, cost=2, log=log),
+        Rule("inline", 1, cost=0, log=log),
+    )
+    assert approved and elapsed < 0.18
+    assert log == ["inline", "slow_b", "slow_a"]
+
+
+def test_deny_reason_follows_priority_and_cancels_lower_rules():
+    log = []
+    high = Rule("high_deny", 10, allow=False, delay_s=0.05, log=log)
+    fast = Rule("fast_deny", 5, allow=False, delay_s=0.01, log=log)
+    low = Rule("low_slow", 1, delay_s=1.0, log=log)
+    approved, reason, elapsed = _evaluate(high, fast, low)
+
+    # fast_deny finishes first, but the higher-priority deny is reported
+    assert not approved and reason == "Policy violation: high_deny"
+    assert low.cancelled and elapsed < 0.5
+
+
+def test_inline_deny_skips_lower_priority_rules():
+    log = []
+    approved, reason, _ = _evaluate(
+        Rule("io_above", 10, delay_s=0.01, log=log),
+        Rule("inline_deny", 5, allow=False, cost=0, log=log),
+        Rule("io_below", 1, delay_s=0.01, log=log),
+    )
+    assert not approved and reason == "Policy violation: inline_deny"
+    assert log == ["inline_deny", "io_above"]
+
+
+def test_profiler_records_sampled_rule_and_stage_timings():
+    def run(sample_rate):
+        profiler = PolicyProfiler(sample_rate=sample_rate)
+        engine = ConscienceEngine(domain="generic", secret_key=SECRET, profiler=profiler)
+        engine.register_policy(Rule("slow", 10, delay_s=0.02, log=[]))
+        engine.register_policy(Rule("fast", 5, cost=0, log=[]))
+        asyncio.run(engine.evaluate_intent(_intent(), {}))
+        return profiler.slowest(limit=10)
+
+    assert run(0.0) == []
+
+    rows = run(1.0)
+    names = [(row["kind"], row["name"]) for row in rows]
+    assert names[:2] == [("stage", "total"), ("stage", "policies")]
+    assert ("rule", "Rule") in names and ("stage", "risk") in names
+    rule = next(row for row in rows if row["kind"] == "rule")
+    assert rule["count"] == 2 and rule["max_ms"] >= 20
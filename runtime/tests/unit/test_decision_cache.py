@@ -0,0 +1,85 @@
+"""
+Unit tests for the policy decision memo cache
+"""
+
+import time
+
+from galani.core.decision_cache import DecisionCache
+from galani.governance import policy_registry as registry
+
+INTENT = {"action": "approve_loan", "principal": {"id": "a1"}, "context": {"amount": 10}}
+
+
+def _counting_engine():
+    from galani.core.policy_engine import authorize_intent
+
+    calls = []
+
+    def decide(intent, **kwargs):
+        calls.append(intent)
+        return authorize_intent(intent, **kwargs)
+
+    return decide, calls
+
+
+def test_hits_reuse_decision_with_fresh_evidence():
+    decide, calls = _counting_engine()
+    cache = DecisionCache(decide, watch_registry=False)
+
+    first = cache.authorize_intent(INTENT)
+    second = cache.authorize_intent(dict(INTENT))
+    assert len(calls) == 1 and (cache.hits, cache.misses) == (1, 1)
+    assert first["evidence_id"] != second["evidence_id"]
+    assert {k: v for k, v in first.items() if k not in ("evidence_id", "timestamp")} == {
+        k: v for k, v in second.items() if k not in ("evidence_id", "timestamp")
+    }
+
+    # Mutating a returned decision does not leak into the cache
+    second["allowed"] = "tampered"
+    assert cache.authorize_intent(INTENT)["allowed"] is True
+
+    cache.authorize_intent(INTENT, policy_version="v5")
+    cache.authorize_intent(INTENT, mode="shadow")
+    assert len(calls) == 3
+
+
+def test_lru_ttl_and_activation_invalidate(tmp_path, monkeypatch):
+    decide, calls = _counting_engine()
+    cache = DecisionCache(decide, max_entries=2, ttl_s=60)
+    try:
+        for n in (1, 2, 3, 1):
+            cache.authorize_intent({"action": "read_prescription", "n": n})
+        assert len(calls) == 4  # n=1 was evicted by n=3
+
+        clock = time.monotonic() + 61
+        monkeypatch.setattr(time, "monotonic", lambda: clock)
+        cache.authorize_intent({"action": "read_prescription", "n": 1})
+        assert len(calls) == 5  # expired
+
+        monkeypatch.setattr(registry, "POLICY_STORE", str(tmp_path / "policies.json"))
+        registry.register_policy("v1", {}, active=True)
+        registry.register_policy("v2", {})
+        cache.authorize_intent(INTENT)
+        registry.register_policy("v3", {})  # active version unchanged
+        assert len(cache) > 0
+        registry.activate_policy("v2")
+        assert len(cache) == 0
+    finally:
+        registry.unsubscribe(cache._on_policy_swap)
+
+
+def test_miss_decided_across_a_clear_is_not_cached():
+    calls = []
+
+    def decide(intent, **kwargs):
+        calls.append(intent)
+        if len(calls) == 1:
+            cache.clear()  # policy swap while the old policy is deciding
+        return {"allowed": len(calls) == 1}
+
+    cache = DecisionCache(decide, watch_registry=False)
+
+    assert cache.authorize_intent(INTENT)["allowed"] is True
+    assert len(cache) == 0
+    assert cache.authorize_intent(INTENT)["allowed"] is False
+    assert len(calls) == 2
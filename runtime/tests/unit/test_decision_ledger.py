@@ -0,0 +1,158 @@
+"""
+Unit tests for the hash-chained decision ledger
+"""
+
+import threading
+
+import pytest
+
+from decision_ledger import DecisionLedger
+
+
+def test_group_commit_concurrent_writers_keep_chain_valid(tmp_path):
+    path = str(tmp_path / "ledger.jsonl")
+    ledger = DecisionLedger(log_file=path, group_commit=True)
+
+    def worker(wid):
+        for i in range(25):
+            ledger.log_interaction("tool_auth", {"user_id": f"u{wid}", "n": i})
+
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    ledger.close()
+
+    assert ledger.verify_file_integrity() is True
+    reloaded = DecisionLedger(log_file=path)
+    assert len(reloaded.chain) == 200
+    assert reloaded.previous_hash == ledger.previous_hash
+
+
+def test_group_commit_entry_is_on_disk_when_returned(tmp_path):
+    path = tmp_path / "ledger.jsonl"
+    with DecisionLedger(log_file=str(path), group_commit=True) as ledger:
+        entry = ledger.log_interaction("input_filter", {"user_id": "u1"})
+        assert entry["hash"] in path.read_text()
+
+
+def _write_entries(path, n, **kwargs):
+    ledger = DecisionLedger(log_file=path, **kwargs)
+    for i in range(n):
+        ledger.log_interaction("tool_auth", {"user_id": f"u{i % 3}", "n": i})
+    ledger.close()
+    return ledger
+
+
+def test_checkpoint_resume_without_materializing_chain(tmp_path):
+    path = str(tmp_path / "ledger.jsonl")
+    written = _write_entries(path, 25, checkpoint_every=10, checkpoint_key=b"k")
+
+    ledger = DecisionLedger(
+        log_file=path, checkpoint_key=b"k", materialize_chain=False
+    )
+    assert ledger.chain == []
+    assert ledger.next_index == 25
+    assert ledger.previous_hash == written.previous_hash
+
+    ledger.log_interaction("input_filter", {"user_id": "u9"})
+    assert ledger.verify_chain_integrity() is True
+    assert len(ledger.get_events_by_user("u9")) == 1
+
+
+def test_forged_checkpoint_is_ignored(tmp_path):
+    path = str(tmp_path / "ledger.jsonl")
+    _write_entries(path, 12, checkpoint_every=5, checkpoint_key=b"k")
+
+    # Corrupt the first entry: only a trusted checkpoint may skip it
+    lines = open(path).read().splitlines()
+    lines[0] = lines[0].replace('"n": 0', '"n": 7')
+    open(path, "w").write("\n".join(lines) + "\n")
+
+    DecisionLedger(log_file=path, checkpoint_key=b"k")
+    with pytest.raises(RuntimeError):
+        DecisionLedger(log_file=path, checkpoint_key=b"wrong-key")
+
+
+def test_indexed_lookups_survive_restart_and_catch_up(tmp_path):
+    path = str(tmp_path / "ledger.jsonl")
+    _write_entries(path, 9, indexed=True)
+
+    # Entries appended without the index are picked up on the next load
+    plain = DecisionLedger(log_file=path)
+    plain.log_interaction("drift_detect", {"user_id": "u1"})
+
+    ledger = DecisionLedger(log_file=path, indexed=True, materialize_chain=False)
+    expected = [e for e in plain.chain if e["data"].get("user_id") == "u1"]
+    assert ledger.get_events_by_user("u1") == expected
+    assert [e["index"] for e in ledger.get_events_by_type("drift_detect")] == [9]
+
+    first, last = plain.chain[0]["timestamp"], plain.chain[-1]["timestamp"]
+    assert len(ledger.get_events_between(first, last + "~")) == 10
+    ledger.close()
+
+
+@pytest.mark.parametrize("drop_line", [False, True])
+def test_parallel_verifier_reports_same_broken_index(tmp_path, drop_line):
+    from ledger_verify import verify_file_parallel
+
+    path = str(tmp_path / "ledger.jsonl")
+    _write_entries(path, 60)
+    assert verify_file_parallel(path, workers=2, chunk_bytes=1024).valid
+
+    lines = open(path).read().splitlines()
+    if drop_line:
+        del lines[37]
+    else:
+        lines[37] = lines[37].replace('"n": 37', '"n": 38')
+    open(path, "w").write("\n".join(lines) + "\n")
+
+    result = verify_file_parallel(path, workers=2, chunk_bytes=1024)
+    assert result.valid is False
+    assert result.broken_index == 37
+    assert DecisionLedger(log_file=path, auto_load=False).verify_file_integrity() is False
+
+
+def test_merkle_batches_and_inclusion_proofs(tmp_path):
+    from decision_ledger import verify_merkle_proof
+
+    path = str(tmp_path / "ledger.jsonl")
+    anchored = []
+    written = _write_entries(path, 23, merkle_batch_size=10, anchor=anchored.append)
+    # two full batches + the partial tail sealed on close()
+    assert [(b["first_index"], b["last_index"]) for b in anchored] == [
+        (0, 9),
+        (10, 19),
+        (20, 22),
+    ]
+
+    ledger = DecisionLedger(log_file=path, merkle_batch_size=10, materialize_chain=False)
+    assert ledger.merkle_batches == written.merkle_batches
+    for index in (0, 13, 22):
+        proof = ledger.get_merkle_proof(index)
+        entry = written.chain[index]
+        assert proof["root"] == anchored[proof["batch"]]["root"]
+        assert verify_merkle_proof(entry, proof) is True
+
+    tampered = dict(written.chain[13], data={"user_id": "u0", "n": 99})
+    assert verify_merkle_proof(tampered, ledger.get_merkle_proof(13)) is False
+
+
+def test_merkle_batch_not_served_until_persisted(tmp_path):
+    path = str(tmp_path / "ledger.jsonl")
+    ledger = DecisionLedger(log_file=path, merkle_batch_size=2, materialize_chain=False)
+    ledger.merkle_file = str(tmp_path / "missing" / "ledger.merkle")
+
+    ledger.log_interaction("tool_auth", {"n": 0})
+    with pytest.raises(OSError):
+        ledger.log_interaction("tool_auth", {"n": 1})  # seals batch 0, persist fails
+
+    assert ledger.merkle_batches == []
+    with pytest.raises(ValueError):
+        ledger.get_merkle_proof(0)
+
+    ledger.merkle_file = str(tmp_path / "ledger.merkle")
+    ledger.log_interaction("tool_auth", {"n": 2})
+    ledger.log_interaction("tool_auth", {"n": 3})  # batch 1 waits for batch 0
+    assert ledger.merkle_batches == []
@@ -0,0 +1,139 @@
+"""
+Unit tests for the pluggable drift scorers in drift_detection_fixed
+"""
+
+import pytest
+
+import drift_detection_fixed
+from drift_detection_fixed import (
+    DriftDetector,
+    EmbeddingScorer,
+    HashedNgramScorer,
+    KeywordScorer,
+)
+
+READ_CONFIG = {"tool_name": "file_system_read", "parameters": {"path": "config.yaml"}}
+READ_SALES = {"tool_name": "file_system_read", "parameters": {"path": "/reports/sales.pdf"}}
+DELETE_USERS = {"tool_name": "database_write", "parameters": {"query": "DELETE FROM users"}}
+SHELL = {"tool_name": "shell_execute", "parameters": {"command": "rm -rf /"}}
+
+
+def test_ngram_scores_aligned_above_misaligned():
+    scorer = HashedNgramScorer()
+    aligned = scorer.score("Read the sales report from /reports/Q4_sales.pdf", [READ_SALES])
+    misaligned = scorer.score("Show weather forecast", [DELETE_USERS])
+
+    assert aligned > 0.5
+    assert misaligned < 0.1
+    assert scorer.score("anything", []) == 0.0
+
+
+def test_ngram_least_aligned_action_sets_score():
+    scorer = HashedNgramScorer()
+    prompt = "Summarize the sales report"
+
+    scores = scorer.action_scores(prompt, [READ_SALES, SHELL])
+
+    assert scores[0] > scores[1]
+    assert scorer.score(prompt, [READ_SALES, SHELL]) == min(scores)
+
+
+def test_vector_cache_reuses_repeated_tools():
+    scorer = HashedNgramScorer(cache_size=64)
+    scorer.score("Read the file config.yaml", [READ_CONFIG])
+    misses = scorer.misses
+
+    scorer.score("Open config.yaml please", [READ_CONFIG, READ_CONFIG])
+
+    # only the new prompt is embedded; tool name, key and value are cached
+    assert scorer.misses == misses + 1
+    assert scorer.hits >= 3
+
+
+def test_vector_cache_evicts_least_recently_used():
+    calls = []
+
+    def embed(texts):
+        calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    scorer = EmbeddingScorer(embed, cache_size=2)
+    scorer.vectors(["a", "bb"])
+    scorer.vectors(["a"])  # "bb" is now least recently used
+    scorer.vectors(["ccc"])
+    scorer.vectors(["a", "bb"])
+
+    assert calls == [["a", "bb"], ["ccc"], ["bb"]]
+    assert len(scorer._cache) == 2
+
+
+def test_embedding_scorer_with_custom_model():
+    vocabulary = ["read", "file", "config", "delete", "users"]
+
+    def embed(texts):
+        return [[float(word in text.lower()) for word in vocabulary] for text in texts]
+
+    scorer = EmbeddingScorer(embed)
+
+    assert scorer.score("read the config file", [READ_CONFIG]) > 0.5
+    assert scorer.score("read the config file", [DELETE_USERS]) == 0.0
+
+
+def test_drift_detector_uses_plugged_scorer():
+    keyword = DriftDetector(threshold=0.30)
+    ngram = DriftDetector(threshold=0.30, scorer=HashedNgramScorer())
+    prompt = "Read the sales report from /reports/Q4_sales.pdf"
+
+    keyword_result = keyword.detect_drift(prompt, [READ_SALES], enforce=False)
+    ngram_result = ngram.detect_drift(prompt, [READ_SALES], enforce=False)
+
+    assert keyword_result["scorer"] == "keyword"
+    assert keyword_result["drift_detected"]
+    assert ngram_result["scorer"] == "ngram"
+    assert not ngram_result["drift_detected"]
+
+
+def test_keyword_scorer_matches_detector_default():
+    prompt = "Read the file config.yaml"
+
+    assert KeywordScorer().score(prompt, [READ_CONFIG]) == pytest.approx(
+        DriftDetector().calculate_alignment_score(prompt, [READ_CONFIG])
+    )
+
+
+def _dense_ngram_scorer(dim=512):
+    """A model-style embedder: the hashed n-gram vectors as dense lists"""
+    ngram = HashedNgramScorer(dim=dim)
+
+    def embed(texts):
+        dense = []
+        for buckets in ngram.embed_texts(texts):
+            vector = [0.0] * dim
+            for index, value in buckets.items():
+                vector[index] = value
+            dense.append(vector)
+        return dense
+
+    return EmbeddingScorer(embed, additive=True)
+
+
+def test_numpy_and_pure_python_scores_match(monkeypatch):
+    pytest.importorskip("numpy")
+    prompts = ["Read the sales report from /reports/Q4_sales.pdf", "What is 2+2?"]
+    actions = [READ_SALES, SHELL, DELETE_USERS, {"tool_name": "", "parameters": {}}]
+
+    dense = [_dense_ngram_scorer().action_scores(p, actions) for p in prompts]
+    sparse = [HashedNgramScorer(dim=512).action_scores(p, actions) for p in prompts]
+    monkeypatch.setattr(drift_detection_fixed, "np", None)
+    pure = [_dense_ngram_scorer().action_scores(p, actions) for p in prompts]
+
+    for dense_scores, sparse_scores, pure_scores in zip(dense, sparse, pure):
+        assert dense_scores == pytest.approx(sparse_scores, abs=1e-6)
+        assert dense_scores == pytest.approx(pure_scores, abs=1e-6)
+
+
+def test_hashed_ngram_vectors_stay_sparse():
+    scorer = HashedNgramScorer()
+    scorer.score("Read the sales report", [READ_SALES])
+
+    assert all(isinstance(vector, dict) for vector in scorer._cache.values())
@@ -0,0 +1,105 @@
+"""
+Unit tests for the fan-out ledger router
+"""
+
+import asyncio
+import time
+
+from ledgers.fanout_ledger import FanoutLedger
+from ledgers.ledger_base import get_ledger
+from ledgers.simulated_ledger import SimulatedLedger
+
+
+def _router(quorum, **kwargs):
+    replicas = {
+        "fast": SimulatedLedger("fast", latency_s=0.01),
+        "slow": SimulatedLedger("slow", latency_s=0.5),
+    }
+    return FanoutLedger(SimulatedLedger("primary"), replicas, quorum=quorum, **kwargs)
+
+
+def test_quorum_waits_only_for_fastest_replicas():
+    async def run(quorum):
+        ledger = _router(quorum)
+        t0 = time.perf_counter()
+        ids = await asyncio.gather(
+            *(ledger.submit_audit({"n": i}, {"allow": True}, "u1") for i in range(20))
+        )
+        elapsed = time.perf_counter() - t0
+        await ledger.close()
+        return ledger, ids, elapsed
+
+    ledger, ids, elapsed = asyncio.run(run(quorum=2))
+    assert all(ids) and elapsed < 0.4
+    # close() drained the slow replica too, in batches rather than 20 round trips
+    assert len(ledger.replicas["slow"].records) == 20
+    assert all(set(ledger.receipts[i]) == {"fast", "slow"} for i in ids)
+
+    _, _, elapsed = asyncio.run(run(quorum=3))
+    assert elapsed >= 0.5
+
+
+def test_failed_replica_writes_are_retried():
+    async def run():
+        flaky = SimulatedLedger("flaky", failure_rate=0.5)
+        ledger = FanoutLedger(
+            SimulatedLedger("primary"), {"flaky": flaky}, quorum=2,
+            max_retries=20, retry_backoff_s=0.001,
+        )
+        ids = [await ledger.submit_audit({"n": i}, {}, "u1") for i in range(10)]
+        await ledger.close()
+        return ledger, ids
+
+    ledger, ids = asyncio.run(run())
+    assert all(ids)
+    assert ledger.stats["flaky"]["ok"] == 10
+    assert ledger.stats["flaky"]["failed"] == 0
+
+
+def test_query_falls_back_to_replica_receipts():
+    async def run():
+        ledger = get_ledger("simulated+simulated")
+        tx = await ledger.submit_audit({"action": "transfer"}, {"allow": True}, "u1")
+        await ledger.flush()
+        ledger.primary.records.clear()
+        return await ledger.query_chain(tx)
+
+    assert asyncio.run(run())["intent"] == {"action": "transfer"}
+
+
+def test_quorum_fails_fast_when_replicas_give_up():
+    async def run():
+        broken = SimulatedLedger("broken", failure_rate=1.0)
+        ledger = FanoutLedger(
+            SimulatedLedger("primary"), {"broken": broken}, quorum=2,
+            quorum_timeout_s=30.0, max_retries=2, retry_backoff_s=0.001,
+        )
+        t0 = time.perf_counter()
+        tx = await ledger.submit_audit({"n": 1}, {}, "u1")
+        elapsed = time.perf_counter() - t0
+        await ledger.close()
+        return ledger, tx, elapsed
+
+    ledger, tx, elapsed = asyncio.run(run())
+    assert tx is None
+    assert elapsed < 1.0
+    assert ledger.stats["broken"]["failed"] == 1
+
+
+def test_full_replica_queue_does_not_block_primary_quorum():
+    async def run():
+        slow = SimulatedLedger("slow", latency_s=0.5)
+        ledger = FanoutLedger(
+            SimulatedLedger("primary"), {"slow": slow}, quorum=1, queue_size=1, batch_max=1
+        )
+        t0 = time.perf_counter()
+        ids = [await ledger.submit_audit({"n": i}, {}, "u1") for i in range(5)]
+        elapsed = time.perf_counter() - t0
+        await ledger.close()
+        return ledger, ids, elapsed
+
+    ledger, ids, elapsed = asyncio.run(run())
+    assert all(ids)
+    assert elapsed < 0.4
+    assert ledger.stats["slow"]["dropped"] >= 1
+    assert ledger.stats["slow"]["ok"] + ledger.stats["slow"]["dropped"] == 5
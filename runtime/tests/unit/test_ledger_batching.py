@@ -0,0 +1,70 @@
+"""
+Unit tests for ledger batch submission and call coalescing
+"""
+
+import asyncio
+
+from ledgers.batching import SubmitCoalescer
+from ledgers.simulated_ledger import SimulatedLedger
+from ledgers.worm_fallback import WORMFallback
+
+
+def test_coalesced_submits_share_round_trips():
+    async def run():
+        ledger = SimulatedLedger("remote", latency_s=0.01, coalesce_ms=5)
+        ids = await asyncio.gather(
+            *(ledger.submit_audit({"n": i}, {"allow": True}, "u1") for i in range(50))
+        )
+        return ledger, ids
+
+    ledger, ids = asyncio.run(run())
+    assert len(set(ids)) == 50
+    assert ledger.calls == 1
+    assert [ledger.records[i]["intent"]["n"] for i in ids] == list(range(50))
+
+
+def test_coalescer_respects_max_batch_and_failures():
+    batches = []
+
+    async def submit_batch(batch):
+        batches.append(len(batch))
+        if len(batches) == 2:
+            raise ConnectionError("backend down")
+        return [f"id-{args[0]['n']}" for args in batch]
+
+    async def run():
+        coalescer = SubmitCoalescer(submit_batch, window_ms=50, max_batch=4)
+        return await asyncio.gather(
+            *(coalescer.submit({"n": i}, {}, "u1") for i in range(10))
+        )
+
+    ids = asyncio.run(run())
+    assert batches == [4, 4, 2]
+    assert ids == ["id-0", "id-1", "id-2", "id-3", None, None, None, None, "id-8", "id-9"]
+
+
+def test_coalescer_returns_none_to_callers_missing_from_short_result():
+    async def submit_batch(batch):
+        return ["only-one"]
+
+    async def run():
+        coalescer = SubmitCoalescer(submit_batch, window_ms=10)
+        return await asyncio.wait_for(
+            asyncio.gather(*(coalescer.submit({"n": i}, {}, "u1") for i in range(3))),
+            timeout=1.0,
+        )
+
+    assert asyncio.run(run()) == ["only-one", None, None]
+
+
+def test_default_submit_audits_preserves_order(tmp_path, monkeypatch):
+    monkeypatch.setenv("WORM_FILE", str(tmp_path / "audits.worm"))
+
+    async def run():
+        ledger = WORMFallback()
+        ids = await ledger.submit_audits([({"n": i}, {}, "u1") for i in range(5)])
+        records = [await ledger.query_chain(h) for h in ids]
+        await ledger.close()
+        return records
+
+    assert [r["intent"]["n"] for r in asyncio.run(run())] == list(range(5))
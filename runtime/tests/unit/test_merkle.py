@@ -0,0 +1,68 @@
+"""
+Unit tests for Merkle tree helpers
+"""
+
+import hashlib
+
+import pytest
+
+from ledgers.merkle import (
+    MerkleAccumulator,
+    consistency_proof,
+    hash_leaf,
+    hash_node,
+    merkle_proof,
+    merkle_root,
+    verify_consistency,
+    verify_proof,
+)
+
+LEAVES = [hashlib.sha256(str(i).encode()).digest() for i in range(40)]
+
+
+def _list_root(leaves):
+    """Reference: rebuild every level, duplicating the last odd node."""
+    nodes = [hash_leaf(l) for l in leaves]
+    while len(nodes) > 1:
+        if len(nodes) % 2 == 1:
+            nodes.append(nodes[-1])
+        nodes = [hash_node(nodes[i], nodes[i + 1]) for i in range(0, len(nodes), 2)]
+    return nodes[0]
+
+
+def test_accumulator_root_matches_list_root_at_every_size():
+    acc = MerkleAccumulator()
+    for n, leaf in enumerate(LEAVES, start=1):
+        acc.append(leaf)
+        assert acc.root() == _list_root(LEAVES[:n]) == merkle_root(LEAVES[:n])
+        assert len(acc.peaks()) == bin(n).count("1")
+
+
+def test_inclusion_proofs_verify_and_reject_wrong_leaf():
+    root = merkle_root(LEAVES[:13])
+    for i in range(13):
+        proof = merkle_proof(LEAVES[:13], i)
+        assert verify_proof(LEAVES[i], proof, root)
+        assert not verify_proof(LEAVES[i + 1], proof, root)
+
+
+@pytest.mark.parametrize("old_size,new_size", [(1, 1), (1, 2), (3, 4), (5, 13), (8, 40)])
+def test_consistency_proofs(old_size, new_size):
+    acc = MerkleAccumulator()
+    for leaf in LEAVES[:old_size]:
+        acc.append(leaf)
+    old_root, old_peaks = acc.root(), acc.peaks()
+    new_root = merkle_root(LEAVES[:new_size])
+
+    proof = consistency_proof(old_peaks, old_size, LEAVES[old_size:new_size])
+    assert verify_consistency(old_size, new_size, old_root, new_root, proof)
+
+    forked = merkle_root([b"fork"] + LEAVES[1:new_size])
+    assert not verify_consistency(old_size, new_size, old_root, forked, proof)
+
+
+def test_top_level_merkle_module_still_imports():
+    import merkle
+
+    assert merkle.merkle_root is merkle_root
+    assert merkle.MerkleAccumulator is MerkleAccumulator
@@ -0,0 +1,112 @@
+"""
+Unit tests for the compiled policy engine and its registry cache
+"""
+
+import pytest
+
+from galani.governance import policy_registry as registry
+from galani.governance.policy_compiler import authorize, compile_policy
+
+POLICY = {
+    "approve_loan": {
+        "allowed_roles": ["agent"],
+        "max_amount": 500000,
+        "min_trust_level": "high",
+        "rate_limit_per_min": 2,
+        "daily_spend_cap": 700000,
+    }
+}
+HIGH_AGENT = {"id": "agent_high", "role": "agent", "trust_level": "high"}
+
+
+@pytest.mark.parametrize(
+    "principal, context, allowed",
+    [
+        (HIGH_AGENT, {"amount": 300000}, True),
+        (HIGH_AGENT, {"amount": 600000}, False),
+        (dict(HIGH_AGENT, role="human"), {"amount": 1}, False),
+        (dict(HIGH_AGENT, trust_level="low"), {"amount": 1, "trust_level": "high"}, False),
+        (HIGH_AGENT, {"amount": "lots"}, False),
+    ],
+)
+def test_compiled_policy_decisions(principal, context, allowed):
+    compiled = compile_policy(POLICY, "v4")
+    assert compiled.authorize("approve_loan", principal, context, track_usage=False)[0] is allowed
+    assert authorize("approve_loan", principal, context, POLICY, track_usage=False)[0] is allowed
+    assert compiled.authorize("wire_funds", principal, context)[0] is False
+
+
+def test_unknown_constraint_denies_the_action():
+    policy = {
+        "approve_loan": dict(POLICY["approve_loan"], require_dual_control=True),
+        "read_report": {"allowed_roles": ["agent"]},
+    }
+    compiled = compile_policy(policy, "v5")
+
+    allowed, reason = compiled.authorize(
+        "approve_loan", HIGH_AGENT, {"amount": 1}, track_usage=False
+    )
+    assert allowed is False and "require_dual_control" in reason
+    assert compiled.authorize("read_report", HIGH_AGENT, {}, track_usage=False)[0] is True
+
+
+def test_usage_limits_are_consumed_only_when_tracking():
+    compiled = compile_policy(POLICY, "v4")
+    principal = dict(HIGH_AGENT, id="agent_usage_test")
+    for _ in range(5):
+        assert compiled.authorize("approve_loan", principal, {"amount": 1}, track_usage=False)[0]
+    assert compiled.authorize("approve_loan", principal, {"amount": 1})[0]
+    assert compiled.authorize("approve_loan", principal, {"amount": 1})[0]
+    assert compiled.authorize("approve_loan", principal, {"amount": 1}) == (
+        False,
+        "Rate limit exceeded",
+    )
+
+
+def test_registry_caches_compiled_policy_until_activation(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry, "POLICY_STORE", str(tmp_path / "policies.json"))
+    registry.register_policy("v1", POLICY, active=True)
+    registry.register_policy("v2", {"approve_loan": {"allowed_roles": ["human"]}})
+
+    version, compiled = registry.get_compiled_policy()
+    assert version == "v1"
+    assert registry.get_compiled_policy()[1] is compiled
+
+    generation = registry.get_policy_generation()
+    registry.activate_policy("v2")
+    assert registry.get_policy_generation() == generation + 1
+    version, compiled = registry.get_compiled_policy()
+    assert version == "v2"
+    assert compiled.authorize("approve_loan", {"role": "human"}, {})[0] is True
+
+
+def test_registry_hot_reloads_external_edits(tmp_path, monkeypatch):
+    path = tmp_path / "policies.json"
+    monkeypatch.setattr(registry, "POLICY_STORE", str(path))
+    registry.register_policy("v1", POLICY, active=True)
+    reg = registry.get_registry()
+
+    # Hot path reads the snapshot only
+    monkeypatch.setattr("builtins.open", None)
+    assert registry.get_active_policy()[0] == "v1"
+    monkeypatch.undo()
+    monkeypatch.setattr(registry, "POLICY_STORE", str(path))
+
+    # A torn write is ignored; the last good snapshot keeps serving
+    path.write_text('{"v9": {"policy": {}, "act')
+    assert reg.reload() is False
+    assert registry.get_active_policy()[0] == "v1"
+
+    path.write_text('{"v9": {"policy": {}, "active": true}}')
+    assert reg.reload() is True
+    assert registry.get_active_policy() == ("v9", {})
+
+
+def test_active_policy_cannot_mutate_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry, "POLICY_STORE", str(tmp_path / "policies.json"))
+    registry.register_policy("v1", POLICY, active=True)
+
+    _, policy = registry.get_active_policy()
+    policy.clear()
+
+    assert registry.get_active_policy()[1] == POLICY
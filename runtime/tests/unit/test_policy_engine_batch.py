@@ -0,0 +1,78 @@
+"""
+Unit tests for batch intent authorization
+"""
+
+import itertools
+
+from galani.core import policy_engine
+
+ACTIONS = [
+    "approve_loan",
+    "process_payment",
+    "read_prescription",
+    "engage_legal_counsel",
+    "wire_funds",
+]
+CONTEXTS = [
+    {},
+    {"amount": 300000},
+    {"amount": 750000},
+    {"principal_amount": 50000},
+    {"amount": 90000, "country": "ru"},
+    {"amount": 10, "country": "Iran"},
+    {"amount": 10, "aml_flag": True},
+    {"risk": "Medium"},
+    {"risk": "low"},
+]
+
+
+def _batch():
+    batch = [
+        {"action": action, "principal": {"id": "a1", "role": "agent"}, "context": ctx}
+        for action, ctx in itertools.product(ACTIONS, CONTEXTS)
+    ]
+    batch += [
+        {"tool_name": "approve_loan", "params": {"context": {"amount": 1}}},
+        "read_prescription",
+        42,
+        {"action": "process_payment", "context": "not-a-dict"},
+    ]
+    return batch
+
+
+def _single(enveloped, **kwargs):
+    try:
+        return policy_engine.authorize_intent(enveloped, **kwargs)
+    except AttributeError:
+        return "error"
+
+
+def test_batch_matches_single_intent_decisions():
+    batch = _batch()
+    decisions = policy_engine.authorize_intents(batch)
+    assert len(decisions) == len(batch)
+    for enveloped, decision in zip(batch, decisions):
+        expected = _single(enveloped)
+        if expected == "error":
+            # authorize_intent raises; the batch denies only that item
+            assert (decision["allowed"], decision["reason"]) == (False, "bad_envelope")
+        else:
+            assert decision == expected
+
+
+def test_batch_shadow_mode_and_invalid_amounts():
+    batch = _batch()[:10]
+    assert policy_engine.authorize_intents(batch, mode="shadow") == [
+        policy_engine.authorize_intent(e, mode="shadow") for e in batch
+    ]
+
+    decisions = policy_engine.authorize_intents(
+        [
+            {"action": "approve_loan", "context": {"amount": "lots"}},
+            {"action": "approve_loan", "context": {"amount": "12"}},
+        ]
+    )
+    assert [(d["allowed"], d["reason"]) for d in decisions] == [
+        (False, "invalid_amount"),
+        (True, "loan_limit"),
+    ]
@@ -0,0 +1,100 @@
+"""
+Unit tests for the sanctions screening index
+"""
+
+import asyncio
+import os
+import time
+
+from galani_protocol_v2 import ActionIntent, SanctionCheckPolicy
+from sanctions_screening import SanctionsEntry, SanctionsIndex, SanctionsScreener
+
+ENTRIES = [
+    SanctionsEntry("SDN-1", "Bank of Iran", ("IRAN_BANK_001",), "OFAC_SDN"),
+    SanctionsEntry("SDN-2", "Iran", (), "OFAC_SDN"),
+    SanctionsEntry("EU-7", "José Müller Trading", ("Mueller Trading",), "EU"),
+]
+
+
+def test_exact_alias_and_normalization():
+    index = SanctionsIndex(ENTRIES)
+    assert index.match_exact("iran bank 001").uid == "SDN-1"
+    assert index.match_exact("  BANK-OF-IRAN. ").uid == "SDN-1"
+    assert index.match_exact("jose muller trading").uid == "EU-7"
+    assert index.match_exact("Bank of Iran Ltd") is None
+
+
+def test_free_text_scan_finds_every_name_on_word_boundaries():
+    index = SanctionsIndex(ENTRIES)
+    found = sorted((e.uid, m) for e, m in index.scan("Wire to Bank of Iran via Mueller Trading"))
+    assert found == [("EU-7", "mueller trading"), ("SDN-1", "bank of iran"), ("SDN-2", "iran")]
+    assert index.scan("piranha farming supplies") == []
+
+    hits = index.screen({"counterparty": "IRAN_BANK_001", "memo": "ref Iran", "amount": 5})
+    assert [(h.field, h.entry.uid, h.exact) for h in hits] == [
+        ("counterparty", "SDN-1", True),
+        ("memo", "SDN-2", False),
+    ]
+
+
+def test_screener_reloads_list_file_atomically(tmp_path):
+    path = tmp_path / "sanctions.csv"
+    path.write_text("uid,name,aliases,list\nSDN-1,Bank of Iran,IRAN_BANK_001,OFAC_SDN\n")
+    screener = SanctionsScreener(str(path), reload_interval_s=0)
+    before = screener.index
+    assert screener.screen({"entity_id": "IRAN_BANK_001"})
+    assert not screener.reload()
+
+    path.write_text("uid,name,aliases,list\nSDN-9,Acme Shipping,,OFAC_SDN\n")
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+    assert screener.reload()
+    assert screener.index is not before and len(before) == 1
+    assert not screener.screen({"entity_id": "IRAN_BANK_001"})
+    assert screener.screen({"recipient": "acme shipping"})
+
+    # A broken list keeps the last good index
+    path.write_text("name\nNo uid column\n")
+    assert not screener.reload(force=True)
+    assert screener.screen({"recipient": "acme shipping"})
+
+
+def test_sanction_check_policy_screens_recipient_with_screener():
+    def reason(policy, **params):
+        intent = ActionIntent("i1", "transfer", params, "AGENT", time.time(), "fintech")
+        return asyncio.run(policy.evaluate(intent, {}))
+
+    builtin = SanctionCheckPolicy()
+    assert reason(builtin, counterparty="IRAN_BANK_001") == (
+        False,
+        "Counterparty IRAN_BANK_001 is on sanctions list",
+    )
+    assert reason(builtin, counterparty="VENDOR_042") == (True, "Sanctions check passed")
+
+    policy = SanctionCheckPolicy(screener=SanctionsIndex(ENTRIES))
+    assert reason(policy, recipient="Treasury of Bank of Iran") == (
+        False,
+        "Recipient Treasury of Bank of Iran matches sanctioned name Bank of Iran",
+    )
+
+
+def test_screener_fails_closed_until_a_list_loads(tmp_path):
+    path = tmp_path / "sanctions.csv"
+    screener = SanctionsScreener(str(path), reload_interval_s=0)
+    assert not screener.loaded
+
+    hits = screener.screen({"counterparty": "VENDOR_042", "memo": "", "amount": 5})
+    assert [(h.field, h.entry.uid) for h in hits] == [("counterparty", "LIST_UNAVAILABLE")]
+    policy = SanctionCheckPolicy(screener=screener)
+    intent = ActionIntent("i1", "transfer", {"recipient": "Acme"}, "AGENT", time.time(), "fintech")
+    assert asyncio.run(policy.evaluate(intent, {})) == (
+        False,
+        "Recipient Acme not screened: sanctions list unavailable",
+    )
+
+    path.write_text("name\nNo uid column\n")
+    assert not screener.reload(force=True)
+    assert screener.screen({"counterparty": "VENDOR_042"})
+
+    path.write_text("uid,name,aliases,list\nSDN-9,Acme Shipping,,OFAC_SDN\n")
+    assert screener.reload(force=True)
+    assert not screener.screen({"counterparty": "VENDOR_042"})
@@ -0,0 +1,131 @@
+"""
+Unit tests for multi-version shadow comparison
+"""
+
+import threading
+
+from galani.governance import policy_registry as registry
+from shadow_mode import Reservoir, ShadowComparator
+
+
+def test_reservoir_is_bounded():
+    reservoir = Reservoir(size=50)
+    for i in range(10_000):
+        reservoir.add(i)
+    assert reservoir.seen == 10_000 and len(reservoir.items) == 50
+    assert len(set(reservoir.items)) == 50
+
+
+def test_comparator_tracks_each_candidate_version(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry, "POLICY_STORE", str(tmp_path / "policies.json"))
+    registry.register_policy("strict", {"approve_loan": {"max_amount": 1000}})
+    registry.register_policy("loose", {"approve_loan": {"max_amount": 1_000_000}})
+
+    comparator = ShadowComparator(["strict", "loose", "missing"], reservoir_size=10)
+    amounts = [i * 10_000 for i in range(200)]  # 0 .. 1.99M
+    for amount in amounts:
+        intent = {"action": "approve_loan", "actor": "a1", "amount": amount}
+        comparator.submit(intent, production_allowed=amount <= 500_000)
+    comparator.flush()
+    summary = comparator.summary()
+
+    strict, loose = summary["strict"], summary["loose"]
+    assert strict["evaluated"] == loose["evaluated"] == 200
+    # strict blocks 10k..500k that production allowed
+    assert strict["would_block"] == 50 and strict["would_allow"] == 0
+    assert strict["blocked_exposure"] == sum(a for a in amounts if 1000 < a <= 500_000)
+    # loose lets 510k..1M through that production blocked
+    assert loose["would_allow"] == 50 and loose["would_block"] == 0
+    assert len(loose["samples"]) == 10 and all(not s["production_allowed"] for s in loose["samples"])
+    assert summary["missing"]["evaluated"] == 0 and summary["missing"]["errors"] == 200
+
+
+def test_malformed_intent_does_not_stall_the_comparator(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry, "POLICY_STORE", str(tmp_path / "policies.json"))
+    registry.register_policy("strict", {"approve_loan": {"max_amount": 1000}})
+
+    comparator = ShadowComparator(["strict"])
+    comparator.submit({"action": "approve_loan", "context": "oops"}, production_allowed=True)
+    comparator.flush()
+    for amount in (10, 5000):
+        comparator.submit({"action": "approve_loan", "amount": amount}, production_allowed=True)
+    comparator.flush()
+
+    strict = comparator.summary()["strict"]
+    assert strict["errors"] == 1
+    assert strict["evaluated"] == 2 and strict["would_block"] == 1
+    assert comparator._pending == [] and comparator._scheduled is False
+
+
+def test_drain_resets_schedule_when_a_batch_raises(monkeypatch):
+    comparator = ShadowComparator(["v1"])
+
+    def boom(batch):
+        raise RuntimeError("unexpected")
+
+    monkeypatch.setattr(comparator, "compare_batch", boom)
+    comparator.submit({"action": "approve_loan"}, production_allowed=True)
+    comparator.flush()
+    assert comparator._scheduled is False
+
+    calls = []
+    monkeypatch.setattr(comparator, "compare_batch", calls.append)
+    comparator.submit({"action": "approve_loan"}, production_allowed=True)
+    comparator.flush()
+    assert len(calls) == 1
+
+
+def test_batch_that_raises_hands_queued_intents_to_a_new_drain(monkeypatch):
+    comparator = ShadowComparator(["v1"], batch_max=1)
+    calls = []
+
+    def compare(batch):
+        calls.append(batch)
+        if len(calls) == 1:
+            raise RuntimeError("unexpected")
+
+    monkeypatch.setattr(comparator, "compare_batch", compare)
+    with comparator._lock:  # queue both before the drain starts
+        comparator._pending += [({"n": 1}, True), ({"n": 2}, True)]
+        comparator._scheduled = True
+    comparator._schedule()
+    comparator.flush()
+
+    assert [batch[0][0]["n"] for batch in calls] == [1, 2]
+    assert comparator._pending == [] and comparator._scheduled is False
+
+
+class _HookedLock:
+    """A lock that runs hook() after every release"""
+
+    def __init__(self, hook):
+        self._lock = threading.Lock()
+        self.hook = hook
+
+    def __enter__(self):
+        self._lock.acquire()
+
+    def __exit__(self, *exc):
+        self._lock.release()
+        self.hook()
+
+
+def test_submit_racing_an_empty_drain_is_not_lost(monkeypatch):
+    comparator = ShadowComparator(["v1"])
+    calls, injected = [], []
+
+    def submit_after_empty_batch():
+        # The drain has compared its batch; its next release is the one that
+        # found the queue empty, the window a late submit() lands in
+        on_worker = threading.current_thread() is not threading.main_thread()
+        if on_worker and len(calls) == 1 and not injected:
+            injected.append(True)
+            comparator.submit({"n": 2}, production_allowed=True)
+
+    monkeypatch.setattr(comparator, "compare_batch", calls.append)
+    monkeypatch.setattr(comparator, "_lock", _HookedLock(submit_after_empty_batch))
+    comparator.submit({"n": 1}, production_allowed=True)
+    comparator.flush()
+
+    assert injected and [batch[0][0]["n"] for batch in calls] == [1, 2]
+    assert comparator._pending == [] and comparator._scheduled is False
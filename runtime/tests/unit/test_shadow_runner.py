@@ -0,0 +1,49 @@
+"""
+Unit tests for background shadow evaluation
+"""
+
+import json
+import threading
+
+import execute_and_log as eal
+from shadow_runner import ShadowRunner
+
+
+def test_runner_drops_when_full_and_samples():
+    runner = ShadowRunner(workers=1, queue_size=1)
+    started, release = threading.Event(), threading.Event()
+    done = []
+
+    def blocker():
+        started.set()
+        release.wait(5)
+
+    assert runner.submit(blocker)
+    started.wait(5)
+    assert runner.submit(done.append, 1)
+    assert not runner.submit(done.append, 2)  # queue full: dropped, not blocked
+    release.set()
+    runner.close()
+    assert done == [1]
+    assert runner.stats["dropped"] == 1 and runner.stats["completed"] == 2
+
+    sampled = ShadowRunner(sample_rate=0.0)
+    assert not sampled.submit(done.append, 3)
+    assert sampled.stats["sampled_out"] == 1 and done == [1]
+
+
+def test_execute_and_log_async_shadow(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    intent = {"domain": "fintech", "amount": 50000, "actor": "a1"}
+
+    record = eal.execute_and_log(dict(intent), shadow_execution="async")
+    assert record["allowed"] and "shadow_decision" not in record
+    eal.get_shadow_runner().flush()
+
+    shadow = json.loads((tmp_path / "shadow_divergence.log").read_text())
+    assert shadow["intent_hash"] == record["intent_hash"]
+    assert shadow["shadow_diff"] and shadow["shadow_decision"]["allowed"] is False
+
+    inline = eal.execute_and_log(dict(intent), shadow_execution="inline")
+    assert inline["shadow_diff"] is True
+    assert len((tmp_path / "audit.log").read_text().splitlines()) == 2
@@ -1,8 +1,7 @@
 # UAAL API Middleware: Policy → Capability → Execution
 
 from flask import Flask, request, jsonify
-from policy_registry import get_active_policy
-from policy_engine import authorize
+from policy_registry import get_compiled_policy
 from capability_token import consume_capability, issue_capability
 import uuid
 
@@ -17,8 +16,8 @@ def authorize_action():
     action = data["action"]
     context = data["context"]
 
-    version, policy = get_active_policy()
-    allowed, reason = authorize(action, principal, context, policy)
+    version, policy = get_compiled_policy()
+    allowed, reason = policy.authorize(action, principal, context)
 
     if not allowed:
         return (